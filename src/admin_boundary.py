@@ -0,0 +1,103 @@
+import json
+import os
+
+from zone_index import ZoneIndex
+
+# 행정구역 경계 파일에서 흔히 쓰이는 속성 이름 (앞에 있는 것이 우선)
+SIDO_KEYS = ('sidonm', 'SIDO_NM', 'CTP_KOR_NM', 'sido')
+SIGUNGU_KEYS = ('sggnm', 'SGG_NM', 'SIG_KOR_NM', 'sigungu')
+DONG_KEYS = ('dongnm', 'ADM_DR_NM', 'EMD_KOR_NM', 'dong')
+FULL_NAME_KEYS = ('adm_nm', 'ADM_NM', 'full_name')
+
+
+def _pick(props, keys):
+    for key in keys:
+        value = props.get(key)
+        if value:
+            return str(value).strip()
+    return ''
+
+
+def boundary_names(props):
+    """경계 속성에서 (시도, 시군구, 읍면동) 이름 추출"""
+    sido = _pick(props, SIDO_KEYS)
+    sigungu = _pick(props, SIGUNGU_KEYS)
+    dong = _pick(props, DONG_KEYS)
+
+    # adm_nm = "서울특별시 종로구 사직동" 형태만 있는 경우 분리
+    full_name = _pick(props, FULL_NAME_KEYS)
+    if full_name and not (sido and sigungu and dong):
+        parts = full_name.split()
+        if parts:
+            sido = sido or parts[0]
+            dong = dong or (parts[-1] if len(parts) >= 3 else '')
+            middle = parts[1:-1] if len(parts) >= 3 else parts[1:]
+            sigungu = sigungu or ' '.join(middle)
+    return sido, sigungu, dong
+
+
+def make_address_info(sido, sigungu, dong):
+    """get_detailed_address와 동일한 키 구성의 주소 정보"""
+    simple_address = f"{sido} {sigungu}"
+    if dong:
+        simple_address += f" {dong}"
+    simple_address = ' '.join(simple_address.split())
+    return {
+        'full_address': simple_address,
+        'simple_address': simple_address,
+        'sido': sido, 'sigungu': sigungu, 'dong': dong,
+        'ri': '', 'road_name': '', 'building_number': '', 'zipcode': ''
+    }
+
+
+class AdminBoundaryLookup:
+    """로컬 행정구역 경계 폴리곤으로 좌표 → 시도/시군구/읍면동 변환"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def from_geojson(cls, path):
+        """경계 GeoJSON(EPSG:4326) 파일 로드 후 공간 인덱스 생성"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        geometries = []
+        records = []
+        for feature in data.get('features', []):
+            geom = feature.get('geometry') or {}
+            if geom.get('type') not in ('Polygon', 'MultiPolygon'):
+                continue
+            sido, sigungu, dong = boundary_names(feature.get('properties') or {})
+            geometries.append((geom['type'], geom.get('coordinates')))
+            records.append({'sido': sido, 'sigungu': sigungu, 'dong': dong})
+
+        return cls(ZoneIndex.from_geometries(geometries, records, meta={'source': os.path.abspath(path)}))
+
+    @classmethod
+    def load(cls, path, index_path=None):
+        """경계 파일을 불러오되, 변환된 인덱스(.npz)가 최신이면 그것을 사용"""
+        index_path = index_path or f"{path}.index.npz"
+        if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(path):
+            try:
+                return cls(ZoneIndex.load(index_path))
+            except Exception as e:
+                print(f"⚠️  경계 인덱스 로드 실패, 원본에서 다시 생성합니다: {e}")
+
+        lookup = cls.from_geojson(path)
+        try:
+            lookup.index.save(index_path)
+        except OSError as e:
+            print(f"⚠️  경계 인덱스 저장 실패: {e}")
+        return lookup
+
+    def resolve(self, lat, lng):
+        """좌표가 속한 행정구역 정보, 어느 경계에도 없으면 None"""
+        ids = self.index.query_point(lng, lat)
+        if len(ids) == 0:
+            return None
+        record = self.index.records[ids[0]]
+        return make_address_info(record['sido'], record['sigungu'], record['dong'])
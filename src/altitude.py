@@ -0,0 +1,124 @@
+import math
+import re
+
+import numpy as np
+
+FT_TO_M = 0.3048
+
+# 기준면 코드 (배열 저장용)
+REF_AGL = 0    # 지표면 기준 (Above Ground Level)
+REF_AMSL = 1   # 평균해수면 기준 (Above Mean Sea Level)
+REFERENCES = {'AGL': REF_AGL, 'AMSL': REF_AMSL}
+
+_FL_PATTERN = re.compile(r'FL\s*(\d{2,3})')
+_VALUE_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*(FT|FEET|피트|M(?![A-Z])|미터)?')
+_RANGE_SEPARATOR = re.compile(r'\s*(?:~|∼|–|/|\bTO\b|\s-\s)\s*')
+
+
+def parse_altitude(label):
+    """고도 라벨 하나를 미터 값과 기준면으로 변환
+
+    - GND / SFC / 지상 → 0 m AGL
+    - UNL / 무제한 → 무한대
+    - FL095 → 9,500 ft AMSL
+    - 500ft AGL, 3000 FT AMSL, 150m, 2000 MSL 등
+    - 단위가 없으면 ft, 기준면이 없으면 항공 차트 관례에 따라 AMSL로 간주
+    인식할 수 없으면 None
+    """
+    if label is None:
+        return None
+    text = str(label).strip().upper()
+    if not text:
+        return None
+
+    if 'UNL' in text or '무제한' in text:
+        return {'value_m': math.inf, 'reference': 'AMSL', 'label': str(label)}
+    if text.startswith(('GND', 'SFC')) or text == '지상':
+        return {'value_m': 0.0, 'reference': 'AGL', 'label': str(label)}
+
+    match = _FL_PATTERN.search(text)
+    if match:
+        return {'value_m': int(match.group(1)) * 100 * FT_TO_M, 'reference': 'AMSL', 'label': str(label)}
+
+    match = _VALUE_PATTERN.search(text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    unit = match.group(2) or 'FT'
+    value_m = value if unit in ('M', '미터') else value * FT_TO_M
+    reference = 'AGL' if ('AGL' in text or 'SFC' in text or 'GND' in text or '지상' in text) else 'AMSL'
+    return {'value_m': value_m, 'reference': reference, 'label': str(label)}
+
+
+def parse_altitude_band(props):
+    """구역 속성에서 하한(floor)/상한(ceiling) 고도 추출
+
+    prh_lbl_2는 상한, prh_lbl_3은 하한 라벨로 사용되며(GND/UNL 등),
+    라벨로 알 수 없으면 alt_lmt("GND~500ft" 또는 상한 하나)를 사용
+    끝내 알 수 없는 쪽은 보수적으로 지상(하한)/무제한(상한)으로 둠
+    """
+    floor = parse_altitude(props.get('prh_lbl_3'))
+    ceiling = parse_altitude(props.get('prh_lbl_2'))
+
+    alt_lmt = str(props.get('alt_lmt') or '').strip()
+    if alt_lmt and (floor is None or ceiling is None):
+        parts = [p for p in _RANGE_SEPARATOR.split(alt_lmt.upper()) if p.strip()]
+        if len(parts) >= 2:
+            floor = floor or parse_altitude(parts[0])
+            ceiling = ceiling or parse_altitude(parts[-1])
+        elif parts:
+            ceiling = ceiling or parse_altitude(parts[0])
+
+    floor = floor or {'value_m': 0.0, 'reference': 'AGL', 'label': 'GND'}
+    ceiling = ceiling or {'value_m': math.inf, 'reference': 'AMSL', 'label': 'UNL'}
+    if floor['value_m'] > ceiling['value_m'] and floor['reference'] == ceiling['reference']:
+        floor, ceiling = ceiling, floor
+
+    return {
+        'floor_m': round(floor['value_m'], 1),
+        'floor_ref': floor['reference'],
+        'floor_label': floor['label'],
+        'ceiling_m': None if math.isinf(ceiling['value_m']) else round(ceiling['value_m'], 1),
+        'ceiling_ref': ceiling['reference'],
+        'ceiling_label': ceiling['label']
+    }
+
+
+def altitude_columns(zones):
+    """구역 목록 → 고도 배열 (ZoneIndex 열로 저장)"""
+    n = len(zones)
+    floor_m = np.zeros(n, dtype=np.float32)
+    ceil_m = np.full(n, np.inf, dtype=np.float32)
+    floor_ref = np.zeros(n, dtype=np.uint8)
+    ceil_ref = np.full(n, REF_AMSL, dtype=np.uint8)
+
+    for i, zone in enumerate(zones):
+        band = zone.get('altitude') or parse_altitude_band(zone.get('properties') or {})
+        floor_m[i] = band['floor_m']
+        floor_ref[i] = REFERENCES[band['floor_ref']]
+        ceil_m[i] = np.inf if band['ceiling_m'] is None else band['ceiling_m']
+        ceil_ref[i] = REFERENCES[band['ceiling_ref']]
+
+    return {'floor_m': floor_m, 'floor_ref': floor_ref, 'ceil_m': ceil_m, 'ceil_ref': ceil_ref}
+
+
+def altitude_mask(columns, zone_ids, altitude_m, reference='AGL', ground_elevation_m=0.0):
+    """후보 구역 중 주어진 고도가 하한~상한 사이에 드는 구역 (벡터화)
+
+    기준면이 다른 한계값은 ground_elevation_m(지표 해발고도)으로 환산
+    """
+    zone_ids = np.asarray(zone_ids, dtype=np.int64)
+    floor_m = columns['floor_m'][zone_ids].astype(np.float64)
+    ceil_m = columns['ceil_m'][zone_ids].astype(np.float64)
+    floor_ref = columns['floor_ref'][zone_ids]
+    ceil_ref = columns['ceil_ref'][zone_ids]
+
+    if reference == 'AGL':
+        # AMSL 한계 → AGL: 해발고도에서 지표 고도를 뺌
+        floor_m = np.where(floor_ref == REF_AMSL, floor_m - ground_elevation_m, floor_m)
+        ceil_m = np.where(ceil_ref == REF_AMSL, ceil_m - ground_elevation_m, ceil_m)
+    else:
+        floor_m = np.where(floor_ref == REF_AGL, floor_m + ground_elevation_m, floor_m)
+        ceil_m = np.where(ceil_ref == REF_AGL, ceil_m + ground_elevation_m, ceil_m)
+
+    return (altitude_m >= floor_m) & (altitude_m <= ceil_m)
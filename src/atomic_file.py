@@ -0,0 +1,11 @@
+import os
+import threading
+
+
+def atomic_write(path, data):
+    """임시 파일에 쓴 뒤 교체하여 다른 프로세스/스레드가 반쯤 쓰인 파일을 읽지 않도록 함"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
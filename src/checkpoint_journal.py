@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import time
+
+from response_cache import make_cache_key
+
+
+def dataset_version(features):
+    """조회된 피처 목록의 내용 해시 (데이터가 바뀌면 이전 진행 기록을 쓰지 않음)"""
+    payload = json.dumps(features, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CheckpointJournal:
+    """구역별 처리 결과를 한 줄씩 덧붙이는 JSONL 진행 기록
+
+    - 첫 줄: {"version": 데이터 버전, "started_at": ...}
+    - 이후: {"index": 구역 번호, "zone": 분류/중심점/주소가 채워진 구역}
+    한 줄씩 flush + fsync하므로 중간에 프로세스가 죽어도 마지막 완료 구역까지 남고,
+    쓰다 만 마지막 줄은 다시 읽을 때 무시됨
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.completed = {}
+        self._file = None
+
+    @classmethod
+    def for_request(cls, journal_dir, request_url, params, features, geocode=True, resume=False):
+        """요청(인증 파라미터 제외)별 진행 기록 열기
+
+        resume=True이고 같은 데이터 버전의 기록이 있으면 완료된 구역을 불러오고 이어서 기록,
+        아니면 새 기록 시작
+        """
+        key = make_cache_key(request_url, dict(params or {}, geocode=geocode))
+        journal = cls(os.path.join(journal_dir, f"{key[:24]}.jsonl"), dataset_version(features))
+        if resume:
+            journal.completed = journal._load()
+        journal._open(append=bool(journal.completed))
+        return journal
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+        except OSError:
+            return {}
+
+        completed = {}
+        for number, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # 기록 도중 중단된 마지막 줄
+                continue
+            if number == 0:
+                if entry.get('version') != self.version:
+                    print("⚠️  진행 기록의 데이터 버전이 달라 처음부터 다시 처리합니다.")
+                    return {}
+                continue
+            if 'index' in entry and 'zone' in entry:
+                completed[entry['index']] = entry['zone']
+        return completed
+
+    def _open(self, append):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if append:
+            # 중단된 줄 뒤에 이어 쓰지 않도록 줄바꿈 보장
+            truncated = False
+            with open(self.path, 'rb') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    truncated = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if truncated:
+                self._write_line('')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write_line(json.dumps({'version': self.version, 'started_at': time.time()}))
+
+    def _write_line(self, line):
+        self._file.write(line + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, index, zone):
+        """구역 하나의 처리 결과 기록"""
+        self.completed[index] = zone
+        self._write_line(json.dumps({'index': index, 'zone': zone}, ensure_ascii=False, separators=(',', ':')))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
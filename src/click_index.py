@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+
+from shared_geometry import M_PER_DEG, _simplify_mask
+from zone_index import iter_polygons
+
+# 클릭 인덱스 좌표 정밀도 (1e-5도 ≈ 1 m 정수 격자)
+CLICK_INDEX_PRECISION = 100_000
+
+# 격자 한 축의 최대 셀 수 (구역 수에 맞춰 셀당 구역이 몇 개가 되도록 정함)
+MAX_GRID_CELLS = 256
+
+CLICK_INDEX_VERSION = 1
+
+
+def _simplified_ring(ring, tolerance_m):
+    """링을 지역 미터 좌표에서 Douglas-Peucker로 단순화 (닫는 점은 뺀 경위도 목록)"""
+    points = np.asarray([(float(p[0]), float(p[1])) for p in ring], dtype=np.float64)
+    if len(points) > 1 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+    if len(points) < 3:
+        return None
+    if tolerance_m and len(points) > 4:
+        closed = np.vstack((points, points[:1]))
+        x = (closed[:, 0] - closed[0, 0]) * M_PER_DEG * math.cos(math.radians(closed[0, 1]))
+        y = (closed[:, 1] - closed[0, 1]) * M_PER_DEG
+        points = closed[_simplify_mask(x, y, tolerance_m)][:-1]
+    return points
+
+
+def altitude_text(props):
+    """고도 제한 표시 문자열: 해석한 하한/상한(m, AGL/AMSL)이 있으면 라벨과 함께, 없으면 원래 라벨 (없으면 None)"""
+    band = props.get('ALTITUDE_BAND')
+    if not band:
+        label = props.get('ALTITUDE')
+        return None if not label or label == '정보 없음' else str(label)
+    floor = f"{band['floor_label']} ({band['floor_m']:g} m {band['floor_ref']})"
+    if band['ceiling_m'] is None:
+        ceiling = band['ceiling_label']
+    else:
+        ceiling = f"{band['ceiling_label']} ({band['ceiling_m']:g} m {band['ceiling_ref']})"
+    return f"{floor} ~ {ceiling}"
+
+
+def _string_id(strings, table, value):
+    if value is None:
+        return -1
+    value = str(value)
+    if value not in table:
+        table[value] = len(strings)
+        strings.append(value)
+    return table[value]
+
+
+def build_click_index(zone_groups, severities=None, tolerance_m=5.0, precision=CLICK_INDEX_PRECISION):
+    """지도 클릭 "이 지점에 적용되는 제한은?" 질의용 압축 공간 인덱스 (지도 스크립트가 그대로 사용)
+
+    zone_groups: {유형: [GeoJSON 피처, ...]} (레이어와 같은 순서, 각 구역은 유형 안의 순번으로 상세 팝업과 연결)
+    severities: {유형: 위험도} (피처에 SEVERITY 속성이 없을 때 사용)
+
+    - rings: 구역별 단순화한 링, 원점 기준 정수 좌표를 링마다 [x0, y0, dx1, dy1, ...]로 델타 인코딩
+    - bbox: 구역별 [x최소, y최소, x최대, y최대] (원점 기준 정수)를 이어 붙인 배열
+    - offsets/ids: 격자 셀(행 우선)별로 bbox가 겹치는 구역 번호 (CSR 배치)
+    - zones: 구역별 [유형, 순번, 이름, 위험도, 고도 제한 표시 문자열, 사유], 유형/위험도/사유는 strings의 번호
+    """
+    severities = severities or {}
+    strings, table = [], {}
+    zones, rings, boxes = [], [], []
+    for zone_type, features in zone_groups.items():
+        for position, feature in enumerate(features):
+            geometry = feature.get('geometry') or {}
+            zone_rings = []
+            for polygon in iter_polygons(geometry.get('type'), geometry.get('coordinates')):
+                for ring in polygon:
+                    points = _simplified_ring(ring, tolerance_m)
+                    if points is not None:
+                        zone_rings.append(np.rint(points * precision).astype(np.int64))
+            if not zone_rings:
+                continue
+            props = feature.get('properties') or {}
+            stacked = np.vstack(zone_rings)
+            boxes.append(np.concatenate((stacked.min(axis=0), stacked.max(axis=0))))
+            rings.append(zone_rings)
+            zones.append([_string_id(strings, table, zone_type), position,
+                          props.get('ZONE_NAME'),
+                          _string_id(strings, table, props.get('SEVERITY') or severities.get(zone_type)),
+                          altitude_text(props),
+                          _string_id(strings, table, props.get('RESTRICTION'))])
+
+    if not zones:
+        return None
+
+    boxes = np.asarray(boxes, dtype=np.int64)
+    origin = np.concatenate((boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)))
+    boxes[:, [0, 2]] -= origin[0]
+    boxes[:, [1, 3]] -= origin[1]
+    width, height = max(int(origin[2] - origin[0]), 1), max(int(origin[3] - origin[1]), 1)
+
+    # 셀 수가 구역 수와 비슷하도록, 가로세로 비율에 맞춰 격자 크기 결정
+    cells = max(len(zones), 1)
+    nx = int(min(MAX_GRID_CELLS, max(1, round(math.sqrt(cells * width / height)))))
+    ny = int(min(MAX_GRID_CELLS, max(1, round(cells / nx))))
+    cell_w, cell_h = -(-width // nx), -(-height // ny)
+
+    x0 = np.minimum(boxes[:, 0] // cell_w, nx - 1)
+    x1 = np.minimum(boxes[:, 2] // cell_w, nx - 1)
+    y0 = np.minimum(boxes[:, 1] // cell_h, ny - 1)
+    y1 = np.minimum(boxes[:, 3] // cell_h, ny - 1)
+    buckets = [[] for _ in range(nx * ny)]
+    for zone_id in range(len(zones)):
+        for cy in range(int(y0[zone_id]), int(y1[zone_id]) + 1):
+            row = cy * nx
+            for cx in range(int(x0[zone_id]), int(x1[zone_id]) + 1):
+                buckets[row + cx].append(zone_id)
+    offsets = [0]
+    ids = []
+    for bucket in buckets:
+        ids.extend(bucket)
+        offsets.append(len(ids))
+
+    encoded_rings = []
+    for zone_rings in rings:
+        encoded = []
+        for ring in zone_rings:
+            ring = ring - origin[:2]
+            deltas = np.vstack((ring[:1], np.diff(ring, axis=0)))
+            encoded.append(deltas.ravel().tolist())
+        encoded_rings.append(encoded)
+
+    return {
+        'version': CLICK_INDEX_VERSION,
+        'precision': precision,
+        'origin': origin[:2].tolist(),
+        'cell': [cell_w, cell_h],
+        'size': [nx, ny],
+        'offsets': offsets,
+        'ids': ids,
+        'bbox': boxes.ravel().tolist(),
+        'rings': encoded_rings,
+        'zones': zones,
+        'strings': strings
+    }
+
+
+def click_index_script(map_name):
+    """지도 객체가 만들어진 뒤 클릭 인덱스(window.zoneClickIndex)를 연결하는 스크립트"""
+    return f"if (window.attachZoneClickIndex && window.zoneClickIndex) attachZoneClickIndex({map_name}, window.zoneClickIndex);"
@@ -0,0 +1,272 @@
+import math
+import time
+
+import numpy as np
+
+from zone_index import EARTH_RADIUS_M, ZoneIndex
+
+M_PER_DEG = math.radians(1) * EARTH_RADIUS_M
+SEVERITIES = ('high', 'medium', 'low')
+
+# 교차 판정 행렬 한 번에 만들 최대 원소 수 (메모리 제한)
+MAX_MATRIX_CELLS = 1_000_000
+
+
+def _project(points, origin_lng, origin_lat):
+    """경위도 → 원점 기준 등장방형 평면 좌표(m)"""
+    kx = M_PER_DEG * math.cos(math.radians(origin_lat))
+    return np.column_stack(((points[:, 0] - origin_lng) * kx, (points[:, 1] - origin_lat) * M_PER_DEG))
+
+
+def ring_area_m2(a, b):
+    """방향이 맞춰진 변 목록의 면적 (외곽 +, 구멍 -)"""
+    return 0.5 * float(np.sum(a[:, 0] * b[:, 1] - b[:, 0] * a[:, 1]))
+
+
+def points_inside(px, py, a, b):
+    """여러 점의 폴리곤 포함 여부 (변 집합에 대한 even-odd ray casting, 행렬 연산)"""
+    result = np.zeros(len(px), dtype=bool)
+    if len(a) == 0 or len(px) == 0:
+        return result
+    x1, y1, x2, y2 = a[:, 0], a[:, 1], b[:, 0], b[:, 1]
+    step = max(1, MAX_MATRIX_CELLS // len(a))
+    for s in range(0, len(px), step):
+        x = px[s:s + step, None]
+        y = py[s:s + step, None]
+        straddle = (y1 > y) != (y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = (x2 - x1) * (y - y1) / (y2 - y1) + x1
+        result[s:s + step] = np.count_nonzero(straddle & (x < x_cross), axis=1) % 2 == 1
+    return result
+
+
+# 경계가 겹치는 조각 판정용으로 중점을 변의 법선 방향으로 옮기는 거리(m)
+BOUNDARY_EPS_M = 1e-3
+
+
+def _split_edges(a, b, clip_a, clip_b):
+    """a→b 변을 clip 변과의 교점에서 잘라 조각 목록 반환
+
+    반환: (변 번호, 시작 t, 끝 t, 왼쪽 옆 점 x/y, 오른쪽 옆 점 x/y), 옆 점은 조각 중점에서 법선 방향으로
+    BOUNDARY_EPS_M만큼 옮긴 점 (방향 맞춘 변의 왼쪽이 자기 내부)
+    """
+    r = b - a
+    s = clip_b - clip_a
+
+    # 교차 후보: a 전체 bbox와 겹치는 clip 변만 사용
+    hit_edges = []
+    hit_params = []
+    if len(clip_a):
+        lo = np.minimum(a, b).min(axis=0)
+        hi = np.maximum(a, b).max(axis=0)
+        near = ((np.maximum(clip_a, clip_b) >= lo) & (np.minimum(clip_a, clip_b) <= hi)).all(axis=1)
+        ca, cs = clip_a[near], s[near]
+        if len(ca):
+            step = max(1, MAX_MATRIX_CELLS // len(ca))
+            for k in range(0, len(a), step):
+                ra = r[k:k + step, None, :]
+                qp = ca[None, :, :] - a[k:k + step, None, :]
+                denom = ra[..., 0] * cs[None, :, 1] - ra[..., 1] * cs[None, :, 0]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    t = (qp[..., 0] * cs[None, :, 1] - qp[..., 1] * cs[None, :, 0]) / denom
+                    u = (qp[..., 0] * ra[..., 1] - qp[..., 1] * ra[..., 0]) / denom
+                hit = (denom != 0) & (t > 0) & (t < 1) & (u >= 0) & (u <= 1)
+                rows, _ = np.nonzero(hit)
+                hit_edges.append(rows + k)
+                hit_params.append(t[hit])
+
+    n = len(a)
+    edge_ids = np.concatenate([np.arange(n), np.arange(n)] + hit_edges)
+    params = np.concatenate([np.zeros(n), np.ones(n)] + hit_params)
+    order = np.lexsort((params, edge_ids))
+    edge_ids = edge_ids[order]
+    params = params[order]
+
+    same = (edge_ids[1:] == edge_ids[:-1]) & (params[1:] > params[:-1])
+    e = edge_ids[:-1][same]
+    t0 = params[:-1][same]
+    t1 = params[1:][same]
+
+    tm = (t0 + t1) / 2
+    mx = a[e, 0] + tm * r[e, 0]
+    my = a[e, 1] + tm * r[e, 1]
+    length = np.hypot(r[e, 0], r[e, 1])
+    nx = -r[e, 1] / length * BOUNDARY_EPS_M
+    ny = r[e, 0] / length * BOUNDARY_EPS_M
+    return e, t0, t1, (mx + nx, my + ny), (mx - nx, my - ny)
+
+
+def _segment_integral(a, b, e, t0, t1):
+    """변 조각들에 대한 ∮x dy 합"""
+    r = b - a
+    # x(t) = ax + t·rx, dy = ry·dt  →  ∫x dy = ry·(ax·Δt + rx·Δ(t²)/2)
+    return float(np.sum(r[e, 1] * (a[e, 0] * (t1 - t0) + r[e, 0] * (t1 * t1 - t0 * t0) / 2)))
+
+
+def _inside_integral(a, b, clip_a, clip_b, strict):
+    """a→b 변 중 clip 폴리곤 내부에 놓인 부분에 대한 ∮x dy 합
+
+    변을 clip 경계와의 교점에서 잘라 조각마다 판정
+    - strict=False: 조각 왼쪽(자기 내부 쪽) 바로 옆 점이 clip 내부이면 포함
+      → 같은 방향으로 겹치는 경계 조각은 이쪽에서 한 번만 계산됨
+    - strict=True: 조각 양쪽 옆 점이 모두 clip 내부일 때만 포함
+    """
+    if len(a) == 0 or len(clip_a) == 0:
+        return 0.0
+    e, t0, t1, left, right = _split_edges(a, b, clip_a, clip_b)
+    inside = points_inside(*left, clip_a, clip_b)
+    if strict:
+        inside &= points_inside(*right, clip_a, clip_b)
+    return _segment_integral(a, b, e[inside], t0[inside], t1[inside])
+
+
+def intersection_area_m2(za, zb, da, db):
+    """두 폴리곤(방향 맞춘 평면 좌표 변 목록)의 교집합 면적
+
+    그린 정리: 교집합 경계 = (A 경계 중 B 내부) + (B 경계 중 A 내부)
+    볼록하지 않은 폴리곤, 구멍, 경계가 일부 겹치는 경우도 그대로 처리됨
+    """
+    area = _inside_integral(za, zb, da, db, strict=False) + _inside_integral(da, db, za, zb, strict=True)
+    return max(area, 0.0)
+
+
+def union_intersection_area_m2(zone_edges, da, db):
+    """여러 폴리곤의 합집합 ∩ 행정구역의 면적 (겹친 구역을 한 번만 계산)
+
+    그린 정리: 경계 = (합집합 경계 중 행정구역 내부) + (행정구역 경계 중 합집합 내부)
+    - 구역 k의 변 조각은 오른쪽 옆 점이 다른 어느 구역에도 없으면 합집합 경계
+      (같은 방향으로 겹치는 경계는 왼쪽 옆 점이 앞선 구역 내부가 아닌 구역 하나에서만 계산)
+    - 행정구역 변 조각은 양쪽 옆 점이 모두 합집합 내부일 때만 포함
+    """
+    zone_edges = [(za, zb) for za, zb in zone_edges if len(za)]
+    if not zone_edges or len(da) == 0:
+        return 0.0
+    if len(zone_edges) == 1:
+        return intersection_area_m2(*zone_edges[0], da, db)
+
+    all_a = np.vstack([za for za, _ in zone_edges])
+    all_b = np.vstack([zb for _, zb in zone_edges])
+    area = 0.0
+    for k, (za, zb) in enumerate(zone_edges):
+        e, t0, t1, left, right = _split_edges(za, zb, np.vstack((all_a, da)), np.vstack((all_b, db)))
+        keep = points_inside(*left, da, db)
+        for j, (ja, jb) in enumerate(zone_edges):
+            if j == k or not keep.any():
+                continue
+            keep &= ~points_inside(*right, ja, jb)
+            if j < k:
+                keep &= ~points_inside(*left, ja, jb)
+        area += _segment_integral(za, zb, e[keep], t0[keep], t1[keep])
+
+    e, t0, t1, left, right = _split_edges(da, db, all_a, all_b)
+    left_in = np.zeros(len(e), dtype=bool)
+    right_in = np.zeros(len(e), dtype=bool)
+    for ja, jb in zone_edges:
+        left_in |= points_inside(*left, ja, jb)
+        right_in |= points_inside(*right, ja, jb)
+    keep = left_in & right_in
+    area += _segment_integral(da, db, e[keep], t0[keep], t1[keep])
+    return max(area, 0.0)
+
+
+def _district_key(record):
+    return ' '.join(f"{record.get('sido', '')} {record.get('sigungu', '')}".split())
+
+
+def compute_district_coverage(zones, boundary_index, zone_index=None):
+    """구역 × 행정구역 경계 오버레이로 시군구별 제한 면적/비율 계산
+
+    - 행정구역 bbox로 후보 구역을 추린 뒤(격자 인덱스) 실제 교집합 면적 계산
+    - 같은 시군구의 여러 경계(읍면동 단위 파일)는 합산
+    - 제한 면적과 유형/위험도별 면적은 해당 구역들의 합집합 면적 (겹친 구역을 한 번만 계산, 비율은 100% 이하)
+    - 서로 다른 유형(위험도)의 구역은 겹칠 수 있으므로 by_type/by_severity의 합은 제한 면적보다 클 수 있음
+    """
+    started = time.time()
+    zone_index = zone_index or ZoneIndex.from_zones(zones)
+    zone_edges = {}
+    districts = {}
+    pair_count = 0
+
+    for d in range(len(boundary_index)):
+        record = boundary_index.records[d]
+        key = _district_key(record)
+        bbox = boundary_index.bboxes[d]
+        if not key or not np.isfinite(bbox).all():
+            continue
+
+        origin_lng = (bbox[0] + bbox[2]) / 2
+        origin_lat = (bbox[1] + bbox[3]) / 2
+        da_raw, db_raw = boundary_index.oriented_edges(d)
+        da = _project(da_raw, origin_lng, origin_lat)
+        db = _project(db_raw, origin_lng, origin_lat)
+
+        entry = districts.setdefault(key, {
+            'sido': record.get('sido', ''),
+            'sigungu': record.get('sigungu', ''),
+            'area_m2': 0.0,
+            'restricted_m2': 0.0,
+            'type_m2': {},
+            'severity_m2': {},
+            'zone_areas': {}
+        })
+        entry['area_m2'] += ring_area_m2(da, db)
+
+        overlapping = {}
+        for z in zone_index.candidates_bbox(*bbox):
+            z = int(z)
+            if z not in zone_edges:
+                zone_edges[z] = zone_index.oriented_edges(z)
+            za_raw, zb_raw = zone_edges[z]
+            if len(za_raw) == 0:
+                continue
+            pair_count += 1
+            edges = (_project(za_raw, origin_lng, origin_lat), _project(zb_raw, origin_lng, origin_lat))
+            area = intersection_area_m2(*edges, da, db)
+            if area > 0:
+                entry['zone_areas'][z] = entry['zone_areas'].get(z, 0.0) + area
+                overlapping[z] = edges
+
+        # 겹친 구역을 한 번만 계산하도록 전체/유형별/위험도별 합집합 면적 계산
+        entry['restricted_m2'] += union_intersection_area_m2(list(overlapping.values()), da, db)
+        for field, totals in (('type', entry['type_m2']), ('severity', entry['severity_m2'])):
+            groups = {}
+            for z, edges in overlapping.items():
+                default = '미분류' if field == 'type' else 'low'
+                groups.setdefault(zone_index.records[z].get(field) or default, []).append(edges)
+            for name, group in groups.items():
+                totals[name] = totals.get(name, 0.0) + union_intersection_area_m2(group, da, db)
+
+    coverage = {}
+    for key, entry in districts.items():
+        district_area = entry['area_m2']
+        zone_areas = entry['zone_areas']
+        types = {}
+        for z in zone_areas:
+            zone_type = zone_index.records[z].get('type') or '미분류'
+            types[zone_type] = types.get(zone_type, 0) + 1
+        by_type = entry['type_m2']
+        by_severity = entry['severity_m2']
+
+        def share(area):
+            return min(round(area / district_area * 100, 2), 100.0) if district_area > 0 else 0.0
+
+        restricted = min(entry['restricted_m2'], district_area)
+        coverage[key] = {
+            'sido': entry['sido'],
+            'sigungu': entry['sigungu'],
+            'total': len(zone_areas),
+            'types': types,
+            'district_area_km2': round(district_area / 1e6, 4),
+            'restricted_area_km2': round(restricted / 1e6, 4),
+            'coverage_pct': share(restricted),
+            'by_type': {t: {'zones': types[t], 'area_km2': round(a / 1e6, 4), 'pct': share(a)}
+                        for t, a in sorted(by_type.items(), key=lambda x: -x[1])},
+            'by_severity': {s: {'area_km2': round(by_severity[s] / 1e6, 4), 'pct': share(by_severity[s])}
+                            for s in SEVERITIES if s in by_severity}
+        }
+
+    coverage = {k: v for k, v in sorted(coverage.items(), key=lambda x: -x[1]['restricted_area_km2'])
+                if v['total'] > 0}
+    print(f"🧮 행정구역 면적 오버레이: {len(districts)}개 시군구 × {len(zone_index)}개 구역, "
+          f"교차 계산 {pair_count}쌍 ({time.time() - started:.2f}초)")
+    return coverage
@@ -0,0 +1,474 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+from altitude import altitude_columns, altitude_mask
+from time_validity import parse_timestamp
+from zone_index import (edges_contain_point, edges_distance_m, edges_intersect_bbox, initial_bearing_deg,
+                        iter_polygons, nearest_boundary, radius_window, zone_record)
+
+
+def _area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _union(a, b):
+    return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _cover(boxes):
+    return [min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes)]
+
+
+class _Node:
+    __slots__ = ('leaf', 'boxes', 'items', 'parent')
+
+    def __init__(self, leaf, parent=None):
+        self.leaf = leaf
+        self.boxes = []   # 항목별 bbox [minx, miny, maxx, maxy]
+        self.items = []   # 리프: 구역 키, 내부 노드: 자식 노드
+        self.parent = parent
+
+
+class RTree:
+    """삽입/삭제를 지원하는 R-tree (Guttman 2차 분할)
+
+    - 삭제로 노드가 최소 항목 수보다 작아지면 노드를 떼어 내고 남은 항목을 다시 삽입
+    - 마지막 재구성 이후 변경 횟수가 전체 항목 수를 넘으면 STR 일괄 적재로 다시 짜서
+      삽입/삭제가 누적되며 생기는 bbox 겹침을 정리 (재구성 비용은 변경 횟수에 분할 상환)
+    """
+
+    def __init__(self, max_entries=16, min_fill=0.4, rebuild_min=64):
+        self.max_entries = max_entries
+        self.min_entries = max(2, int(max_entries * min_fill))
+        self.rebuild_min = rebuild_min
+        self.root = _Node(leaf=True)
+        self._leaf_of = {}
+        self._boxes = {}
+        self._changes = 0
+        self.stats = {'splits': 0, 'reinserts': 0, 'rebuilds': 0}
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    # ------------------------------------------------------------------
+    # 삽입
+    # ------------------------------------------------------------------
+    def insert(self, key, box):
+        if key in self._boxes:
+            raise KeyError(f"이미 등록된 키입니다: {key}")
+        box = [float(v) for v in box]
+        self._boxes[key] = box
+        self._insert(key, box)
+        self._touch()
+
+    def _insert(self, key, box):
+        node = self.root
+        while not node.leaf:
+            node = node.items[self._choose_subtree(node, box)]
+        node.boxes.append(box)
+        node.items.append(key)
+        self._leaf_of[key] = node
+        self._adjust(node)
+
+    def _choose_subtree(self, node, box):
+        # bbox 확장 면적이 가장 작은 자식, 같으면 면적이 작은 자식
+        best = 0
+        best_cost = None
+        for i, child_box in enumerate(node.boxes):
+            area = _area(child_box)
+            cost = (_area(_union(child_box, box)) - area, area)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = i, cost
+        return best
+
+    def _adjust(self, node):
+        """노드부터 루트까지 넘친 노드를 분할하고 부모의 bbox를 갱신"""
+        while True:
+            sibling = self._split(node) if len(node.items) > self.max_entries else None
+            parent = node.parent
+            if parent is None:
+                if sibling is not None:
+                    root = _Node(leaf=False)
+                    for child in (node, sibling):
+                        child.parent = root
+                        root.boxes.append(_cover(child.boxes))
+                        root.items.append(child)
+                    self.root = root
+                return
+            parent.boxes[parent.items.index(node)] = _cover(node.boxes)
+            if sibling is not None:
+                sibling.parent = parent
+                parent.boxes.append(_cover(sibling.boxes))
+                parent.items.append(sibling)
+            node = parent
+
+    def _split(self, node):
+        """2차 분할: 함께 두면 낭비가 가장 큰 두 항목을 씨앗으로 나눈 뒤 나머지를 배분"""
+        self.stats['splits'] += 1
+        boxes, items = node.boxes, node.items
+        n = len(items)
+        seeds = (0, 1)
+        worst = -math.inf
+        for i in range(n):
+            for j in range(i + 1, n):
+                waste = _area(_union(boxes[i], boxes[j])) - _area(boxes[i]) - _area(boxes[j])
+                if waste > worst:
+                    seeds, worst = (i, j), waste
+
+        groups = ([seeds[0]], [seeds[1]])
+        covers = [list(boxes[seeds[0]]), list(boxes[seeds[1]])]
+        remaining = [k for k in range(n) if k not in seeds]
+        while remaining:
+            # 한쪽이 최소 항목 수를 채우려면 나머지를 모두 가져가야 하는 경우
+            for g in (0, 1):
+                if len(groups[g]) + len(remaining) == self.min_entries:
+                    groups[g].extend(remaining)
+                    remaining = []
+                    break
+            if not remaining:
+                break
+            # 두 그룹 확장 비용 차이가 가장 큰 항목부터 배정
+            best_k, best_diff, best_g = None, -1.0, 0
+            for k in remaining:
+                d0 = _area(_union(covers[0], boxes[k])) - _area(covers[0])
+                d1 = _area(_union(covers[1], boxes[k])) - _area(covers[1])
+                if abs(d0 - d1) > best_diff:
+                    best_k, best_diff = k, abs(d0 - d1)
+                    cost0 = (d0, _area(covers[0]), len(groups[0]))
+                    cost1 = (d1, _area(covers[1]), len(groups[1]))
+                    best_g = 0 if cost0 <= cost1 else 1
+            groups[best_g].append(best_k)
+            covers[best_g] = _union(covers[best_g], boxes[best_k])
+            remaining.remove(best_k)
+
+        sibling = _Node(leaf=node.leaf)
+        node.boxes, node.items = [boxes[k] for k in groups[0]], [items[k] for k in groups[0]]
+        sibling.boxes, sibling.items = [boxes[k] for k in groups[1]], [items[k] for k in groups[1]]
+        for owner in (node, sibling):
+            for item in owner.items:
+                if owner.leaf:
+                    self._leaf_of[item] = owner
+                else:
+                    item.parent = owner
+        return sibling
+
+    # ------------------------------------------------------------------
+    # 삭제
+    # ------------------------------------------------------------------
+    def delete(self, key):
+        if key not in self._boxes:
+            return False
+        del self._boxes[key]
+        leaf = self._leaf_of.pop(key)
+        i = leaf.items.index(key)
+        del leaf.boxes[i]
+        del leaf.items[i]
+        self._condense(leaf)
+        self._touch()
+        return True
+
+    def _condense(self, node):
+        orphans = []
+        while node.parent is not None:
+            parent = node.parent
+            i = parent.items.index(node)
+            if len(node.items) < self.min_entries:
+                del parent.boxes[i]
+                del parent.items[i]
+                orphans.extend(self._leaf_entries(node))
+            else:
+                parent.boxes[i] = _cover(node.boxes)
+            node = parent
+
+        # 자식이 하나뿐인 내부 루트는 한 단계 내림
+        while not self.root.leaf and len(self.root.items) == 1:
+            self.root = self.root.items[0]
+            self.root.parent = None
+        if not self.root.leaf and not self.root.items:
+            self.root = _Node(leaf=True)
+
+        self.stats['reinserts'] += len(orphans)
+        for key in orphans:
+            self._insert(key, self._boxes[key])
+
+    def _leaf_entries(self, node):
+        if node.leaf:
+            return list(node.items)
+        keys = []
+        for child in node.items:
+            keys.extend(self._leaf_entries(child))
+        return keys
+
+    # ------------------------------------------------------------------
+    # 재구성
+    # ------------------------------------------------------------------
+    def _touch(self):
+        self._changes += 1
+        if self._changes > max(self.rebuild_min, len(self._boxes)):
+            self.rebuild()
+
+    def rebuild(self):
+        """STR(Sort-Tile-Recursive) 일괄 적재로 트리 전체를 다시 구성"""
+        self.stats['rebuilds'] += 1
+        self._changes = 0
+        self._leaf_of = {}
+        entries = list(self._boxes.items())
+        if not entries:
+            self.root = _Node(leaf=True)
+            return
+
+        level = self._pack(entries, leaf=True)
+        while len(level) > 1:
+            level = self._pack([(node, _cover(node.boxes)) for node in level], leaf=False)
+        self.root = level[0]
+        self.root.parent = None
+
+    def _pack(self, entries, leaf):
+        m = self.max_entries
+        leaf_count = math.ceil(len(entries) / m)
+        slab_size = math.ceil(math.sqrt(leaf_count)) * m
+        entries = sorted(entries, key=lambda e: e[1][0] + e[1][2])
+        nodes = []
+        for s in range(0, len(entries), slab_size):
+            slab = sorted(entries[s:s + slab_size], key=lambda e: e[1][1] + e[1][3])
+            for k in range(0, len(slab), m):
+                node = _Node(leaf=leaf)
+                for item, box in slab[k:k + m]:
+                    node.items.append(item)
+                    node.boxes.append(box)
+                    if leaf:
+                        self._leaf_of[item] = node
+                    else:
+                        item.parent = node
+                nodes.append(node)
+        return nodes
+
+    # ------------------------------------------------------------------
+    # 질의
+    # ------------------------------------------------------------------
+    def search(self, box):
+        """bbox가 겹치는 키 목록"""
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for child_box, item in zip(node.boxes, node.items):
+                if _overlaps(child_box, box):
+                    if node.leaf:
+                        found.append(item)
+                    else:
+                        stack.append(item)
+        return found
+
+    def depth(self):
+        depth, node = 1, self.root
+        while not node.leaf:
+            node, depth = node.items[0], depth + 1
+        return depth
+
+
+def zone_edges(zone):
+    """구역 지오메트리 → 변 배열 (a→b)과 bbox"""
+    starts, ends = [], []
+    for polygon in iter_polygons(zone.get('geometry_type'), zone.get('coordinates')):
+        for ring in polygon:
+            if len(ring) < 3:
+                continue
+            ring = np.asarray([(float(p[0]), float(p[1])) for p in ring], dtype=np.float64)
+            if not np.array_equal(ring[0], ring[-1]):
+                ring = np.vstack((ring, ring[:1]))
+            starts.append(ring[:-1])
+            ends.append(ring[1:])
+    if not starts:
+        raise ValueError(f"폴리곤 좌표가 없는 구역입니다: {zone.get('name')}")
+    a = np.concatenate(starts)
+    b = np.concatenate(ends)
+    points = np.vstack((a, b))
+    bbox = [float(points[:, 0].min()), float(points[:, 1].min()),
+            float(points[:, 0].max()), float(points[:, 1].max())]
+    return a, b, bbox
+
+
+class DynamicZoneIndex:
+    """구역을 개별적으로 추가/수정/삭제할 수 있는 공간 인덱스
+
+    임시 비행 제한이나 운영자가 정의한 지오펜스처럼 수시로 바뀌는 구역용.
+    ZoneIndex와 같은 질의(점/3D/bbox/반경, as_of)를 제공하며 결과는 구역 키 목록
+    여러 스레드에서 질의/변경해도 되도록 잠금으로 보호함
+    """
+
+    def __init__(self, max_entries=16):
+        self.tree = RTree(max_entries=max_entries)
+        self.entries = {}
+        self._lock = threading.RLock()
+        self.updated_at = time.time()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @classmethod
+    def from_zones(cls, zones, key=None):
+        """구역 목록으로 생성 (key(zone) 미지정 시 zone_id 또는 index 사용)"""
+        index = cls()
+        for zone in zones:
+            index.insert(key(zone) if key else zone.get('zone_id') or zone.get('index'), zone)
+        index.tree.rebuild()
+        return index
+
+    # ------------------------------------------------------------------
+    # 변경
+    # ------------------------------------------------------------------
+    def insert(self, key, zone):
+        """구역 추가 (같은 키가 있으면 교체)"""
+        a, b, bbox = zone_edges(zone)
+        record = zone_record(zone)
+        record['zone_id'] = key
+        entry = {
+            'zone': zone,
+            'record': record,
+            'a': a,
+            'b': b,
+            'bbox': bbox,
+            'altitude': altitude_columns([zone]),
+            'valid_from': parse_timestamp(zone.get('valid_from')),
+            'valid_to': parse_timestamp(zone.get('valid_to'))
+        }
+        with self._lock:
+            previous = self.entries.get(key)
+            if previous is not None and previous['bbox'] == bbox:
+                # 범위가 같으면 트리는 그대로 두고 내용만 교체
+                self.entries[key] = entry
+            else:
+                if previous is not None:
+                    self.tree.delete(key)
+                self.tree.insert(key, bbox)
+                self.entries[key] = entry
+            self.updated_at = time.time()
+        return previous is None
+
+    def update(self, key, zone):
+        """기존 구역 수정 (없으면 KeyError)"""
+        if key not in self.entries:
+            raise KeyError(f"등록되지 않은 구역입니다: {key}")
+        self.insert(key, zone)
+
+    def delete(self, key):
+        """구역 삭제, 삭제했으면 True"""
+        with self._lock:
+            if self.entries.pop(key, None) is None:
+                return False
+            self.tree.delete(key)
+            self.updated_at = time.time()
+            return True
+
+    # ------------------------------------------------------------------
+    # 질의
+    # ------------------------------------------------------------------
+    def _candidates(self, box, as_of):
+        t = parse_timestamp(as_of)
+        with self._lock:
+            entries = [(key, self.entries[key]) for key in self.tree.search(box)]
+        if t is not None:
+            entries = [(key, e) for key, e in entries
+                       if (e['valid_from'] is None or e['valid_from'] <= t)
+                       and (e['valid_to'] is None or t < e['valid_to'])]
+        return entries
+
+    @staticmethod
+    def _stack_edges(entries):
+        a = np.concatenate([e['a'] for _, e in entries])
+        b = np.concatenate([e['b'] for _, e in entries])
+        owner = np.repeat(np.arange(len(entries)), [len(e['a']) for _, e in entries])
+        return a, b, owner
+
+    def query_point(self, lng, lat, as_of=None):
+        """점을 포함하는 구역 키 목록"""
+        entries = self._candidates([lng, lat, lng, lat], as_of)
+        if not entries:
+            return []
+        a, b, owner = self._stack_edges(entries)
+        inside = edges_contain_point(a, b, owner, len(entries), lng, lat)
+        return [key for (key, _), hit in zip(entries, inside) if hit]
+
+    def query_point_3d(self, lng, lat, altitude_m, reference='AGL', ground_elevation_m=0.0, as_of=None):
+        """점을 포함하고 고도가 하한~상한 사이인 구역 키 목록"""
+        keys = self.query_point(lng, lat, as_of)
+        if not keys:
+            return keys
+        with self._lock:
+            bands = [self.entries[key]['altitude'] for key in keys]
+        columns = {name: np.concatenate([band[name] for band in bands]) for name in bands[0]}
+        mask = altitude_mask(columns, np.arange(len(keys)), altitude_m, reference, ground_elevation_m)
+        return [key for key, hit in zip(keys, mask) if hit]
+
+    def query_bbox(self, minx, miny, maxx, maxy, as_of=None):
+        """bbox와 겹치는 구역 키 목록"""
+        entries = self._candidates([minx, miny, maxx, maxy], as_of)
+        if not entries:
+            return []
+        a, b, owner = self._stack_edges(entries)
+        hit = edges_intersect_bbox(a, b, owner, len(entries), minx, miny, maxx, maxy)
+        return [key for (key, _), h in zip(entries, hit) if h]
+
+    def query_radius(self, lng, lat, radius_m, as_of=None):
+        """점에서 radius_m 이내에 걸치는 구역 키 목록"""
+        entries = self._candidates(list(radius_window(lng, lat, radius_m)), as_of)
+        if not entries:
+            return []
+        a, b, owner = self._stack_edges(entries)
+        near = (edges_contain_point(a, b, owner, len(entries), lng, lat)
+                | (edges_distance_m(a, b, owner, len(entries), lng, lat) <= radius_m))
+        return [key for (key, _), hit in zip(entries, near) if hit]
+
+    def nearest(self, lng, lat, k=5, max_distance_m=None, as_of=None):
+        """경계까지의 구면 거리 기준 가장 가까운 k개 구역 (ZoneIndex.nearest와 같은 형식, id 대신 key)
+
+        임시 구역은 수가 적어 max_distance_m이 없으면 전체를 대상으로 계산
+        """
+        window = list(radius_window(lng, lat, max_distance_m)) if max_distance_m is not None \
+            else [-math.inf, -math.inf, math.inf, math.inf]
+        entries = self._candidates(window, as_of)
+        if not entries or k <= 0:
+            return []
+        a, b, owner = self._stack_edges(entries)
+        dist, lng_near, lat_near = nearest_boundary(lng, lat, a, b, owner, len(entries))
+        order = np.argsort(dist, kind='stable')[:k]
+        if max_distance_m is not None:
+            order = order[dist[order] <= max_distance_m]
+        inside = edges_contain_point(a, b, owner, len(entries), lng, lat)
+        bearing = initial_bearing_deg(lng, lat, lng_near, lat_near)
+        return [{
+            'key': entries[i][0],
+            'distance_m': round(float(dist[i]), 2),
+            'bearing_deg': round(float(bearing[i]), 1),
+            'inside': bool(inside[i]),
+            'boundary_lat': float(lat_near[i]),
+            'boundary_lng': float(lng_near[i])
+        } for i in order]
+
+    def keys(self):
+        with self._lock:
+            return list(self.entries)
+
+    def records(self, keys):
+        with self._lock:
+            return [self.entries[key]['record'] for key in keys if key in self.entries]
+
+    def zones(self):
+        """현재 등록된 구역 목록 (등록 순서)"""
+        with self._lock:
+            return [entry['zone'] for entry in self.entries.values()]
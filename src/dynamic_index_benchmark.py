@@ -0,0 +1,102 @@
+import argparse
+import math
+import random
+import time
+
+from dynamic_index import DynamicZoneIndex
+from load_test import DEFAULT_BOX, percentile
+from zone_index import ZoneIndex
+
+# 작업 비율 (질의, 추가, 수정, 삭제)
+WORKLOADS = {
+    'read-heavy': (0.90, 0.04, 0.04, 0.02),
+    'balanced': (0.50, 0.20, 0.20, 0.10),
+    'write-heavy': (0.10, 0.35, 0.35, 0.20)
+}
+
+
+def synthetic_zone(rng, box=DEFAULT_BOX, vertices=24):
+    """질의 범위 안의 임의 원형 구역 (반경 100m ~ 3km)"""
+    minx, miny, maxx, maxy = box
+    lng = rng.uniform(minx, maxx)
+    lat = rng.uniform(miny, maxy)
+    r = rng.uniform(100, 3000) / 111320
+    ring = [[lng + r / math.cos(math.radians(lat)) * math.cos(2 * math.pi * k / vertices),
+             lat + r * math.sin(2 * math.pi * k / vertices)] for k in range(vertices)]
+    ring.append(ring[0])
+    return {
+        'name': '벤치마크 구역',
+        'geometry_type': 'Polygon',
+        'coordinates': [ring],
+        'restriction_info': {'type': '비행금지구역', 'severity': 'high'}
+    }
+
+
+def run_benchmark(zone_count=2000, operations=5000, seed=7, box=DEFAULT_BOX):
+    """작업 비율별로 동적 인덱스의 변경/질의 지연 측정, 정적 인덱스 전체 재구성 시간과 비교"""
+    rng = random.Random(seed)
+    base = [synthetic_zone(rng, box) for _ in range(zone_count)]
+
+    started = time.perf_counter()
+    ZoneIndex.from_zones(base)
+    rebuild_ms = (time.perf_counter() - started) * 1000
+    print(f"📦 정적 인덱스(ZoneIndex) 전체 재구성: {rebuild_ms:.1f} ms ({zone_count}개 구역) — 변경 1건마다 필요")
+
+    for name, ratios in WORKLOADS.items():
+        index = DynamicZoneIndex()
+        started = time.perf_counter()
+        for i, zone in enumerate(base):
+            index.insert(i, zone)
+        load_ms = (time.perf_counter() - started) * 1000
+        next_key = zone_count
+        latencies = {'query': [], 'insert': [], 'update': [], 'delete': []}
+
+        for _ in range(operations):
+            op = rng.choices(('query', 'insert', 'update', 'delete'), weights=ratios)[0]
+            if op in ('update', 'delete') and len(index) == 0:
+                op = 'insert'
+            # 입력 준비는 측정에서 제외
+            zone = synthetic_zone(rng, box) if op in ('insert', 'update') else None
+            key = rng.choice(index.keys()) if op in ('update', 'delete') else next_key
+            lng = rng.uniform(box[0], box[2])
+            lat = rng.uniform(box[1], box[3])
+            point_query = rng.random() < 0.5
+            started = time.perf_counter()
+            if op == 'query':
+                if point_query:
+                    index.query_point(lng, lat)
+                else:
+                    index.query_bbox(lng, lat, lng + 0.02, lat + 0.02)
+            elif op == 'insert':
+                index.insert(key, zone)
+            elif op == 'update':
+                index.update(key, zone)
+            else:
+                index.delete(key)
+            latencies[op].append((time.perf_counter() - started) * 1000)
+            if op == 'insert':
+                next_key += 1
+
+        print(f"\n🧪 {name} (질의/추가/수정/삭제 = {'/'.join(f'{r:.0%}' for r in ratios)})")
+        print(f"   초기 적재 {load_ms:.1f} ms, 최종 {len(index)}개 구역, 트리 깊이 {index.tree.depth()}, "
+              f"분할 {index.tree.stats['splits']}회, 재삽입 {index.tree.stats['reinserts']}건, "
+              f"재구성 {index.tree.stats['rebuilds']}회")
+        for op, values in latencies.items():
+            if not values:
+                continue
+            values.sort()
+            print(f"   {op:<7} {len(values):>6}건  p50 {percentile(values, 50):.3f} ms  "
+                  f"p95 {percentile(values, 95):.3f} ms  p99 {percentile(values, 99):.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='동적 구역 인덱스 변경/질의 벤치마크')
+    parser.add_argument('--zones', type=int, default=2000, help='초기 구역 수 (기본: 2000)')
+    parser.add_argument('--operations', type=int, default=5000, help='작업 비율별 작업 수 (기본: 5000)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+    run_benchmark(args.zones, args.operations, args.seed)
+
+
+if __name__ == '__main__':
+    main()
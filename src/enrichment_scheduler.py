@@ -0,0 +1,77 @@
+import time
+
+# 보강 순서 (위험도가 높은 구역부터)
+SEVERITY_PRIORITY = {'high': 0, 'medium': 1, 'low': 2}
+
+# 구역별 보강 상태
+STATUS_CACHED = 'cached'        # 캐시/로컬 경계 파일로 보강 (네트워크 없음)
+STATUS_FETCHED = 'fetched'      # API 조회로 보강
+STATUS_FAILED = 'failed'        # API 조회 실패, 대체값 사용
+STATUS_DEADLINE = 'deadline'    # 마감 시각까지 차례가 오지 않아 대체값 사용
+STATUS_SKIPPED = 'skipped'      # 보강 대상 아님 (좌표 없음, 주소 조회 끔)
+
+
+class EnrichmentScheduler:
+    """마감 시각이 있는 구역 보강(주소 조회 등) 스케줄러
+
+    1. 캐시/로컬에서 바로 끝나는 작업을 네트워크 없이 먼저 모두 처리 (마감 이후에도 처리)
+    2. 남은 작업을 위험도 순(high → medium → low, 같은 위험도는 원래 순서)으로 조회하되,
+       작업 소요 시간의 이동 평균으로 다음 작업이 마감 전에 끝날지 추정해 넘으면 멈춤
+    3. 차례가 오지 않은 작업은 대체값으로 채워, 마감 시각 안에 항상 끝나고 중요한 구역부터 완성됨
+    """
+
+    def __init__(self, deadline=None, initial_estimate=1.0, smoothing=0.3, clock=time.time):
+        self.deadline = deadline
+        self.estimate = initial_estimate
+        self.smoothing = smoothing
+        self.clock = clock
+
+    def time_left(self):
+        """마감까지 남은 초 (마감이 없으면 None)"""
+        return None if self.deadline is None else self.deadline - self.clock()
+
+    def _fits(self):
+        left = self.time_left()
+        return left is None or left >= self.estimate
+
+    def run(self, tasks, peek, fetch, fallback, on_done=None):
+        """tasks: [(키, 위험도), ...]
+
+        peek(키) → 네트워크 없이 얻은 값 또는 None, fetch(키) → 조회한 값 또는 None(실패),
+        fallback(키) → 대체값, on_done(키, 값, 상태)는 작업이 끝날 때마다 호출
+        반환: 상태별 작업 수와 경과 시간 dict
+        """
+        started = self.clock()
+        stats = {STATUS_CACHED: 0, STATUS_FETCHED: 0, STATUS_FAILED: 0, STATUS_DEADLINE: 0}
+        order = sorted(range(len(tasks)), key=lambda i: (SEVERITY_PRIORITY.get(tasks[i][1], len(SEVERITY_PRIORITY)), i))
+
+        def finish(key, value, status):
+            stats[status] += 1
+            if on_done:
+                on_done(key, value, status)
+
+        pending = []
+        for i in order:
+            key = tasks[i][0]
+            value = peek(key)
+            if value is not None:
+                finish(key, value, STATUS_CACHED)
+            else:
+                pending.append(key)
+
+        for n, key in enumerate(pending):
+            if not self._fits():
+                for rest in pending[n:]:
+                    finish(rest, fallback(rest), STATUS_DEADLINE)
+                break
+            task_started = self.clock()
+            value = fetch(key)
+            elapsed = self.clock() - task_started
+            self.estimate += self.smoothing * (elapsed - self.estimate)
+            if value is None:
+                finish(key, fallback(key), STATUS_FAILED)
+            else:
+                finish(key, value, STATUS_FETCHED)
+
+        stats['elapsed'] = self.clock() - started
+        return stats
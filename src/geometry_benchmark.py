@@ -0,0 +1,97 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from load_test import DEFAULT_BOX
+from shared_geometry import compute_zone_metrics
+
+# 합성 구역 속성 (VWorld 응답 속성 형태, 분류 분기를 고루 거치도록)
+PROPERTY_TEMPLATES = [
+    {'type': 'UA)초경량비행장치공역', 'prh_lbl_1': 'UA)', 'prh_typ': '', 'rmk': ''},
+    {'type': '관제권', 'prh_lbl_1': '관제', 'prh_typ': '관제권', 'rmk': ''},
+    {'type': '비행금지구역', 'prh_lbl_1': 'P-73', 'prh_typ': '금지', 'rmk': '상시'},
+    {'type': '비행제한구역', 'prh_lbl_1': 'R-75', 'prh_typ': '제한', 'rmk': ''},
+    {'type': '경계구역', 'prh_lbl_1': '', 'prh_typ': '', 'rmk': '임시 2024.05.01 ~ 2024.05.03'}
+]
+
+
+def load_classifier():
+    """운영 경로와 같은 분류 함수 (test.classify_restriction_type, compute_zone_metrics에 그대로 넘김)"""
+    from test import classify_restriction_type
+    return classify_restriction_type
+
+
+def synthetic_packed(zone_count, vertices=12, seed=7, box=DEFAULT_BOX):
+    """pack_geometries와 같은 배치의 합성 구역 배열을 바로 생성 (반경 100m ~ 3km 원형, 닫힌 링)"""
+    rng = np.random.default_rng(seed)
+    minx, miny, maxx, maxy = box
+    lng = rng.uniform(minx, maxx, zone_count)
+    lat = rng.uniform(miny, maxy, zone_count)
+    radius = rng.uniform(100, 3000, zone_count) / 111320
+    angles = 2 * np.pi * np.arange(vertices) / vertices
+    wobble = rng.uniform(0.85, 1.15, (zone_count, vertices))
+    xs = lng[:, None] + radius[:, None] * wobble * np.cos(angles) / np.cos(np.radians(lat))[:, None]
+    ys = lat[:, None] + radius[:, None] * wobble * np.sin(angles)
+    ring = np.stack([np.concatenate([xs, xs[:, :1]], axis=1),
+                     np.concatenate([ys, ys[:, :1]], axis=1)], axis=-1)
+    points_per_ring = vertices + 1
+    return {
+        'xy': ring.reshape(-1, 2),
+        'ring_offsets': np.arange(zone_count + 1, dtype=np.int64) * points_per_ring,
+        'zone_ring_offsets': np.arange(zone_count + 1, dtype=np.int64),
+        'ring_is_hole': np.zeros(zone_count, dtype=bool)
+    }
+
+
+def run_benchmark(zone_count=1_000_000, vertices=12, worker_counts=None, simplify_tolerance_m=30.0, classify=None):
+    """프로세스 수별 일괄 계산(중심점/면적/둘레 + 분류 + 단순화) 시간과 단일 프로세스 대비 속도 향상
+
+    classify가 없으면 운영 경로의 classify_restriction_type 사용
+    """
+    classify = classify or load_classifier()
+    started = time.perf_counter()
+    packed = synthetic_packed(zone_count, vertices)
+    props = [PROPERTY_TEMPLATES[i % len(PROPERTY_TEMPLATES)] for i in range(zone_count)]
+    print(f"📦 합성 구역 {zone_count:,}개 (정점 {len(packed['xy']):,}개, "
+          f"{packed['xy'].nbytes / 1e6:.0f} MB) 생성 {time.perf_counter() - started:.1f}초")
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        metrics = compute_zone_metrics(packed, props, classify, workers=workers,
+                                       simplify_tolerance_m=simplify_tolerance_m)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        if reference is None:
+            reference = metrics
+        same = (np.array_equal(metrics.center, reference.center, equal_nan=True)
+                and np.array_equal(metrics.class_code >= 0, reference.class_code >= 0)
+                and np.array_equal(metrics.keep, reference.keep))
+        speedup = baseline / elapsed
+        print(f"   {workers:>2}개 프로세스: {elapsed:6.2f}초  속도 {speedup:4.1f}배  "
+              f"효율 {speedup / workers:4.0%}  결과 일치 {'예' if same else '아니오'}")
+
+    kept = int(reference.keep.sum())
+    print(f"   평균 면적 {reference.area_m2.mean() / 1e6:.2f} km², 단순화 후 정점 {kept:,}개 "
+          f"({kept / len(reference.keep):.0%}), 분류 유형 {len(set(reference.tables))}종")
+    if cpu_count == 1:
+        print("⚠️  CPU 코어가 1개라 병렬 속도 향상을 측정할 수 없습니다.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='공유 메모리 프로세스 풀 일괄 계산 벤치마크 (합성 구역)')
+    parser.add_argument('--zones', type=int, default=1_000_000, help='합성 구역 수 (기본: 1000000)')
+    parser.add_argument('--vertices', type=int, default=12, help='구역당 정점 수 (기본: 12)')
+    parser.add_argument('--workers', type=int, nargs='+', help='비교할 프로세스 수 목록 (기본: 1 2 4 8 … 코어 수)')
+    parser.add_argument('--simplify', type=float, default=30.0, help='단순화 허용 오차 m (0이면 생략, 기본: 30)')
+    args = parser.parse_args(argv)
+    run_benchmark(args.zones, args.vertices, args.workers, args.simplify or None)
+
+
+if __name__ == '__main__':
+    main()
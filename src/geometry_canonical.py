@@ -0,0 +1,150 @@
+import hashlib
+import json
+import math
+
+from zone_index import iter_polygons
+
+# 정규화 격자 (도 단위, 1e-7° ≈ 1 cm), 이 격자에서 같은 정점이면 같은 점으로 봄
+DEFAULT_GRID_DEG = 1e-7
+
+# classify_restriction_type이 라벨로 읽는 속성
+LABEL_FIELDS = ('prh_lbl_1', 'prh_lbl_2', 'prh_lbl_3', 'prh_lbl_4')
+
+
+def _signed_area2(ring):
+    """닫히지 않은 정수 링의 부호 있는 면적 × 2 (반시계 방향이면 양수)"""
+    return sum(ring[i - 1][0] * p[1] - p[0] * ring[i - 1][1] for i, p in enumerate(ring))
+
+
+def _drop_collinear(ring):
+    """닫히지 않은 정수 링에서 일직선 위(되돌아가는 돌출 포함) 정점 제거, 더 지울 정점이 없을 때까지 반복"""
+    changed = True
+    while changed and len(ring) >= 3:
+        changed = False
+        kept = []
+        n = len(ring)
+        for i, p in enumerate(ring):
+            prev = kept[-1] if kept else ring[i - 1]
+            nxt = ring[(i + 1) % n]
+            if (p[0] - prev[0]) * (nxt[1] - prev[1]) == (p[1] - prev[1]) * (nxt[0] - prev[0]):
+                changed = True
+                continue
+            kept.append(p)
+        ring = kept
+    return ring
+
+
+def canonical_ring(ring, grid, hole=False):
+    """링 → 정규화된 정수 좌표 링 (닫히지 않음), 면적이 없는 링이면 None
+
+    격자 양자화 → 연속 중복/닫는 정점 제거 → 일직선 정점 제거
+    → 방향 통일 (외곽 반시계, 구멍 시계, RFC 7946) → 가장 작은 (x, y) 정점에서 시작
+    """
+    points = []
+    for p in ring:
+        q = (round(p[0] / grid), round(p[1] / grid))
+        if not points or points[-1] != q:
+            points.append(q)
+    while len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    points = _drop_collinear(points)
+    if len(points) < 3:
+        return None
+    area2 = _signed_area2(points)
+    if area2 == 0:
+        return None
+    if (area2 < 0) != hole:
+        points.reverse()
+    start = points.index(min(points))
+    return points[start:] + points[:start]
+
+
+def canonical_polygons(geom_type, coordinates, grid=DEFAULT_GRID_DEG):
+    """폴리곤/멀티폴리곤 → 정규화된 정수 폴리곤 목록 (구멍과 폴리곤 순서 정렬), 없으면 []"""
+    if geom_type == 'Polygon':
+        polygons = [coordinates] if coordinates else []
+    elif geom_type == 'MultiPolygon':
+        polygons = coordinates or []
+    else:
+        return []
+    result = []
+    for polygon in polygons:
+        if not polygon:
+            continue
+        outer = canonical_ring(polygon[0], grid)
+        if outer is None:
+            continue
+        holes = sorted(h for h in (canonical_ring(ring, grid, hole=True) for ring in polygon[1:]) if h)
+        result.append([outer] + holes)
+    return sorted(result)
+
+
+def _to_geojson(polygons, grid):
+    digits = max(0, math.ceil(-math.log10(grid)))
+    rings = [[[[round(x * grid, digits), round(y * grid, digits)] for x, y in ring + ring[:1]]
+              for ring in polygon] for polygon in polygons]
+    if len(rings) == 1:
+        return 'Polygon', rings[0]
+    return 'MultiPolygon', rings
+
+
+def geometry_hash(polygons):
+    """정규화된 폴리곤 목록의 해시 (같은 모양이면 시작점/방향/중복 정점과 무관하게 같은 값)"""
+    payload = json.dumps(polygons, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('ascii')).hexdigest()
+
+
+def feature_labels(props):
+    """피처 속성의 라벨 목록 (classify_restriction_type과 같은 필드 순서)"""
+    return [props[field] for field in LABEL_FIELDS if props.get(field)]
+
+
+def merge_labels(label_lists):
+    """라벨 목록들을 순서를 유지하며 중복 없이 합침"""
+    merged = []
+    for labels in label_lists:
+        for label in labels:
+            if label not in merged:
+                merged.append(label)
+    return merged
+
+
+def canonicalize_features(features, grid=DEFAULT_GRID_DEG, distinct_by=None):
+    """피처 지오메트리를 정규화하고 같은 모양의 피처를 하나로 병합
+
+    - 폴리곤/멀티폴리곤은 정규화된 좌표로 교체 (한 부분짜리 멀티폴리곤은 폴리곤)
+    - 같은 해시의 피처는 처음 나온 피처 하나로 합치고, 나머지 속성은 merged_properties에 보관
+    - distinct_by(props)가 다른 피처는 모양이 같아도 병합하지 않음 (고도 범위/유효 기간이 다른 공역 등)
+    - 정규화할 수 없는 지오메트리(점, 면적 0 등)는 그대로 두고 병합하지 않음
+    반환: (피처 목록, 통계 dict), 입력 피처는 변경하지 않음
+    """
+    unique = []
+    by_key = {}
+    stats = {'input': len(features), 'merged': 0, 'vertices_before': 0, 'vertices_after': 0}
+    for feature in features:
+        geom = feature.get('geometry') or {}
+        geom_type, coordinates = geom.get('type'), geom.get('coordinates')
+        polygons = canonical_polygons(geom_type, coordinates, grid)
+        if not polygons:
+            unique.append(feature)
+            continue
+
+        props = feature.get('properties') or {}
+        geometry_key = geometry_hash(polygons)
+        key = (geometry_key, distinct_by(props)) if distinct_by else geometry_key
+        if key in by_key:
+            by_key[key]['merged_properties'].append(props)
+            stats['merged'] += 1
+            continue
+
+        canonical_type, canonical_coordinates = _to_geojson(polygons, grid)
+        stats['vertices_before'] += sum(len(ring) for polygon in iter_polygons(geom_type, coordinates)
+                                        for ring in polygon)
+        stats['vertices_after'] += sum(len(ring) for polygon in iter_polygons(canonical_type, canonical_coordinates)
+                                       for ring in polygon)
+        feature = dict(feature, geometry=dict(geom, type=canonical_type, coordinates=canonical_coordinates),
+                       geometry_hash=geometry_key, merged_properties=[])
+        by_key[key] = feature
+        unique.append(feature)
+    stats['output'] = len(unique)
+    return unique, stats
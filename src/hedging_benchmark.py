@@ -0,0 +1,141 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from load_test import percentile
+from resilient_http import CircuitOpenError, HedgedClient
+
+
+class SlowApiState:
+    """모의 API 서버의 지연/장애 설정 (벤치마크 도중 바꿀 수 있음)"""
+
+    def __init__(self, base_ms=(20, 60), slow_rate=0.05, slow_ms=1500, seed=11):
+        self.base_ms = base_ms
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.outage = False
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_delay(self):
+        with self._lock:
+            self.requests += 1
+            delay = self._rng.uniform(*self.base_ms)
+            if self._rng.random() < self.slow_rate:
+                delay += self.slow_ms
+            return delay / 1000
+
+
+def start_mock_server(state, host='127.0.0.1', port=0):
+    """응답 지연(일부 요청은 매우 느림)과 장애(503)를 주입하는 VWorld 모의 서버"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(state.next_delay())
+            status = 503 if state.outage else 200
+            body = json.dumps({'response': {'status': 'OK' if status == 200 else 'ERROR',
+                                            'result': [{'text': '모의 주소'}]}}).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _timed_calls(get, url, count):
+    latencies = []
+    failures = 0
+    for i in range(count):
+        started = time.perf_counter()
+        try:
+            response = get(url, params={'point': f"127.0,37.{i}"}, timeout=10)
+            if response.status_code != 200:
+                failures += 1
+        except requests.RequestException:
+            failures += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+    return sorted(latencies), failures
+
+
+def _report(label, latencies, failures):
+    print(f"   {label:<10} p50 {percentile(latencies, 50):7.1f} ms  p95 {percentile(latencies, 95):7.1f} ms  "
+          f"p99 {percentile(latencies, 99):7.1f} ms  최대 {latencies[-1]:7.1f} ms  "
+          f"합계 {sum(latencies) / 1000:5.1f} 초  실패 {failures}건")
+
+
+def run_benchmark(calls=400, slow_rate=0.05, slow_ms=1500, deadline=5.0):
+    """같은 지연 분포의 모의 서버에 직접 요청 vs 헤지 요청 비교, 장애 시 차단기 동작 확인"""
+    state = SlowApiState(slow_rate=slow_rate, slow_ms=slow_ms)
+    server = start_mock_server(state)
+    url = f"http://127.0.0.1:{server.server_address[1]}/req/address"
+    session = requests.Session()
+    print(f"🐢 모의 서버: 기본 {state.base_ms[0]}~{state.base_ms[1]} ms, "
+          f"{slow_rate:.0%} 요청은 +{slow_ms} ms, 순차 {calls}회 호출")
+
+    try:
+        print("\n⏱️  지연 분포")
+        direct, failures = _timed_calls(session.get, url, calls)
+        _report('직접 요청', direct, failures)
+
+        client = HedgedClient(fetch=session.get, deadline=deadline,
+                              breaker_options={'cooldown': 1.0, 'min_calls': 5})
+        state.requests = 0
+        hedged, failures = _timed_calls(client.get, url, calls)
+        _report('헤지 요청', hedged, failures)
+        print(f"   헤지 {client.stats['hedged']}회 (중복 요청이 먼저 응답 {client.stats['hedge_wins']}회), "
+              f"서버 요청 {state.requests}회 (+{state.requests / calls - 1:.1%}), "
+              f"p99 {percentile(direct, 99) / max(percentile(hedged, 99), 1e-9):.1f}배 개선")
+
+        # 장애 구간: 실패율이 임계값을 넘으면 차단기가 열려 서버에 요청하지 않고 즉시 실패
+        print("\n🔌 장애 주입 (모든 요청 503)")
+        state.outage = True
+        state.requests = 0
+        outage, failures = _timed_calls(client.get, url, 50)
+        _report('장애 중', outage, failures)
+        print(f"   차단기 상태 {client.breaker_state(url)}, 서버 요청 {state.requests}회 / 호출 50회, "
+              f"즉시 실패 {client.stats['short_circuited']}회")
+
+        state.outage = False
+        time.sleep(1.1)
+        recovered = 0
+        for _ in range(5):
+            try:
+                recovered += client.get(url, timeout=10).status_code == 200
+            except CircuitOpenError:
+                pass
+        print(f"   복구 후 탐색 요청 → 차단기 상태 {client.breaker_state(url)}, 성공 {recovered}/5회")
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지연 헤지/차단기 벤치마크 (느린 응답을 주입한 모의 서버)')
+    parser.add_argument('--calls', type=int, default=400, help='순차 호출 수 (기본: 400)')
+    parser.add_argument('--slow-rate', type=float, default=0.05, help='느린 응답 비율 (기본: 0.05)')
+    parser.add_argument('--slow-ms', type=float, default=1500, help='느린 응답의 추가 지연 ms (기본: 1500)')
+    parser.add_argument('--deadline', type=float, default=5.0, help='호출당 제한 시간 초 (기본: 5)')
+    args = parser.parse_args(argv)
+    run_benchmark(args.calls, args.slow_rate, args.slow_ms, args.deadline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import http.client
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# 기본 질의 범위 (test.py의 geomFilter BOX와 동일)
+DEFAULT_BOX = (126.734086, 37.413294, 127.269311, 37.715133)
+
+
+def make_query(mode, box, rng):
+    """질의 유형별 임의 요청 경로 생성"""
+    minx, miny, maxx, maxy = box
+    lng = rng.uniform(minx, maxx)
+    lat = rng.uniform(miny, maxy)
+    if mode == 'point':
+        return f"/zones/point?lat={lat:.6f}&lng={lng:.6f}"
+    if mode == 'radius':
+        return f"/zones/radius?lat={lat:.6f}&lng={lng:.6f}&radius={rng.uniform(100, 3000):.0f}"
+    size = rng.uniform(0.005, 0.05)
+    return f"/zones/bbox?minx={lng:.6f}&miny={lat:.6f}&maxx={lng + size:.6f}&maxy={lat + size:.6f}"
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run_load_test(base_url, duration=10.0, concurrency=8, mode='point', box=DEFAULT_BOX):
+    """동시 연결(keep-alive)로 질의를 반복하고 처리량과 지연 분포 측정"""
+    target = urlparse(base_url)
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=10)
+        local = []
+        local_errors = 0
+        modes = ('point', 'bbox', 'radius') if mode == 'mixed' else (mode,)
+        while time.perf_counter() < deadline:
+            path = make_query(rng.choice(modes), box, rng)
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=10)
+                continue
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] * 1000) if latencies else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='구역 질의 서비스 부하 테스트')
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help='서비스 주소')
+    parser.add_argument('--duration', type=float, default=10.0, help='측정 시간(초)')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 연결 수')
+    parser.add_argument('--mode', choices=('point', 'bbox', 'radius', 'mixed'), default='point')
+    args = parser.parse_args()
+
+    print(f"🚦 부하 테스트: {args.url} ({args.mode}, 동시 {args.concurrency}, {args.duration:.0f}초)")
+    result = run_load_test(args.url, args.duration, args.concurrency, args.mode)
+
+    print("=" * 50)
+    print(f"   요청 수: {result['requests']:,}건 (오류 {result['errors']}건)")
+    print(f"   처리량: {result['throughput']:,.0f} req/s")
+    print(f"   지연 p50: {result['p50_ms']:.2f} ms")
+    print(f"   지연 p95: {result['p95_ms']:.2f} ms")
+    print(f"   지연 p99: {result['p99_ms']:.2f} ms")
+    print(f"   최대 지연: {result['max_ms']:.2f} ms")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
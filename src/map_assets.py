@@ -0,0 +1,835 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from atomic_file import atomic_write
+
+# 모든 지도가 같은 내용을 쓰는 정적 자산 (내용 해시를 파일 이름에 넣어 바뀐 자산만 새 이름으로 기록)
+ASSET_MANIFEST = 'manifest.json'
+
+# 범례/상태 표시 스타일 (구역 유형별 색상만 지도 HTML의 style 속성으로 지정)
+LEGEND_CSS = r'''/* 범례 패널 */
+#legend-container {
+    position: fixed;
+    top: 20px;
+    left: 20px;
+    width: 380px;
+    background: rgba(255, 255, 255, 0.95);
+    border: 2px solid #34495e;
+    border-radius: 12px;
+    padding: 20px;
+    z-index: 9999;
+    box-shadow: 0 8px 32px rgba(0,0,0,0.3);
+    backdrop-filter: blur(10px);
+    font-family: 'Malgun Gothic', Arial, sans-serif;
+    max-height: 80vh;
+    overflow-y: auto;
+    display: none;
+}
+
+.legend-header {
+    text-align: center;
+    margin-bottom: 20px;
+    border-bottom: 2px solid #ecf0f1;
+    padding-bottom: 15px;
+}
+
+.legend-header h3 {
+    margin: 0;
+    color: #2c3e50;
+    font-size: 18px;
+    font-weight: bold;
+}
+
+.legend-header p {
+    margin: 5px 0 0 0;
+    font-size: 12px;
+    color: #7f8c8d;
+}
+
+.legend-controls {
+    margin-bottom: 20px;
+    text-align: center;
+}
+
+.legend-button {
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 20px;
+    margin: 0 5px;
+    cursor: pointer;
+    font-size: 12px;
+    font-weight: bold;
+    transition: all 0.3s ease;
+}
+
+.legend-button-show {
+    background: linear-gradient(135deg, #27ae60, #2ecc71);
+}
+
+.legend-button-hide {
+    background: linear-gradient(135deg, #e74c3c, #c0392b);
+}
+
+.legend-section {
+    color: white;
+    padding: 12px;
+    margin-bottom: 15px;
+    border-radius: 8px;
+    text-align: center;
+    background: linear-gradient(135deg, #3498db, #2980b9);
+}
+
+.legend-section-api {
+    background: linear-gradient(135deg, #e67e22, #d35400);
+}
+
+.legend-section h4 {
+    margin: 0;
+    font-size: 14px;
+}
+
+.legend-section div {
+    font-size: 11px;
+    opacity: 0.9;
+    margin-top: 4px;
+}
+
+.legend-group {
+    margin-bottom: 20px;
+}
+
+/* 구역 유형 행 (색상은 행마다 style 속성으로 지정) */
+.legend-row {
+    display: flex;
+    align-items: center;
+    margin-bottom: 12px;
+    padding: 8px;
+    border-radius: 6px;
+    border-left: 4px solid;
+}
+
+.legend-row-api {
+    background: rgba(230, 126, 34, 0.1);
+}
+
+.legend-row input {
+    margin-right: 10px;
+    transform: scale(1.2);
+    cursor: pointer;
+}
+
+.legend-label {
+    display: flex;
+    align-items: center;
+    flex: 1;
+}
+
+.legend-icon {
+    font-size: 16px;
+    margin-right: 8px;
+}
+
+.legend-name {
+    font-weight: bold;
+    color: #2c3e50;
+    font-size: 13px;
+}
+
+.legend-meta {
+    font-size: 11px;
+    color: #7f8c8d;
+}
+
+/* 상태 표시 */
+#toggle-status {
+    display: none;
+    position: fixed;
+    top: 50%;
+    left: 50%;
+    transform: translate(-50%, -50%);
+    background: #3498db;
+    color: white;
+    padding: 12px 24px;
+    border-radius: 25px;
+    font-weight: bold;
+    z-index: 10000;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+    transition: all 0.3s ease;
+}
+
+/* 범례 열기 버튼 */
+.legend-toggle {
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    z-index: 9998;
+}
+
+.legend-toggle button {
+    background: linear-gradient(135deg, #3498db, #2980b9);
+    color: white;
+    border: none;
+    padding: 12px 16px;
+    border-radius: 25px;
+    cursor: pointer;
+    font-weight: bold;
+    font-size: 14px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+    transition: all 0.3s ease;
+}
+
+@keyframes fadeIn {
+    from { opacity: 0; transform: translateY(-20px); }
+    to { opacity: 1; transform: translateY(0); }
+}
+
+.zone-toggle:hover, .api-zone-toggle:hover {
+    transform: scale(1.3) !important;
+    transition: transform 0.2s ease;
+}
+
+button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+}
+
+#legend-container::-webkit-scrollbar {
+    width: 8px;
+}
+
+#legend-container::-webkit-scrollbar-track {
+    background: #f1f1f1;
+    border-radius: 4px;
+}
+
+#legend-container::-webkit-scrollbar-thumb {
+    background: #888;
+    border-radius: 4px;
+}
+
+#legend-container::-webkit-scrollbar-thumb:hover {
+    background: #555;
+}
+
+/* 지점 질의 팝업 (클릭한 지점에 적용되는 구역 목록) */
+.zone-query {
+    font-family: 'Malgun Gothic', Arial, sans-serif;
+    font-size: 12px;
+    max-height: 260px;
+    overflow-y: auto;
+}
+
+.zone-query h4 {
+    margin: 0 0 6px 0;
+    color: #2c3e50;
+    font-size: 14px;
+}
+
+.zone-query-item {
+    border-left: 4px solid #95a5a6;
+    padding: 4px 8px;
+    margin-bottom: 6px;
+    background: #f8f9fa;
+}
+
+.zone-query-item.severity-high {
+    border-left-color: #e74c3c;
+}
+
+.zone-query-item.severity-medium {
+    border-left-color: #f39c12;
+}
+
+.zone-query-hidden {
+    opacity: 0.55;
+}
+
+.zone-query-item a {
+    font-weight: bold;
+    cursor: pointer;
+}
+
+.zone-query-meta {
+    color: #7f8c8d;
+    font-size: 11px;
+}
+'''
+
+# 범례/레이어 토글 스크립트 (지도별 값은 window.zoneMapConfig, 시뮬레이션 구역 정의는 window.apiZoneTypeData)
+MAP_CONTROL_JS = r'''// 전역 변수
+var mapInstance = null;
+var mapLayers = {};
+var apiZoneLayers = {};
+var zoneTypes = (window.zoneMapConfig || {}).zoneTypes || [];
+var additionalZoneTypes = Object.keys(window.apiZoneTypeData || {});
+
+// DOM이 완전히 로드된 후 초기화
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('DOM 로드 완료, 지도 초기화 시작');
+    setTimeout(initializeMapControl, 1000);
+});
+
+// 지도 인스턴스가 준비될 때까지 대기
+function waitForMap() {
+    return new Promise((resolve) => {
+        function checkMap() {
+            if (window[Object.keys(window).find(key => key.startsWith('map_'))] !== undefined) {
+                mapInstance = window[Object.keys(window).find(key => key.startsWith('map_'))];
+                resolve(mapInstance);
+            } else {
+                setTimeout(checkMap, 100);
+            }
+        }
+        checkMap();
+    });
+}
+
+async function initializeMapControl() {
+    try {
+        console.log('지도 컨트롤 초기화 중...');
+
+        // 지도 인스턴스 대기
+        await waitForMap();
+        console.log('지도 인스턴스 확인됨:', mapInstance);
+
+        // 유형별 레이어 그룹 (데이터는 처음 켤 때 불러옴)
+        mapLayers = window.zoneLayerGroups || {};
+
+        console.log('레이어 매핑 완료:', Object.keys(mapLayers));
+
+        // API 기반 구역 레이어 초기화
+        initializeAPIZoneLayers();
+
+        // 범례 표시
+        showLegend();
+
+    } catch (error) {
+        console.error('지도 컨트롤 초기화 오류:', error);
+        setTimeout(initializeMapControl, 2000);
+    }
+}
+
+function initializeAPIZoneLayers() {
+    console.log('API 구역 레이어 초기화 중...');
+    var apiZoneData = window.apiZoneTypeData || {};
+
+    for (var zoneType in apiZoneData) {
+        var zoneInfo = apiZoneData[zoneType];
+        var layerGroup = L.featureGroup();
+
+        createSampleAPIZone(layerGroup, zoneType, zoneInfo);
+        apiZoneLayers[zoneType] = layerGroup;
+        console.log('API 구역 레이어 생성:', zoneType);
+    }
+}
+
+function createSampleAPIZone(layerGroup, zoneType, zoneInfo) {
+    var baseCoords = getBaseCoordinates(zoneType);
+    var lat = baseCoords.lat;
+    var lng = baseCoords.lng;
+
+    // 마커 생성
+    var iconHtml = `
+        <div style="display: flex; justify-content: center; align-items: center; 
+                    width: 30px; height: 30px; 
+                    background-color: white; 
+                    border: ${zoneInfo.border}; 
+                    border-radius: 50%; 
+                    box-shadow: 0 3px 6px rgba(0,0,0,0.2); 
+                    font-size: 15px;">
+            ${zoneInfo.icon}
+        </div>
+    `;
+
+    var marker = L.marker([lat, lng], {
+        icon: L.divIcon({
+            html: iconHtml,
+            iconSize: [30, 30],
+            iconAnchor: [15, 15],
+            className: 'custom-api-marker'
+        })
+    });
+
+    var popupContent = `
+        <div style="width: 300px; font-family: 'Malgun Gothic', Arial, sans-serif;">
+            <h4>${zoneType} (시뮬레이션)</h4>
+            <p>위치: ${lat.toFixed(6)}, ${lng.toFixed(6)}</p>
+            <p>제한 이유: ${zoneInfo.reason}</p>
+        </div>
+    `;
+
+    marker.bindPopup(popupContent);
+    marker.addTo(layerGroup);
+
+    // 원형 영역
+    var circle = L.circle([lat, lng], {
+        color: zoneInfo.color,
+        fillColor: zoneInfo.color,
+        fillOpacity: 0.2,
+        opacity: 0.6,
+        radius: 2000,
+        weight: 3
+    });
+
+    circle.bindPopup(popupContent);
+    circle.addTo(layerGroup);
+}
+
+function getBaseCoordinates(zoneType) {
+    var coordinates = {
+        'P-73A(김포)': {lat: 37.5583, lng: 126.7906},
+        'P-73B(인천)': {lat: 37.4602, lng: 126.4407},
+        'R-75(수원)': {lat: 37.2636, lng: 127.0286},
+        'CTR(관제권)': {lat: 37.5665, lng: 126.9780}
+    };
+
+    return coordinates[zoneType] || {lat: 37.5665, lng: 126.9780};
+}
+
+// 수정된 토글 함수들
+function toggleZoneType(zoneType) {
+    try {
+        console.log('구역 토글 시도:', zoneType);
+        var checkboxId = 'toggle_' + zoneType.replace("[^a-zA-Z0-9]", '_');
+        var checkbox = document.getElementById(checkboxId);
+
+        if (!checkbox) {
+            console.error('체크박스를 찾을 수 없습니다:', checkboxId);
+            return;
+        }
+
+        var layer = mapLayers[zoneType];
+        if (layer && mapInstance) {
+            if (checkbox.checked) {
+                if (!mapInstance.hasLayer(layer)) {
+                    mapInstance.addLayer(layer);
+                }
+                showStatus(zoneType + ' 불러오는 중...', '#3498db');
+                window.loadZoneLayer(zoneType).then(function() {
+                    console.log('레이어 표시:', zoneType);
+                    showStatus(zoneType + ' 표시됨', '#27ae60');
+                }, function() {
+                    showStatus(zoneType + ' 불러오기 실패', '#e74c3c');
+                });
+            } else {
+                if (mapInstance.hasLayer(layer)) {
+                    mapInstance.removeLayer(layer);
+                }
+                console.log('레이어 숨김:', zoneType);
+                showStatus(zoneType + ' 숨김', '#e74c3c');
+            }
+        } else {
+            console.error('레이어 또는 지도를 찾을 수 없습니다:', zoneType);
+        }
+
+    } catch (error) {
+        console.error('구역 토글 오류:', error);
+    }
+}
+
+function toggleAPIZoneType(zoneType) {
+    try {
+        console.log('API 구역 토글 시도:', zoneType);
+        var checkboxId = 'toggle_api_' + zoneType.replace("[^a-zA-Z0-9]", '_');
+        var checkbox = document.getElementById(checkboxId);
+
+        if (!checkbox) {
+            console.error('API 구역 체크박스를 찾을 수 없습니다:', checkboxId);
+            return;
+        }
+
+        var layer = apiZoneLayers[zoneType];
+        if (layer && mapInstance) {
+            if (checkbox.checked) {
+                if (!mapInstance.hasLayer(layer)) {
+                    mapInstance.addLayer(layer);
+                }
+                console.log('API 구역 레이어 표시:', zoneType);
+                showStatus(zoneType + ' 시뮬레이션 표시됨', '#e67e22');
+            } else {
+                if (mapInstance.hasLayer(layer)) {
+                    mapInstance.removeLayer(layer);
+                }
+                console.log('API 구역 레이어 숨김:', zoneType);
+                showStatus(zoneType + ' 시뮬레이션 숨김', '#95a5a6');
+            }
+        } else {
+            console.error('API 구역 레이어를 찾을 수 없습니다:', zoneType);
+        }
+
+    } catch (error) {
+        console.error('API 구역 토글 오류:', error);
+    }
+}
+
+function toggleAllZones(show) {
+    try {
+        console.log('전체 토글:', show);
+
+        // 실제 데이터 구역
+        zoneTypes.forEach(function(zoneType) {
+            var checkboxId = 'toggle_' + zoneType.replace("[^a-zA-Z0-9]", '_');
+            var checkbox = document.getElementById(checkboxId);
+
+            if (checkbox) {
+                checkbox.checked = show;
+                var layer = mapLayers[zoneType];
+                if (layer && mapInstance) {
+                    if (show) {
+                        if (!mapInstance.hasLayer(layer)) {
+                            mapInstance.addLayer(layer);
+                        }
+                    } else {
+                        if (mapInstance.hasLayer(layer)) {
+                            mapInstance.removeLayer(layer);
+                        }
+                    }
+                }
+            }
+        });
+
+        // API 기반 구역
+        additionalZoneTypes.forEach(function(zoneType) {
+            var checkboxId = 'toggle_api_' + zoneType.replace("[^a-zA-Z0-9]", '_');
+            var checkbox = document.getElementById(checkboxId);
+
+            if (checkbox) {
+                checkbox.checked = show;
+                var layer = apiZoneLayers[zoneType];
+                if (layer && mapInstance) {
+                    if (show) {
+                        if (!mapInstance.hasLayer(layer)) {
+                            mapInstance.addLayer(layer);
+                        }
+                    } else {
+                        if (mapInstance.hasLayer(layer)) {
+                            mapInstance.removeLayer(layer);
+                        }
+                    }
+                }
+            }
+        });
+
+        var message = show ? '모든 구역이 표시됩니다' : '모든 구역이 숨겨졌습니다';
+        var color = show ? '#27ae60' : '#95a5a6';
+        showStatus(message, color);
+
+    } catch (error) {
+        console.error('전체 토글 오류:', error);
+    }
+}
+
+function showStatus(message, color = '#3498db') {
+    var statusDiv = document.getElementById('toggle-status');
+    if (statusDiv) {
+        statusDiv.textContent = message;
+        statusDiv.style.background = color;
+        statusDiv.style.display = 'block';
+        statusDiv.style.opacity = '1';
+
+        setTimeout(function() {
+            statusDiv.style.opacity = '0';
+            setTimeout(function() {
+                statusDiv.style.display = 'none';
+            }, 300);
+        }, 2500);
+    }
+}
+
+function showLegend() {
+    var legend = document.getElementById('legend-container');
+    if (legend) {
+        legend.style.display = 'block';
+        legend.style.animation = 'fadeIn 0.3s ease';
+    }
+}
+
+function toggleLegend() {
+    var legend = document.getElementById('legend-container');
+    if (legend) {
+        if (legend.style.display === 'none' || legend.style.display === '') {
+            legend.style.display = 'block';
+            legend.style.animation = 'fadeIn 0.3s ease';
+        } else {
+            legend.style.display = 'none';
+        }
+    }
+}
+
+// 범례 토글 버튼 추가 (키보드 단축키)
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'L' || event.key === 'l') {
+        toggleLegend();
+    }
+});
+'''
+
+
+# 지점 질의 스크립트: 지도 클릭 위치를 덮는 구역을 클릭 인덱스(window.zoneClickIndex)로 찾아 목록 팝업으로 표시
+# (격자 셀 → bbox → 짝홀 규칙 순으로 걸러, 수천 개 구역도 SVG 경로 히트 테스트 없이 몇 ms 안에 답함)
+ZONE_QUERY_JS = r'''var SEVERITY_ORDER = {high: 0, medium: 1, low: 2};
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, function(c) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    });
+}
+
+// 델타 인코딩된 링을 처음 검사할 때 한 구역씩 풀어 둠 (첫 클릭도 전체 디코딩 없이 바로 응답)
+function decodeClickRings(zoneRings) {
+    return zoneRings.map(function(ring) {
+        var out = new Float64Array(ring.length);
+        var x = 0, y = 0;
+        for (var i = 0; i < ring.length; i += 2) {
+            x += ring[i];
+            y += ring[i + 1];
+            out[i] = x;
+            out[i + 1] = y;
+        }
+        return out;
+    });
+}
+
+// 짝홀 규칙: 구역의 모든 링(외곽/구멍, 멀티폴리곤 조각)을 한 번에 검사
+function ringsContain(zoneRings, x, y) {
+    var inside = false;
+    for (var r = 0; r < zoneRings.length; r++) {
+        var ring = zoneRings[r];
+        var n = ring.length;
+        for (var i = 0, j = n - 2; i < n; j = i, i += 2) {
+            var yi = ring[i + 1], yj = ring[j + 1];
+            if ((yi > y) !== (yj > y) &&
+                x < (ring[j] - ring[i]) * (y - yi) / (yj - yi) + ring[i]) {
+                inside = !inside;
+            }
+        }
+    }
+    return inside;
+}
+
+function createZoneQuery(data) {
+    var rings = new Array(data.rings.length);
+    var precision = data.precision, ox = data.origin[0], oy = data.origin[1];
+    var nx = data.size[0], ny = data.size[1];
+    var cw = data.cell[0], ch = data.cell[1];
+    var bbox = data.bbox, offsets = data.offsets, ids = data.ids;
+    // 클릭한 경위도를 덮는 구역 번호 목록
+    return function(lat, lng) {
+        var x = lng * precision - ox, y = lat * precision - oy;
+        var cx = Math.floor(x / cw), cy = Math.floor(y / ch);
+        if (cx < 0 || cy < 0 || cx >= nx || cy >= ny) return [];
+        var cell = cy * nx + cx;
+        var found = [];
+        for (var k = offsets[cell]; k < offsets[cell + 1]; k++) {
+            var id = ids[k], b = id * 4;
+            if (x < bbox[b] || y < bbox[b + 1] || x > bbox[b + 2] || y > bbox[b + 3]) continue;
+            if (!rings[id]) rings[id] = decodeClickRings(data.rings[id]);
+            if (ringsContain(rings[id], x, y)) found.push(id);
+        }
+        return found;
+    };
+}
+
+function zoneQueryItem(data, map, id) {
+    var zone = data.zones[id], strings = data.strings;
+    var zoneType = strings[zone[0]];
+    var severity = zone[3] >= 0 ? strings[zone[3]] : 'low';
+    var group = (window.zoneLayerGroups || {})[zoneType];
+    var hidden = group && !map.hasLayer(group);
+    var altitude = zone[4] === null || zone[4] === undefined ? '-' : zone[4];
+    var reason = zone[5] >= 0 ? strings[zone[5]] : '-';
+    return '<div class="zone-query-item severity-' + escapeHtml(severity) + (hidden ? ' zone-query-hidden' : '') + '">' +
+        '<a data-zone-type="' + escapeHtml(zoneType) + '" data-zone-position="' + zone[1] + '">' +
+        escapeHtml(zoneType) + ': ' + escapeHtml(zone[2] || 'N/A') + '</a>' +
+        (hidden ? ' <span class="zone-query-meta">(숨김)</span>' : '') +
+        '<div class="zone-query-meta">위험도: ' + escapeHtml(severity.toUpperCase()) +
+        ' | 고도 제한: ' + escapeHtml(altitude) + '</div>' +
+        '<div>' + escapeHtml(reason) + '</div></div>';
+}
+
+// 목록의 구역 이름을 누르면 레이어 데이터에서 해당 구역의 상세 팝업을 불러와 표시
+function openZoneDetail(map, latlng, zoneType, position) {
+    var load = window.loadZoneLayer ? window.loadZoneLayer(zoneType) : Promise.resolve(null);
+    load.then(function() {
+        var popups = (window.zoneLayerPopups || {})[zoneType] || [];
+        if (popups[position]) {
+            L.popup({maxWidth: 320}).setLatLng(latlng).setContent(popups[position]).openOn(map);
+        }
+    });
+}
+
+window.attachZoneClickIndex = function(map, data) {
+    var query = createZoneQuery(data);
+    window.queryZonesAt = function(lat, lng) {
+        return query(lat, lng).map(function(id) { return data.zones[id]; });
+    };
+    map.on('click', function(e) {
+        var started = performance.now();
+        var found = query(e.latlng.lat, e.latlng.lng);
+        found.sort(function(a, b) {
+            var sa = SEVERITY_ORDER[data.strings[data.zones[a][3]]], sb = SEVERITY_ORDER[data.strings[data.zones[b][3]]];
+            return (sa === undefined ? 3 : sa) - (sb === undefined ? 3 : sb) || a - b;
+        });
+        var elapsed = performance.now() - started;
+        var html = '<div class="zone-query"><h4>📍 이 지점의 비행 제한 (' + found.length + '개)</h4>';
+        if (!found.length) html += '<div>적용되는 비행 제한 구역이 없습니다.</div>';
+        found.forEach(function(id) { html += zoneQueryItem(data, map, id); });
+        html += '<div class="zone-query-meta">' + e.latlng.lat.toFixed(5) + ', ' + e.latlng.lng.toFixed(5) +
+            ' | 조회 ' + elapsed.toFixed(2) + ' ms</div></div>';
+        var popup = L.popup({maxWidth: 340}).setLatLng(e.latlng).setContent(html).openOn(map);
+        popup.getElement().querySelectorAll('a[data-zone-type]').forEach(function(link) {
+            link.addEventListener('click', function(event) {
+                L.DomEvent.stop(event);
+                openZoneDetail(map, e.latlng, link.getAttribute('data-zone-type'),
+                               Number(link.getAttribute('data-zone-position')));
+            });
+        });
+    });
+};
+'''
+
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s*([{}:;,>])\s*')
+
+
+def minify_css(text):
+    """CSS 주석/공백 제거"""
+    text = _CSS_COMMENT.sub('', text)
+    text = _CSS_SPACE.sub(r'\1', ' '.join(text.split()))
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """JS 줄 단위 축소: 들여쓰기/빈 줄/한 줄 주석 제거 (줄바꿈은 유지해 세미콜론 자동 삽입 규칙에 안전)"""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def data_script(name, value):
+    """값을 전역 변수로 정의하는 스크립트 (JSON 자산을 file:// 로 연 지도에서도 <script src>로 불러오도록)"""
+    return f"window.{name}={json.dumps(value, ensure_ascii=False, separators=(',', ':'))};\n"
+
+
+class StaticAssets:
+    """지도들이 공유하는 정적 자산 디렉토리
+
+    - 자산은 '<이름>.<내용 해시 10자리>.<확장자>'로 한 번만 기록 (내용이 같으면 다시 쓰지 않음)
+    - 파일 이름이 내용과 함께 바뀌므로 브라우저/서버가 기간 제한 없이 캐시해도 안전
+    - manifest.json에 이름 → 현재 파일 이름을 기록 (이전 버전은 지우지 않음, 정리는 prune_static_assets)
+    - gzip=True이면 같은 자리에 .gz도 기록 (nginx gzip_static 등이 그대로 전송)
+    """
+
+    def __init__(self, static_dir, gzip_output=False):
+        self.static_dir = static_dir
+        self.gzip_output = gzip_output
+        self.stats = {'written': 0, 'skipped': 0}
+
+    def add(self, name, extension, text):
+        """자산 기록 후 파일 경로 반환"""
+        data = text.encode('utf-8')
+        file_name = f"{name}.{hashlib.sha1(data).hexdigest()[:10]}.{extension}"
+        path = os.path.join(self.static_dir, file_name)
+        if os.path.exists(path):
+            self.stats['skipped'] += 1
+        else:
+            atomic_write(path, data)
+            self.stats['written'] += 1
+        if self.gzip_output and not os.path.exists(path + '.gz'):
+            atomic_write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        self._update_manifest(f"{name}.{extension}", file_name)
+        return path
+
+    def _update_manifest(self, key, file_name):
+        manifest_path = os.path.join(self.static_dir, ASSET_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get(key) != file_name:
+            manifest[key] = file_name
+            atomic_write(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+# 해시 이름 자산 파일 ('<이름>.<해시 10자리>.<확장자>[.gz]')
+_HASHED_ASSET = re.compile(r'(.+)\.[0-9a-f]{10}\.(\w+)(?:\.gz)?')
+
+
+def prune_static_assets(static_dir, html_roots):
+    """이전 버전 자산 정리 (명시적으로 호출할 때만)
+
+    manifest의 현재 버전과 html_roots 아래 지도 HTML(.html)이 참조하는 파일은 남기고,
+    나머지 해시 이름 자산(.gz 포함)만 삭제. 반환: 삭제한 파일 수
+    """
+    try:
+        with open(os.path.join(static_dir, ASSET_MANIFEST), 'r', encoding='utf-8') as f:
+            keep = set(json.load(f).values())
+    except (OSError, ValueError):
+        return 0
+
+    names = [entry for entry in os.listdir(static_dir) if _HASHED_ASSET.fullmatch(entry)]
+    for root in html_roots:
+        for dirpath, _, files in os.walk(root):
+            for file_name in files:
+                if not file_name.endswith('.html'):
+                    continue
+                try:
+                    with open(os.path.join(dirpath, file_name), 'r', encoding='utf-8', errors='ignore') as f:
+                        html = f.read()
+                except OSError:
+                    continue
+                keep.update(name for name in names if name in html)
+
+    removed = 0
+    for entry in names:
+        if entry.removesuffix('.gz') in keep:
+            continue
+        try:
+            os.remove(os.path.join(static_dir, entry))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def map_asset_tags(output_filename, api_zone_types, static_dir=None, gzip_output=False):
+    """지도 HTML에 넣을 공유 자산 태그 (head용, body용)
+
+    static_dir가 있으면 축소한 CSS/JS/시뮬레이션 구역 정의를 내용 해시 파일로 기록하고 지도 위치 기준
+    상대 경로로 참조, 없으면 축소한 내용을 HTML에 그대로 포함
+    """
+    css = minify_css(LEGEND_CSS)
+    scripts = [('api_zone_types', data_script('apiZoneTypeData', api_zone_types)),
+               ('map_controls', minify_js(MAP_CONTROL_JS)),
+               ('zone_query', minify_js(ZONE_QUERY_JS))]
+    if not static_dir:
+        head = f"<style>{css}</style>"
+        body = ''.join(f"<script>{text}</script>" for _, text in scripts)
+        return head, body
+
+    assets = StaticAssets(static_dir, gzip_output=gzip_output)
+    base = os.path.dirname(os.path.abspath(output_filename))
+
+    def url(path):
+        return os.path.relpath(os.path.abspath(path), base).replace(os.sep, '/')
+
+    head = f'<link rel="stylesheet" href="{url(assets.add("legend", "css", css))}">'
+    body = ''.join(f'<script src="{url(assets.add(name, "js", text))}"></script>' for name, text in scripts)
+    return head, body
+
+
+def write_gzip_copy(path):
+    """파일 옆에 미리 압축한 .gz 사본 기록 (mtime 0으로 고정해 내용이 같으면 같은 바이트)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    atomic_write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    return len(data), os.path.getsize(path + '.gz')
@@ -0,0 +1,307 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+from atomic_file import atomic_write
+from topojson_export import delta_encode
+
+try:
+    from branca.element import MacroElement
+    from jinja2 import Template
+    BRANCA_AVAILABLE = True
+except ImportError:
+    BRANCA_AVAILABLE = False
+
+# 팝업/피처 템플릿을 바꾸면 올려서 이전에 캐시된 조각을 무효화
+FRAGMENT_VERSION = 2
+
+# 지도 데이터 좌표 격자 (1도당 눈금 수, 1e6이면 약 0.1 m)
+# 원점을 0으로 고정해 구역마다 독립적으로 인코딩되므로 조각 캐시가 그대로 유지됨
+GEOMETRY_PRECISION = 1_000_000
+
+
+def _json_default(value):
+    # 구역 피처/속성 뷰(Mapping)는 얕은 dict로 바꿔 직렬화 (좌표 목록은 복사하지 않음)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"JSON으로 직렬화할 수 없는 값: {type(value).__name__}")
+
+
+def content_hash(value):
+    """JSON 직렬화 가능한 값(피처 뷰 포함)의 내용 해시"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class FragmentCache:
+    """지도 출력 파일 하나에 대한 렌더링 조각 캐시
+
+    - fragments.json: 구역 내용 해시 → 렌더링된 피처 조각(JSON 텍스트, 팝업 HTML 포함)
+    - layers.json: 레이어 파일 경로 → 조각 해시 목록의 해시 (같으면 파일을 다시 쓰지 않음)
+    이번 실행에서 쓰이지 않은 조각은 저장할 때 정리됨
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.fragments_path = os.path.join(cache_dir, 'fragments.json')
+        self.layers_path = os.path.join(cache_dir, 'layers.json')
+        self._fragments = _load_json(self.fragments_path)
+        self._layers = _load_json(self.layers_path)
+        self._used = set()
+        self._dirty = False
+        self.stats = {'hit': 0, 'rendered': 0, 'layers_written': 0, 'layers_skipped': 0}
+
+    @classmethod
+    def for_output(cls, cache_root, output_filename):
+        """출력 파일별 캐시 디렉토리 (지역 배치처럼 여러 지도를 동시에 만들어도 서로 덮어쓰지 않음)"""
+        key = hashlib.sha1(os.path.abspath(output_filename).encode('utf-8')).hexdigest()[:16]
+        return cls(os.path.join(cache_root, key))
+
+    def fragment(self, key, render):
+        """캐시된 조각 반환, 없으면 render()로 만들어 저장"""
+        self._used.add(key)
+        text = self._fragments.get(key)
+        if text is None:
+            text = render()
+            self._fragments[key] = text
+            self._dirty = True
+            self.stats['rendered'] += 1
+        else:
+            self.stats['hit'] += 1
+        return text
+
+    def layer_unchanged(self, path, layer_hash):
+        return self._layers.get(os.path.abspath(path)) == layer_hash and os.path.exists(path)
+
+    def mark_layer(self, path, layer_hash):
+        self._layers[os.path.abspath(path)] = layer_hash
+        self._dirty = True
+
+    def save(self):
+        stale = [key for key in self._fragments if key not in self._used]
+        for key in stale:
+            del self._fragments[key]
+        if not self._dirty and not stale:
+            return
+        atomic_write(self.fragments_path,
+                      json.dumps(self._fragments, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        atomic_write(self.layers_path, json.dumps(self._layers, ensure_ascii=False).encode('utf-8'))
+        self._dirty = False
+
+
+def _encode_ring(ring, precision):
+    points = []
+    for p in ring:
+        q = (int(round(float(p[0]) * precision)), int(round(float(p[1]) * precision)))
+        if not points or points[-1] != q:
+            points.append(q)
+    return delta_encode(points) if points else []
+
+
+def encode_geometry(geometry, precision=GEOMETRY_PRECISION):
+    """폴리곤 좌표를 정수 격자로 양자화 후 델타 인코딩 (지도 로더가 풀어서 사용)
+
+    폴리곤이 아닌 지오메트리는 그대로 반환
+    """
+    if not geometry or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+        return geometry
+    if geometry['type'] == 'Polygon':
+        rings = [_encode_ring(ring, precision) for ring in geometry['coordinates']]
+    else:
+        rings = [[_encode_ring(ring, precision) for ring in polygon] for polygon in geometry['coordinates']]
+    return {'type': geometry['type'], 'delta': rings}
+
+
+def render_feature_fragment(feature, popup_html, tooltip):
+    """피처 + 팝업/툴팁을 지도 스크립트가 바로 쓰는 JSON 텍스트로 직렬화"""
+    return json.dumps({
+        'type': 'Feature',
+        'geometry': encode_geometry(feature['geometry']),
+        'properties': feature['properties'],
+        'popup': popup_html,
+        'tooltip': tooltip
+    }, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def layer_script(zone_type, fragments):
+    """레이어 하나의 데이터 스크립트 (캐시된 조각을 이어 붙이기만 함)"""
+    return (f"window.zoneLayerData = window.zoneLayerData || {{}};\n"
+            f"window.zoneLayerData[{json.dumps(zone_type, ensure_ascii=False)}] = [\n"
+            + ",\n".join(fragments) + "\n];\n")
+
+
+def layer_payload_script(zone_type, fragments):
+    """레이어 하나의 압축 데이터 스크립트 (피처 배열 JSON을 gzip + base64로 담음)
+
+    <script src>로 불러오므로 file:// 로 연 지도에서도 동작하고, 압축 해제/파싱은 레이어를 켤 때만 함
+    """
+    payload = ("[" + ",".join(fragments) + "]").encode('utf-8')
+    encoded = base64.b64encode(gzip.compress(payload, compresslevel=9, mtime=0)).decode('ascii')
+    return (f"window.zoneLayerPayload = window.zoneLayerPayload || {{}};\n"
+            f"window.zoneLayerPayload[{json.dumps(zone_type, ensure_ascii=False)}] = \"{encoded}\";\n")
+
+
+def layer_file_name(zone_type):
+    return f"layer_{hashlib.sha1(zone_type.encode('utf-8')).hexdigest()[:10]}.js"
+
+
+def write_layer_files(layers, output_filename, cache=None):
+    """유형별 압축 레이어 파일을 '<출력 이름>_layers/'에 기록, 내용이 같은 파일은 건드리지 않음
+
+    layers: [(zone_type, [(조각 키, 조각 텍스트), ...]), ...]
+    반환: [(zone_type, HTML 기준 상대 경로?v=해시), ...]
+    """
+    stem = os.path.splitext(os.path.basename(output_filename))[0]
+    base_dir = os.path.dirname(output_filename)
+    layer_dir = os.path.join(base_dir, f"{stem}_layers")
+    os.makedirs(layer_dir, exist_ok=True)
+
+    sources = []
+    used_files = set()
+    for zone_type, items in layers:
+        name = layer_file_name(zone_type)
+        used_files.add(name)
+        path = os.path.join(layer_dir, name)
+        layer_hash = content_hash(['gzip', zone_type] + [key for key, _ in items])
+        if cache is not None and cache.layer_unchanged(path, layer_hash):
+            cache.stats['layers_skipped'] += 1
+        else:
+            atomic_write(path, layer_payload_script(zone_type, [text for _, text in items]).encode('utf-8'))
+            if cache is not None:
+                cache.mark_layer(path, layer_hash)
+                cache.stats['layers_written'] += 1
+        sources.append((zone_type, f"{stem}_layers/{name}?v={layer_hash[:12]}"))
+
+    # 더 이상 없는 유형의 레이어 파일 정리
+    for name in os.listdir(layer_dir):
+        if name.startswith('layer_') and name.endswith('.js') and name not in used_files:
+            os.remove(os.path.join(layer_dir, name))
+    return sources
+
+
+def layer_loader_script(group_names, colors, sources=None, initial_types=None):
+    """유형별 FeatureGroup에 레이어 데이터를 채우는 스크립트
+
+    - 데이터가 HTML에 포함된 경우(window.zoneLayerData) 바로 사용
+    - sources(유형 → 레이어 파일 경로)가 있으면 처음 켤 때 파일을 불러와 압축 해제 (DecompressionStream)
+    - initial_types만 시작할 때 불러오고, 나머지는 범례/레이어 컨트롤에서 켤 때 불러옴
+    델타 인코딩된 좌표(geometry.delta)는 L.geoJSON에 넘기기 전에 경위도로 복원
+    클릭 인덱스(window.zoneClickIndex)가 있으면 폴리곤을 비대화형으로 만들고 팝업은 window.zoneLayerPopups에 보관
+    window.loadZoneLayer(유형)은 레이어가 채워지면 끝나는 Promise를 반환
+    """
+    initial_types = list(group_names) if initial_types is None else list(initial_types)
+    return f"""
+    (function() {{
+        var precision = {GEOMETRY_PRECISION};
+        function decodeRing(ring) {{
+            var x = 0, y = 0;
+            return ring.map(function(d) {{
+                x += d[0];
+                y += d[1];
+                return [x / precision, y / precision];
+            }});
+        }}
+        function decodeGeometry(geometry) {{
+            if (!geometry || !geometry.delta) return geometry;
+            var coordinates = geometry.type === 'Polygon'
+                ? geometry.delta.map(decodeRing)
+                : geometry.delta.map(function(polygon) {{ return polygon.map(decodeRing); }});
+            return {{type: geometry.type, coordinates: coordinates}};
+        }}
+        function loadScript(src) {{
+            return new Promise(function(resolve, reject) {{
+                var script = document.createElement('script');
+                script.src = src;
+                script.onload = resolve;
+                script.onerror = function() {{ reject(new Error('레이어 파일을 불러올 수 없습니다: ' + src)); }};
+                document.head.appendChild(script);
+            }});
+        }}
+        function inflate(encoded) {{
+            var binary = atob(encoded);
+            var bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+            var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return new Response(stream).text().then(JSON.parse);
+        }}
+        function fetchFeatures(zoneType) {{
+            var inline = (window.zoneLayerData || {{}})[zoneType];
+            if (inline) return Promise.resolve(inline);
+            var src = zoneSources[zoneType];
+            if (!src) return Promise.resolve([]);
+            return loadScript(src).then(function() {{
+                var payload = window.zoneLayerPayload[zoneType];
+                delete window.zoneLayerPayload[zoneType];
+                return inflate(payload);
+            }});
+        }}
+        var zoneGroups = {{{', '.join(f'{json.dumps(t, ensure_ascii=False)}: {name}' for t, name in group_names.items())}}};
+        var zoneColors = {json.dumps(colors, ensure_ascii=False)};
+        var zoneSources = {json.dumps(sources or {}, ensure_ascii=False)};
+        var loading = {{}};
+        // 클릭 인덱스가 있으면 지점 질의 팝업이 클릭을 처리하므로 폴리곤은 히트 테스트하지 않음
+        var clickIndexed = !!window.zoneClickIndex;
+        var zonePopups = {{}};
+        window.zoneLayerGroups = zoneGroups;
+        window.zoneLayerPopups = zonePopups;
+        window.loadZoneLayer = function(zoneType) {{
+            if (!zoneGroups[zoneType]) return Promise.resolve(null);
+            if (!loading[zoneType]) {{
+                var color = zoneColors[zoneType];
+                loading[zoneType] = fetchFeatures(zoneType).then(function(features) {{
+                    features.forEach(function(feature) {{
+                        feature.geometry = decodeGeometry(feature.geometry);
+                    }});
+                    zonePopups[zoneType] = features.map(function(feature) {{ return feature.popup; }});
+                    L.geoJSON(features, {{
+                        interactive: !clickIndexed,
+                        style: function() {{
+                            return {{fillColor: color, color: color, weight: 3, fillOpacity: 0.3, opacity: 0.8}};
+                        }},
+                        onEachFeature: function(feature, layer) {{
+                            if (clickIndexed) return;
+                            layer.bindPopup(feature.popup, {{maxWidth: 320}});
+                            layer.bindTooltip(feature.tooltip);
+                        }}
+                    }}).addTo(zoneGroups[zoneType]);
+                    return zoneGroups[zoneType];
+                }}).catch(function(error) {{
+                    delete loading[zoneType];
+                    console.error('레이어 로드 오류:', zoneType, error);
+                    throw error;
+                }});
+            }}
+            return loading[zoneType];
+        }};
+        // 레이어 컨트롤에서 켠 레이어도 처음 켤 때 불러옴
+        Object.keys(zoneGroups).forEach(function(zoneType) {{
+            zoneGroups[zoneType].on('add', function() {{ window.loadZoneLayer(zoneType); }});
+        }});
+        {json.dumps(initial_types, ensure_ascii=False)}.forEach(function(zoneType) {{
+            window.loadZoneLayer(zoneType);
+        }});
+    }})();
+    """
+
+
+if BRANCA_AVAILABLE:
+    class ZoneLayerLoader(MacroElement):
+        """지도와 FeatureGroup 생성 뒤에 실행되도록 스크립트 영역에 레이어 로더를 넣는 요소"""
+
+        _template = Template("{% macro script(this, kwargs) %}{{ this.code }}{% endmacro %}")
+
+        def __init__(self, code):
+            super().__init__()
+            self._name = 'ZoneLayerLoader'
+            self.code = code
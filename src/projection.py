@@ -0,0 +1,371 @@
+import math
+
+import numpy as np
+
+from zone_index import iter_polygons
+
+# GRS80 타원체 (Korea 2000 / EPSG:5186, 5179 기준)
+GRS80_A = 6378137.0
+GRS80_F = 1 / 298.257222101
+GRS80_E2 = GRS80_F * (2 - GRS80_F)
+
+# 면적/둘레/버퍼 기본 좌표계 (한반도 전체를 한 좌표계로 덮는 UTM-K)
+DEFAULT_CRS = 'EPSG:5179'
+
+# 버퍼 원호를 사분원당 몇 개의 선분으로 나눌지 (shapely 기본값과 같음)
+BUFFER_QUAD_SEGMENTS = 8
+
+# 축척 계수를 구할 때 쓰는 수치 미분 간격 (라디안)
+_JACOBIAN_STEP = 1e-6
+
+
+class TransverseMercator:
+    """타원체 횡메르카토르 (Krüger 6차 급수, 중앙 자오선에서 ±4000 km까지 mm 이하 오차)
+
+    EPSG:5186/5179처럼 중앙 자오선/원점 위도/축척/가산값으로 정의되는 좌표계
+    """
+
+    def __init__(self, lng0, lat0, k0, false_easting, false_northing, a=GRS80_A, f=GRS80_F):
+        self.lng0 = math.radians(lng0)
+        self.k0 = k0
+        self.false_easting = false_easting
+        self.false_northing = false_northing
+        n = f / (2 - f)
+        self.e = 2 * math.sqrt(n) / (1 + n)
+        self.radius = a / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64 + n ** 6 / 256)
+        self.alpha = (
+            n / 2 - 2 / 3 * n ** 2 + 5 / 16 * n ** 3 + 41 / 180 * n ** 4 - 127 / 288 * n ** 5
+            + 7891 / 37800 * n ** 6,
+            13 / 48 * n ** 2 - 3 / 5 * n ** 3 + 557 / 1440 * n ** 4 + 281 / 630 * n ** 5
+            - 1983433 / 1935360 * n ** 6,
+            61 / 240 * n ** 3 - 103 / 140 * n ** 4 + 15061 / 26880 * n ** 5 + 167603 / 181440 * n ** 6,
+            49561 / 161280 * n ** 4 - 179 / 168 * n ** 5 + 6601661 / 7257600 * n ** 6,
+            34729 / 80640 * n ** 5 - 3418889 / 1995840 * n ** 6,
+            212378941 / 319334400 * n ** 6
+        )
+        self.beta = (
+            n / 2 - 2 / 3 * n ** 2 + 37 / 96 * n ** 3 - 1 / 360 * n ** 4 - 81 / 512 * n ** 5
+            + 96199 / 604800 * n ** 6,
+            1 / 48 * n ** 2 + 1 / 15 * n ** 3 - 437 / 1440 * n ** 4 + 46 / 105 * n ** 5
+            - 1118711 / 3870720 * n ** 6,
+            17 / 480 * n ** 3 - 37 / 840 * n ** 4 - 209 / 4480 * n ** 5 + 5569 / 90720 * n ** 6,
+            4397 / 161280 * n ** 4 - 11 / 504 * n ** 5 - 830251 / 7257600 * n ** 6,
+            4583 / 161280 * n ** 5 - 108847 / 3991680 * n ** 6,
+            20648693 / 638668800 * n ** 6
+        )
+        # 원점 위도까지의 자오선 호 길이 (northing 기준점)
+        self.origin_xi = float(self._forward_series(np.array([self._conformal_tan(math.radians(lat0))]),
+                                                    np.zeros(1))[0].real)
+
+    def _conformal_tan(self, phi):
+        """위도 → 등각 위도의 tan"""
+        sin_phi = np.sin(phi)
+        return np.sinh(np.arctanh(sin_phi) - self.e * np.arctanh(self.e * sin_phi))
+
+    @staticmethod
+    def _series(zeta, coefficients, sign):
+        """zeta + sign × Σ c_j sin(2jζ) (복소수, 배각 공식으로 sin/cos를 한 번만 계산)"""
+        s1, c1 = np.sin(2 * zeta), np.cos(2 * zeta)
+        s, c = s1, c1
+        total = np.zeros_like(zeta)
+        for j, coefficient in enumerate(coefficients):
+            if j:
+                s, c = s * c1 + c * s1, c * c1 - s * s1
+            total = total + coefficient * s
+        return zeta + sign * total
+
+    def _forward_series(self, t, dlng):
+        xi_prime = np.arctan2(t, np.cos(dlng))
+        eta_prime = np.arcsinh(np.sin(dlng) / np.hypot(t, np.cos(dlng)))
+        return self._series(xi_prime + 1j * eta_prime, self.alpha, 1)
+
+    def forward(self, lng, lat):
+        """경위도(도) 배열 → (x=easting, y=northing) m 배열"""
+        zeta = self._forward_series(self._conformal_tan(np.radians(lat)), np.radians(lng) - self.lng0)
+        scale = self.k0 * self.radius
+        return (self.false_easting + scale * zeta.imag,
+                self.false_northing + scale * (zeta.real - self.origin_xi))
+
+    def inverse(self, x, y):
+        """(x, y) m 배열 → (경도, 위도) 도 배열"""
+        scale = self.k0 * self.radius
+        zeta = ((np.asarray(y, dtype=np.float64) - self.false_northing) / scale + self.origin_xi
+                + 1j * (np.asarray(x, dtype=np.float64) - self.false_easting) / scale)
+        zeta_prime = self._series(zeta, self.beta, -1)
+        xi_prime, eta_prime = zeta_prime.real, zeta_prime.imag
+        chi = np.arcsin(np.sin(xi_prime) / np.cosh(eta_prime))
+        # 등각 위도 → 위도 (고정점 반복, 6회면 1e-12 rad 이하로 수렴)
+        phi = chi
+        tan_half = np.tan(math.pi / 4 + chi / 2)
+        for _ in range(6):
+            e_sin = self.e * np.sin(phi)
+            phi = 2 * np.arctan(((1 + e_sin) / (1 - e_sin)) ** (self.e / 2) * tan_half) - math.pi / 2
+        lng = self.lng0 + np.arctan2(np.sinh(eta_prime), np.cos(xi_prime))
+        return np.degrees(lng), np.degrees(phi)
+
+
+class WebMercator:
+    """웹 메르카토르 (EPSG:3857, 타원체 경위도를 구면 식으로 투영, 등각이 아님)"""
+
+    def __init__(self, a=GRS80_A):
+        self.radius = a
+
+    def forward(self, lng, lat):
+        return (self.radius * np.radians(lng),
+                self.radius * np.log(np.tan(math.pi / 4 + np.radians(lat) / 2)))
+
+    def inverse(self, x, y):
+        lat = 2 * np.arctan(np.exp(np.asarray(y, dtype=np.float64) / self.radius)) - math.pi / 2
+        return np.degrees(np.asarray(x, dtype=np.float64) / self.radius), np.degrees(lat)
+
+
+PROJECTIONS = {
+    # Korea 2000 / Central Belt 2010 (중부원점)
+    'EPSG:5186': TransverseMercator(127.0, 38.0, 1.0, 200000.0, 600000.0),
+    # Korea 2000 / Unified CS (UTM-K)
+    'EPSG:5179': TransverseMercator(127.5, 38.0, 0.9996, 1000000.0, 2000000.0),
+    'EPSG:3857': WebMercator()
+}
+
+
+def get_projection(crs):
+    try:
+        return PROJECTIONS[crs.upper()]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 좌표계: {crs} (지원: {', '.join(PROJECTIONS)})") from None
+
+
+def project(lng, lat, crs=DEFAULT_CRS):
+    """경위도(도) 배열 → 투영 좌표(m) 배열 (x, y), 전체 배열을 한 번에 변환"""
+    return get_projection(crs).forward(np.asarray(lng, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+
+
+def unproject(x, y, crs=DEFAULT_CRS):
+    """투영 좌표(m) 배열 → 경위도(도) 배열 (경도, 위도)"""
+    return get_projection(crs).inverse(x, y)
+
+
+def project_packed(packed, crs=DEFAULT_CRS):
+    """pack_geometries 결과의 좌표 배열 전체 → 같은 배치의 투영 좌표 배열 (n, 2)"""
+    x, y = project(packed['xy'][:, 0], packed['xy'][:, 1], crs)
+    return np.column_stack((x, y))
+
+
+def _radii(lat):
+    """위도별 자오선 곡률 반경 M, 묘유선 곡률 반경 N (m)"""
+    w2 = 1 - GRS80_E2 * np.sin(np.radians(lat)) ** 2
+    return GRS80_A * (1 - GRS80_E2) / w2 ** 1.5, GRS80_A / np.sqrt(w2)
+
+
+def ground_jacobian(lng, lat, crs=DEFAULT_CRS):
+    """지점별 지표 거리 → 투영 좌표 변환 행렬 (…, 2, 2)
+
+    열은 동쪽/북쪽으로 지표 1 m 움직일 때의 투영 좌표 변화 (등각 좌표계면 축척 계수 k × 회전)
+    """
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    step = math.degrees(_JACOBIAN_STEP)
+    m, n = _radii(lat)
+    columns = []
+    for dlng, dlat, ground in ((step, 0.0, n * np.cos(np.radians(lat))), (0.0, step, m)):
+        x1, y1 = project(lng + dlng, lat + dlat, crs)
+        x0, y0 = project(lng - dlng, lat - dlat, crs)
+        columns.append(np.stack(((x1 - x0), (y1 - y0)), axis=-1) / (2 * _JACOBIAN_STEP * ground)[..., None])
+    return np.stack(columns, axis=-1)
+
+
+def scale_factor(lng, lat, crs=DEFAULT_CRS):
+    """지점별 면적 축척의 제곱근 (등각 좌표계면 점 축척 계수 k와 같음)"""
+    return np.sqrt(np.abs(np.linalg.det(ground_jacobian(lng, lat, crs))))
+
+
+def ring_area_perimeter(lng, lat, starts, counts, crs=DEFAULT_CRS):
+    """연속 배열에 담긴 링들의 지표 면적(m², 부호 없음)과 둘레(m)
+
+    lng, lat: 정점 배열, starts/counts: 링별 시작 위치와 정점 수 (빈 링 허용, 닫는 점은 있어도 없어도 됨)
+    링 전체를 한 번에 투영한 뒤, 링 중심의 축척(자코비안)으로 투영 면적과 변 길이를 지표 값으로 보정
+    정점이 3개 미만인 링은 0
+    """
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    ring_count = len(starts)
+    if ring_count == 0 or len(lng) == 0:
+        return np.zeros(ring_count), np.zeros(ring_count)
+
+    filled = counts > 0
+    ring_of = np.repeat(np.arange(ring_count), counts)
+    local = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    vertex = np.arange(int(counts.sum())) + np.repeat(starts - local, counts)
+
+    # 끝에 0을 하나 붙여 빈 링도 reduceat 구간이 되도록 함
+    def ring_sums(values):
+        return np.add.reduceat(np.append(values, 0.0), local)
+
+    ring_lng = ring_sums(lng[vertex]) / np.maximum(counts, 1)
+    ring_lat = ring_sums(lat[vertex]) / np.maximum(counts, 1)
+    jacobian = ground_jacobian(ring_lng[filled], ring_lat[filled], crs)
+    inverse = np.zeros((ring_count, 2, 2))
+    inverse[filled] = np.linalg.inv(jacobian)
+    area_scale = np.ones(ring_count)
+    area_scale[filled] = np.abs(np.linalg.det(jacobian))
+
+    x, y = project(lng[vertex], lat[vertex], crs)
+    first = local[ring_of]
+    x, y = x - x[first], y - y[first]
+    following = np.arange(len(vertex)) + 1
+    following[local[filled] + counts[filled] - 1] = local[filled]
+    cross = ring_sums(x * y[following] - x[following] * y)
+    dx, dy = x[following] - x, y[following] - y
+    ground = inverse[ring_of] @ np.stack((dx, dy), axis=-1)[..., None]
+    step = ring_sums(np.hypot(ground[:, 0, 0], ground[:, 1, 0]))
+
+    valid = counts >= 3
+    area = np.where(valid, 0.5 * np.abs(cross) / area_scale, 0.0)
+    perimeter = np.where(valid, step, 0.0)
+    return area, perimeter
+
+
+def zone_area_perimeter(packed, crs=DEFAULT_CRS):
+    """pack_geometries 결과 → 구역별 지표 면적(m², 구멍 제외)/둘레(m, 외곽 링) 배열"""
+    ring_offsets, zone_ring_offsets = packed['ring_offsets'], packed['zone_ring_offsets']
+    starts = ring_offsets[:-1]
+    area, perimeter = ring_area_perimeter(packed['xy'][:, 0], packed['xy'][:, 1], starts,
+                                          ring_offsets[1:] - starts, crs)
+    holes = packed['ring_is_hole']
+    area = np.where(holes, -area, area)
+    perimeter = np.where(holes, 0.0, perimeter)
+    first_ring = zone_ring_offsets[:-1]
+    has_rings = zone_ring_offsets[1:] > first_ring
+    zone_area = np.add.reduceat(np.append(area, 0.0), first_ring)
+    zone_perimeter = np.add.reduceat(np.append(perimeter, 0.0), first_ring)
+    return (np.where(has_rings, np.maximum(zone_area, 0.0), 0.0),
+            np.where(has_rings, zone_perimeter, 0.0))
+
+
+def _segment_crossings(points):
+    """닫힌 링(닫는 점 없음)의 변끼리 교차점 목록 [(변 i, 비율 t, 변 j, 비율 u), ...] (이웃한 변 제외)"""
+    a = points
+    b = np.roll(points, -1, axis=0)
+    d = b - a
+    n = len(points)
+    crossings = []
+    block = max(1, 2_000_000 // max(n, 1))
+    for lo in range(0, n, block):
+        i = np.arange(lo, min(n, lo + block))[:, None]
+        j = np.arange(n)[None, :]
+        denominator = d[i, 0] * d[j, 1] - d[i, 1] * d[j, 0]
+        ox, oy = a[j, 0] - a[i, 0], a[j, 1] - a[i, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (ox * d[j, 1] - oy * d[j, 0]) / denominator
+            u = (ox * d[i, 1] - oy * d[i, 0]) / denominator
+        adjacent = (np.abs(i - j) <= 1) | (np.abs(i - j) == n - 1)
+        hit = (denominator != 0) & ~adjacent & (t > 0) & (t < 1) & (u > 0) & (u < 1)
+        for r, c in zip(*np.nonzero(hit)):
+            crossings.append((int(i[r, 0]), float(t[r, c]), int(c), float(u[r, c])))
+    return crossings
+
+
+def _outer_boundary(points):
+    """자기 교차가 있는 반시계 링(닫는 점 없음)의 바깥 경계
+
+    x가 가장 작은 정점(바깥 경계 위)에서 출발해 교차점마다 오른쪽으로 꺾이는 변으로 갈아타며 한 바퀴 돔
+    (오프셋 과정에서 생긴 역방향 고리와 안쪽 주머니가 제거됨)
+    """
+    crossings = _segment_crossings(points)
+    if not crossings:
+        return points
+    n = len(points)
+    d = np.roll(points, -1, axis=0) - points
+    on_segment = {}
+    for i, t, j, u in crossings:
+        on_segment.setdefault(i, []).append((t, j, u))
+    for hits in on_segment.values():
+        hits.sort()
+
+    start = int(np.argmin(points[:, 0]))
+    segment, position = start, 0.0
+    result = [points[start]]
+    for _ in range(4 * (n + len(crossings))):
+        turn = None
+        for t, j, u in on_segment.get(segment, ()):
+            if t > position + 1e-12 and d[segment, 0] * d[j, 1] - d[segment, 1] * d[j, 0] < 0:
+                turn = (t, j, u)
+                break
+        if turn is None:
+            segment = (segment + 1) % n
+            position = 0.0
+            if segment == start:
+                break
+            result.append(points[segment])
+        else:
+            t, segment, position = turn
+            result.append(points[turn[1]] + d[turn[1]] * position)
+    return np.asarray(result)
+
+
+def offset_ring(points, distance, quad_segments=BUFFER_QUAD_SEGMENTS):
+    """반시계 링(닫는 점 없음, 평면 좌표)을 바깥으로 distance만큼 넓힌 링 (볼록 꼭짓점은 원호로 이음)"""
+    d = np.roll(points, -1, axis=0) - points
+    length = np.hypot(d[:, 0], d[:, 1])
+    keep = length > 0
+    points, d, length = points[keep], d[keep], length[keep]
+    normal = np.column_stack((d[:, 1], -d[:, 0])) / length[:, None]   # 반시계 링의 바깥쪽 법선
+    angle_step = math.pi / 2 / quad_segments
+
+    raw = []
+    for i in range(len(points)):
+        previous = normal[i - 1]
+        current = normal[i]
+        turn = previous[0] * current[1] - previous[1] * current[0]
+        if turn > 0:
+            # 볼록 꼭짓점: 이전 변 법선에서 현재 변 법선까지 원호
+            start_angle = math.atan2(previous[1], previous[0])
+            sweep = math.atan2(turn, float(previous @ current))
+            steps = max(1, math.ceil(sweep / angle_step))
+            angles = start_angle + sweep * np.arange(steps + 1) / steps
+            raw.extend(points[i] + distance * np.column_stack((np.cos(angles), np.sin(angles))))
+        else:
+            # 오목(또는 일직선) 꼭짓점: 두 오프셋 변 끝점을 원래 꼭짓점을 거쳐 이음 (생기는 고리는 나중에 제거)
+            raw.append(points[i] + distance * previous)
+            if turn < 0:
+                raw.append(points[i])
+            raw.append(points[i] + distance * current)
+    return _outer_boundary(np.asarray(raw))
+
+
+def buffer_geometry(geom_type, coordinates, distance_m, crs=DEFAULT_CRS, quad_segments=BUFFER_QUAD_SEGMENTS):
+    """폴리곤/멀티폴리곤을 지표 거리 distance_m만큼 넓힌 지오메트리 (안전 여유 구역)
+
+    링을 투영 좌표계로 옮겨 링 중심 축척만큼 보정한 거리로 오프셋한 뒤 경위도로 되돌림
+    - 구멍은 메움, 좁은 만(폭 < 2×거리)은 닫힌 쪽까지 채움 (안전 여유 목적이라 넓은 쪽으로 근사)
+    - 폴리곤마다 따로 넓히므로 멀티폴리곤 부분끼리 겹칠 수 있음
+    반환: (geom_type, coordinates), 넓힐 폴리곤이 없으면 (None, None)
+    """
+    if distance_m <= 0:
+        return geom_type, coordinates
+    polygons = []
+    for polygon in iter_polygons(geom_type, coordinates):
+        ring = np.asarray(polygon[0], dtype=np.float64)
+        if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+            ring = ring[:-1]
+        if len(ring) < 3:
+            continue
+        x, y = project(ring[:, 0], ring[:, 1], crs)
+        points = np.column_stack((x, y))
+        area2 = float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+        if area2 == 0:
+            continue
+        if area2 < 0:
+            points = points[::-1]
+        k = float(scale_factor(ring[:, 0].mean(), ring[:, 1].mean(), crs))
+        buffered = offset_ring(points, distance_m * k, quad_segments)
+        lng, lat = unproject(buffered[:, 0], buffered[:, 1], crs)
+        coords = np.column_stack((lng, lat)).tolist()
+        polygons.append([coords + coords[:1]])
+    if not polygons:
+        return None, None
+    if len(polygons) == 1:
+        return 'Polygon', polygons[0]
+    return 'MultiPolygon', polygons
@@ -0,0 +1,162 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from geometry_benchmark import synthetic_packed
+from projection import (GRS80_A, GRS80_E2, PROJECTIONS, buffer_geometry, project, project_packed, ring_area_perimeter,
+                        scale_factor, unproject, zone_area_perimeter)
+from projection import _radii
+from shared_geometry import M_PER_DEG
+
+# 허용 오차 (상대 오차, 도, m)
+AREA_TOLERANCE = 1e-5
+ROUND_TRIP_TOLERANCE_DEG = 1e-10
+ARC_TOLERANCE_M = 1e-6
+BUFFER_TOLERANCE_M = 0.5
+
+# 검증용 경위도 사각형 (서쪽 경도, 남쪽 위도, 한 변 크기 도)
+REFERENCE_QUADS = [(126.9, 37.5, 0.1), (124.5, 34.0, 0.05), (131.5, 41.0, 0.02), (129.0, 35.0, 0.5)]
+
+
+def meridian_arc_m(lat1, lat2, steps=200_001):
+    """위도 lat1 → lat2 자오선 호 길이 (수치 적분, 기준값)"""
+    phi = np.linspace(math.radians(lat1), math.radians(lat2), steps)
+    m, _ = _radii(np.degrees(phi))
+    return float(np.sum((m[1:] + m[:-1]) / 2 * np.diff(phi)))
+
+
+def quad_area_m2(lat1, lat2, dlng):
+    """두 위도선과 두 경도선으로 둘러싸인 타원체 사각형의 면적 (닫힌 식, 기준값)"""
+    e = math.sqrt(GRS80_E2)
+
+    def q(lat):
+        s = math.sin(math.radians(lat))
+        return s / (1 - GRS80_E2 * s * s) + math.log((1 + e * s) / (1 - e * s)) / (2 * e)
+    return GRS80_A ** 2 * (1 - GRS80_E2) * math.radians(dlng) / 2 * (q(lat2) - q(lat1))
+
+
+def quad_perimeter_m(lat1, lat2, dlng):
+    _, n1 = _radii(lat1)
+    _, n2 = _radii(lat2)
+    parallels = (n1 * math.cos(math.radians(lat1)) + n2 * math.cos(math.radians(lat2))) * math.radians(dlng)
+    return float(parallels) + 2 * meridian_arc_m(lat1, lat2)
+
+
+def quad_ring(lng0, lat0, size, steps=2000):
+    """경위도 사각형 링 (위도선은 촘촘히 나눠 투영 후에도 곡선을 따르도록)"""
+    t = np.linspace(0, 1, steps, endpoint=False)
+    lng = np.concatenate([lng0 + size * t, np.full(steps, lng0 + size), lng0 + size - size * t, np.full(steps, lng0)])
+    lat = np.concatenate([np.full(steps, lat0), lat0 + size * t, np.full(steps, lat0 + size), lat0 + size - size * t])
+    return lng, lat
+
+
+def equirectangular_area_m2(lng, lat):
+    """기존 방식 (링 평균 위도의 등장방형 근사, 구면 반경) 비교용"""
+    kx = M_PER_DEG * math.cos(math.radians(lat.mean()))
+    x, y = (lng - lng[0]) * kx, (lat - lat[0]) * M_PER_DEG
+    return 0.5 * abs(float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)))
+
+
+def _point_distance_m(points, ring):
+    a, b = ring, np.roll(ring, -1, axis=0)
+    d = b - a
+    t = np.clip(np.sum((points[:, None, :] - a[None]) * d[None], axis=-1) / np.sum(d * d, axis=-1)[None], 0, 1)
+    closest = a[None] + t[..., None] * d[None]
+    return np.hypot(*(points[:, None, :] - closest).transpose(2, 0, 1)).min(axis=1)
+
+
+def validate():
+    """기준값 대비 오차 검증, 모두 통과하면 True"""
+    ok = True
+
+    def check(label, error, tolerance):
+        nonlocal ok
+        passed = error <= tolerance
+        ok = ok and passed
+        print(f"   {'✅' if passed else '❌'} {label}: {error:.3g} (허용 {tolerance:g})")
+
+    print("📐 투영 검증")
+    for crs, projection in PROJECTIONS.items():
+        if hasattr(projection, 'false_easting'):
+            x, y = project(math.degrees(projection.lng0), 38.0, crs)
+            check(f"{crs} 원점 → 가산값", max(abs(float(x) - projection.false_easting),
+                                            abs(float(y) - projection.false_northing)), ARC_TOLERANCE_M)
+            for lat in (33.0, 43.0):
+                _, y = project(math.degrees(projection.lng0), lat, crs)
+                error = abs((float(y) - projection.false_northing) - projection.k0 * meridian_arc_m(38.0, lat))
+                check(f"{crs} 중앙 자오선 호 길이 (위도 {lat:g})", error, ARC_TOLERANCE_M)
+
+        rng = np.random.default_rng(1)
+        lng, lat = rng.uniform(124, 132, 100_000), rng.uniform(33, 43, 100_000)
+        back_lng, back_lat = unproject(*project(lng, lat, crs), crs)
+        check(f"{crs} 왕복 변환 (도)", float(max(np.abs(back_lng - lng).max(), np.abs(back_lat - lat).max())),
+              ROUND_TRIP_TOLERANCE_DEG)
+
+        for lng0, lat0, size in REFERENCE_QUADS:
+            ring_lng, ring_lat = quad_ring(lng0, lat0, size)
+            area, perimeter = ring_area_perimeter(ring_lng, ring_lat, [0], [len(ring_lng)], crs)
+            reference_area = quad_area_m2(lat0, lat0 + size, size)
+            reference_perimeter = quad_perimeter_m(lat0, lat0 + size, size)
+            check(f"{crs} 면적 ({lng0:g}, {lat0:g}, {size:g}°)", abs(area[0] / reference_area - 1), AREA_TOLERANCE)
+            check(f"{crs} 둘레 ({lng0:g}, {lat0:g}, {size:g}°)", abs(perimeter[0] / reference_perimeter - 1),
+                  AREA_TOLERANCE)
+
+    lng0, lat0, size = REFERENCE_QUADS[-1]
+    ring_lng, ring_lat = quad_ring(lng0, lat0, size)
+    old_error = abs(equirectangular_area_m2(ring_lng, ring_lat) / quad_area_m2(lat0, lat0 + size, size) - 1)
+    print(f"   ℹ️  기존 등장방형 근사의 면적 오차 ({size:g}° 사각형): {old_error:.3g}")
+
+    print("🛡️  버퍼 검증 (오목 폴리곤, 100 m)")
+    origin_x, origin_y = project(127.0, 37.5)
+    shape = np.array([[0, 0], [2000, 0], [2000, 500], [500, 500], [500, 2000], [0, 2000]], dtype=np.float64)
+    lng, lat = unproject(origin_x + shape[:, 0], origin_y + shape[:, 1])
+    ring = np.column_stack((lng, lat)).tolist()
+    _, coordinates = buffer_geometry('Polygon', [ring + ring[:1]], 100.0)
+    buffered = np.asarray(coordinates[0][:-1])
+    x, y = project(buffered[:, 0], buffered[:, 1])
+    k = float(scale_factor(lng.mean(), lat.mean()))
+    distance = _point_distance_m(np.column_stack((x - origin_x, y - origin_y)), shape) / k
+    check("버퍼 경계 ~ 원래 폴리곤 거리 (m)", float(np.abs(distance - 100.0).max()), BUFFER_TOLERANCE_M)
+    return ok
+
+
+def run_benchmark(zone_count=200_000, vertices=12, crs='EPSG:5179'):
+    """한 번에 변환하는 벡터 연산과 점마다 변환하는 방식의 처리량 비교"""
+    packed = synthetic_packed(zone_count, vertices)
+    point_count = len(packed['xy'])
+    print(f"📦 합성 구역 {zone_count:,}개 (정점 {point_count:,}개)")
+
+    started = time.perf_counter()
+    project_packed(packed, crs)
+    vectorized = time.perf_counter() - started
+
+    sample = packed['xy'][:min(point_count, 20_000)]
+    started = time.perf_counter()
+    for lng, lat in sample.tolist():
+        project(lng, lat, crs)
+    per_point = (time.perf_counter() - started) / len(sample) * point_count
+
+    started = time.perf_counter()
+    area, _ = zone_area_perimeter(packed, crs)
+    metrics = time.perf_counter() - started
+    print(f"   벡터 변환: {vectorized:.2f}초 ({point_count / vectorized / 1e6:.1f}M 점/초)")
+    print(f"   점별 변환(추정): {per_point:.1f}초 ({per_point / vectorized:.0f}배 느림)")
+    print(f"   구역별 면적/둘레: {metrics:.2f}초, 평균 면적 {area.mean() / 1e6:.2f} km²")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TM/웹 메르카토르 투영 기준값 검증과 처리량 벤치마크')
+    parser.add_argument('--zones', type=int, default=200_000, help='합성 구역 수 (기본: 200000)')
+    parser.add_argument('--vertices', type=int, default=12, help='구역당 정점 수 (기본: 12)')
+    parser.add_argument('--crs', default='EPSG:5179', choices=sorted(PROJECTIONS), help='벤치마크 좌표계')
+    args = parser.parse_args(argv)
+    ok = validate()
+    run_benchmark(args.zones, args.vertices, args.crs)
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
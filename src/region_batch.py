@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def load_regions(path):
+    """지역 목록 파일 로드
+
+    형식: [{"name": "서울특별시", "bbox": [minx, miny, maxx, maxy]},
+           {"name": "구역A", "polygon": [[lng, lat], ...]}, ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        regions = json.load(f)
+    if isinstance(regions, dict):
+        regions = regions.get('regions', [])
+
+    for region in regions:
+        if not region.get('name'):
+            raise ValueError(f"지역 이름이 없습니다: {region}")
+        if not region.get('bbox') and not region.get('polygon'):
+            raise ValueError(f"'{region['name']}' 지역에 bbox 또는 polygon이 필요합니다")
+    return regions
+
+
+def region_geom_filter(region):
+    """지역 정의 → VWorld geomFilter 문자열"""
+    if region.get('bbox'):
+        minx, miny, maxx, maxy = region['bbox']
+        return f"BOX({minx},{miny},{maxx},{maxy})"
+    ring = [list(p) for p in region['polygon']]
+    if ring[0] != ring[-1]:
+        ring.append(ring[0])
+    return "POLYGON((" + ",".join(f"{p[0]} {p[1]}" for p in ring) + "))"
+
+
+def geom_filter_bbox(geom_filter):
+    """VWorld geomFilter(BOX/POLYGON) 문자열 → [minx, miny, maxx, maxy], 해석할 수 없으면 None"""
+    numbers = [float(v) for v in re.findall(r'-?\d+(?:\.\d+)?', geom_filter or '')]
+    if geom_filter and geom_filter.upper().startswith('BOX(') and len(numbers) == 4:
+        return numbers
+    if geom_filter and geom_filter.upper().startswith('POLYGON(') and len(numbers) >= 6 and len(numbers) % 2 == 0:
+        xs, ys = numbers[0::2], numbers[1::2]
+        return [min(xs), min(ys), max(xs), max(ys)]
+    return None
+
+
+def region_slug(name):
+    """지역 이름 → 디렉토리 이름"""
+    slug = re.sub(r'[\\/:*?"<>|\s]+', '_', name).strip('_')
+    return slug or 'region'
+
+
+def zone_fingerprint(zone):
+    """원본 속성과 지오메트리 기준 구역 식별 해시 (지역이 겹쳐 중복 조회된 구역 판별)"""
+    payload = json.dumps({'properties': zone.get('properties'), 'coordinates': zone.get('coordinates')},
+                         sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def merge_region_results(results):
+    """지역별 결과를 합치고 중복 구역 제거 (지역 목록 순서 유지)"""
+    merged = []
+    seen = {}
+    for result in results:
+        for zone in result.get('zones') or []:
+            key = zone_fingerprint(zone)
+            if key in seen:
+                seen[key]['regions'].append(result['name'])
+                continue
+            zone = dict(zone)
+            zone['regions'] = [result['name']]
+            seen[key] = zone
+            merged.append(zone)
+
+    for i, zone in enumerate(merged, 1):
+        zone['index'] = i
+    return merged
+
+
+def run_region_batch(regions, worker, options, max_workers=None, initializer=None):
+    """지역별 작업을 프로세스 풀에서 병렬 실행
+
+    worker(region, options)는 최상위 함수여야 하며(피클 가능),
+    initializer(options)는 작업 프로세스마다 한 번 실행되어 캐시 등을 준비함
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(regions)))
+    results = {}
+    started = time.time()
+
+    print(f"🧵 {len(regions)}개 지역을 {max_workers}개 프로세스로 처리합니다.")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                             initargs=(options,) if initializer else ()) as executor:
+        futures = {executor.submit(worker, region, options): region['name'] for region in regions}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'name': name, 'zones': None, 'error': str(e)}
+            results[name] = result
+            if result.get('zones') is None:
+                print(f"   ❌ {name}: {result.get('error', '데이터 없음')}")
+            else:
+                print(f"   ✅ {name}: {len(result['zones'])}개 구역 ({result.get('elapsed', 0):.1f}초)")
+
+    print(f"⏱️  전체 소요 시간: {time.time() - started:.1f}초")
+    return [results[region['name']] for region in regions]
@@ -0,0 +1,196 @@
+import collections
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+# 이 상태 코드는 서버 측 장애로 보고 실패로 집계 (응답은 그대로 반환)
+FAILURE_STATUS = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """차단기가 열려 있어 요청을 보내지 않고 바로 실패"""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """호출 전체 제한 시간 초과 (헤지 요청 포함)"""
+
+
+class LatencyTracker:
+    """최근 성공 응답 시간의 이동 창 (헤지 기준 분위수 계산용)"""
+
+    def __init__(self, window=200):
+        self._samples = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q):
+        with self._lock:
+            values = sorted(self._samples)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class CircuitBreaker:
+    """최근 호출의 실패율이 임계값을 넘으면 열려서 cooldown 동안 요청을 막는 차단기
+
+    - closed: 정상, 최근 window개 결과로 실패율 계산
+    - open: 즉시 실패 (CircuitOpenError), cooldown이 지나면 half_open
+    - half_open: 탐색 요청 하나만 통과, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, failure_rate=0.5, window=20, min_calls=5, cooldown=30.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self._results = collections.deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            if self.state == 'half_open':
+                self._probing = False
+                if success:
+                    self.state = 'closed'
+                    self._results.clear()
+                else:
+                    self._trip()
+                return
+            self._results.append(success)
+            failures = self._results.count(False)
+            if (self.state == 'closed' and len(self._results) >= self.min_calls
+                    and failures / len(self._results) >= self.failure_rate):
+                self._trip()
+
+    def _trip(self):
+        self.state = 'open'
+        self._opened_at = time.monotonic()
+
+
+class HedgedClient:
+    """지연 꼬리를 줄이는 GET 클라이언트 (엔드포인트별 지연 분포/차단기 유지)
+
+    - 요청이 최근 p95 응답 시간을 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+    - 호출 하나의 전체 제한 시간(deadline)을 넘으면 DeadlineExceeded
+    - 실패율이 높아지면 차단기가 열려 CircuitOpenError로 즉시 실패
+      (호출하는 쪽의 기존 예외 처리가 대체 주소나 만료된 캐시로 넘어감)
+    GET 요청만 다루므로 중복 전송해도 안전
+    """
+
+    def __init__(self, fetch=None, deadline=20.0, hedge_quantile=0.95, min_samples=10,
+                 initial_hedge_delay=2.0, min_hedge_delay=0.05, max_workers=8, breaker_options=None):
+        self.fetch = fetch
+        self.deadline = deadline
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.breaker_options = breaker_options or {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedged-http')
+        self._trackers = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'hedged': 0, 'hedge_wins': 0, 'deadline': 0, 'short_circuited': 0}
+
+    def _endpoint(self, url):
+        with self._lock:
+            if url not in self._trackers:
+                self._trackers[url] = LatencyTracker()
+                self._breakers[url] = CircuitBreaker(**self.breaker_options)
+            return self._trackers[url], self._breakers[url]
+
+    def breaker_state(self, url):
+        return self._endpoint(url)[1].state
+
+    def hedge_delay(self, url):
+        """중복 요청을 보내기까지 기다릴 시간 (표본이 적으면 초기값)"""
+        tracker = self._endpoint(url)[0]
+        if len(tracker) < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, tracker.quantile(self.hedge_quantile))
+
+    def _attempt(self, url, params, headers, timeout):
+        started = time.perf_counter()
+        response = (self.fetch or requests.get)(url, params=params, headers=headers, timeout=timeout)
+        return response, time.perf_counter() - started
+
+    def get(self, url, params=None, headers=None, timeout=15):
+        """requests.get 대체 (timeout은 시도 하나의 제한, 전체는 deadline으로 제한)"""
+        tracker, breaker = self._endpoint(url)
+        self.stats['calls'] += 1
+        if not breaker.allow():
+            self.stats['short_circuited'] += 1
+            raise CircuitOpenError(f"차단기 열림: {url}")
+
+        deadline_at = time.perf_counter() + self.deadline
+        attempt_timeout = min(timeout, self.deadline) if timeout else self.deadline
+        primary = self._executor.submit(self._attempt, url, params, headers, attempt_timeout)
+        pending = {primary}
+        hedge = None
+        last_error = None
+        failed_response = None
+
+        done, _ = wait(pending, timeout=min(self.hedge_delay(url), self.deadline))
+        if not done:
+            remaining = deadline_at - time.perf_counter()
+            if remaining > 0:
+                hedge = self._executor.submit(self._attempt, url, params, headers, min(attempt_timeout, remaining))
+                pending.add(hedge)
+                self.stats['hedged'] += 1
+
+        while pending:
+            remaining = deadline_at - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response, elapsed = future.result()
+                except requests.RequestException as e:
+                    last_error = e
+                    continue
+                failed = response.status_code in FAILURE_STATUS
+                if failed and pending:
+                    # 다른 시도가 아직 진행 중이면 그 결과를 기다림
+                    failed_response = response
+                    continue
+                breaker.record(not failed)
+                if not failed:
+                    tracker.add(elapsed)
+                if future is hedge:
+                    self.stats['hedge_wins'] += 1
+                return response
+
+        breaker.record(False)
+        if failed_response is not None:
+            return failed_response
+        if pending or last_error is None:
+            self.stats['deadline'] += 1
+            raise DeadlineExceeded(f"제한 시간 {self.deadline:g}초 초과: {url}")
+        raise last_error
+
+    def close(self):
+        self._executor.shutdown(wait=False)
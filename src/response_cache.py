@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+import requests
+
+from atomic_file import atomic_write
+
+# 캐시 키 계산에서 제외할 인증 관련 파라미터
+EXCLUDED_PARAMS = ('key', 'domain')
+
+
+class OfflineCacheMiss(Exception):
+    """오프라인 재생 모드에서 캐시에 없는 요청"""
+
+
+class CachedResponse:
+    """requests.Response와 호환되는 캐시 응답"""
+
+    def __init__(self, status_code, content, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def is_valid_api_response(response):
+    """VWorld 응답 본문이 정상 결과인지 (HTTP 200이어도 인증키 오류/호출 한도 초과 등은 response.status가 ERROR)
+
+    JSON이 아닌 본문도 오류 페이지로 보고 캐시하지 않음
+    """
+    try:
+        payload = json.loads(response.content)
+    except (ValueError, TypeError):
+        return False
+    status = (payload.get('response') or {}).get('status') if isinstance(payload, dict) else None
+    return status != 'ERROR'
+
+
+def make_cache_key(url, params):
+    """인증 파라미터를 제외한 요청 파라미터의 정규화 해시"""
+    canonical = {
+        k: str(v) for k, v in (params or {}).items()
+        if k not in EXCLUDED_PARAMS and v is not None
+    }
+    payload = json.dumps({'url': url, 'params': canonical},
+                         sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """요청 해시 → 응답 본문(gzip, 콘텐츠 해시로 저장) 로컬 캐시
+
+    - max_age 초 이내의 응답은 네트워크 없이 디스크에서 바로 반환
+    - 만료된 응답은 서버가 ETag/Last-Modified를 준 경우 조건부 요청으로 재검증
+    - offline=True이면 네트워크를 전혀 사용하지 않고 캐시만 재생
+    - HTTP 200이라도 is_valid(응답)가 False인 오류 응답은 저장하지 않음 (오류가 만료 때까지 재생되지 않도록)
+    """
+
+    def __init__(self, cache_dir='cache/responses', max_age=3600, offline=False, is_valid=is_valid_api_response):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.offline = offline
+        self.is_valid = is_valid
+        self.stats = {'hit': 0, 'revalidated': 0, 'miss': 0, 'stale': 0, 'stale_peek': 0, 'rejected': 0}
+        self.last_from_cache = False
+
+    def _index_path(self, key):
+        return os.path.join(self.cache_dir, 'index', key[:2], f"{key}.json")
+
+    def _object_path(self, body_hash):
+        return os.path.join(self.cache_dir, 'objects', body_hash[:2], f"{body_hash}.gz")
+
+    def load(self, key):
+        """캐시 항목 (메타데이터, 본문) 조회, 없으면 None"""
+        try:
+            with open(self._index_path(key), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(self._object_path(meta['body_sha256']), 'rb') as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, key, url, params, response):
+        """응답 본문을 콘텐츠 해시로 압축 저장하고 요청 인덱스를 갱신"""
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(body_hash)
+        if not os.path.exists(object_path):
+            atomic_write(object_path, gzip.compress(body))
+
+        meta = {
+            'url': url,
+            'params': {k: v for k, v in params.items() if k not in EXCLUDED_PARAMS},
+            'status_code': response.status_code,
+            'body_sha256': body_hash,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'stored_at': time.time()
+        }
+        self._write_meta(key, meta)
+        return meta
+
+    def _write_meta(self, key, meta):
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        atomic_write(self._index_path(key), data)
+
+    def _is_fresh(self, meta):
+        if self.max_age is None:
+            return True
+        return time.time() - meta.get('stored_at', 0) < self.max_age
+
+    def _from_entry(self, meta, body):
+        self.last_from_cache = True
+        headers = {'Content-Type': meta.get('content_type') or 'application/json'}
+        return CachedResponse(meta.get('status_code', 200), body, headers, from_cache=True)
+
+    def peek(self, url, params=None, allow_stale=False):
+        """네트워크 없이 캐시된 응답만 반환, 없으면 None
+
+        allow_stale이 아니면 max_age 이내의 응답만 반환 (만료된 응답은 get()에서 재검증하도록 None)
+        """
+        entry = self.load(make_cache_key(url, params or {}))
+        if entry is None:
+            return None
+        if self.offline or self._is_fresh(entry[0]):
+            self.stats['hit'] += 1
+        elif allow_stale:
+            self.stats['stale_peek'] += 1
+        else:
+            return None
+        return self._from_entry(*entry)
+
+    def get(self, url, params=None, headers=None, timeout=15, fetch=None):
+        """requests.get 대체: 캐시 우선 조회 후 필요할 때만 네트워크 요청 (fetch로 실제 요청 함수 지정)"""
+        params = params or {}
+        key = make_cache_key(url, params)
+        self.last_from_cache = False
+        entry = self.load(key)
+
+        if entry and (self.offline or self._is_fresh(entry[0])):
+            self.stats['hit'] += 1
+            return self._from_entry(*entry)
+
+        if self.offline:
+            raise OfflineCacheMiss(f"캐시에 없는 요청입니다 (key={key[:12]})")
+
+        request_headers = dict(headers or {})
+        if entry:
+            meta = entry[0]
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            response = (fetch or requests.get)(url, params=params, headers=request_headers, timeout=timeout)
+        except requests.RequestException:
+            if entry:
+                # 네트워크 장애 시 만료된 캐시라도 반환
+                self.stats['stale'] += 1
+                return self._from_entry(*entry)
+            raise
+
+        if response.status_code == 304 and entry:
+            meta, body = entry
+            meta['stored_at'] = time.time()
+            self._write_meta(key, meta)
+            self.stats['revalidated'] += 1
+            return self._from_entry(meta, body)
+
+        if response.status_code == 200:
+            if self.is_valid is None or self.is_valid(response):
+                self.store(key, url, params, response)
+            else:
+                self.stats['rejected'] += 1
+        self.stats['miss'] += 1
+        return response
@@ -0,0 +1,452 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from severity_raster import SEVERITY_LEVELS, SeverityRaster
+from zone_index import EARTH_RADIUS_M, ZoneIndex
+
+M_PER_DEG = math.radians(1) * EARTH_RADIUS_M
+SQRT2 = math.sqrt(2.0)
+
+# 위험도별 셀 통과 비용 배수 (None = 통과 불가)
+DEFAULT_SEVERITY_COSTS = {0: 1.0, SEVERITY_LEVELS['low']: 1.0, SEVERITY_LEVELS['medium']: 5.0,
+                          SEVERITY_LEVELS['high']: None}
+
+# 비용 격자 최대 셀 수 (출발/도착점으로 범위를 넓힐 때 메모리 제한)
+MAX_GRID_CELLS = 25_000_000
+
+# 8방향 이웃 (열 변화, 행 변화, 이동 거리 배수)
+_MOVES = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+          (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+
+def grid_bbox(zone_index, margin_m=2000.0):
+    """구역 전체 범위에 margin_m 여유를 둔 격자 범위 (구역 밖 출발/도착점도 격자 안에 들도록)"""
+    boxes = zone_index.bboxes[np.isfinite(zone_index.bboxes).all(axis=1)]
+    if len(boxes) == 0:
+        raise ValueError("경로 격자를 만들 구역이 없습니다")
+    minx, miny = boxes[:, 0].min(), boxes[:, 1].min()
+    maxx, maxy = boxes[:, 2].max(), boxes[:, 3].max()
+    pad = margin_m / M_PER_DEG
+    pad_lng = pad / max(math.cos(math.radians((miny + maxy) / 2)), 1e-6)
+    return [float(minx - pad_lng), float(miny - pad), float(maxx + pad_lng), float(maxy + pad)]
+
+
+def covering_bbox(bbox, points, margin_m=2000.0):
+    """bbox와 점들(주변 margin_m 여유 포함)을 모두 덮는 범위 (요청 지역 밖 출발/도착점도 격자 안에 들도록)"""
+    minx, miny, maxx, maxy = (float(v) for v in bbox)
+    for lng, lat in points:
+        pad = margin_m / M_PER_DEG
+        pad_lng = pad / max(math.cos(math.radians(lat)), 1e-6)
+        minx, miny = min(minx, lng - pad_lng), min(miny, lat - pad)
+        maxx, maxy = max(maxx, lng + pad_lng), max(maxy, lat + pad)
+    return [minx, miny, maxx, maxy]
+
+
+def check_grid_size(bbox, resolution_m):
+    """격자 셀 수가 MAX_GRID_CELLS를 넘으면 ValueError"""
+    minx, miny, maxx, maxy = bbox
+    width_m = (maxx - minx) * M_PER_DEG * math.cos(math.radians((miny + maxy) / 2))
+    height_m = (maxy - miny) * M_PER_DEG
+    cells = math.ceil(width_m / resolution_m) * math.ceil(height_m / resolution_m)
+    if cells > MAX_GRID_CELLS:
+        raise ValueError(f"경로 격자가 너무 큽니다 ({cells:,}셀, 최대 {MAX_GRID_CELLS:,}셀): "
+                         f"출발/도착점 사이 거리를 줄이거나 해상도를 낮추세요")
+
+
+def zones_fingerprint(zones, resolution_m, bbox):
+    """래스터 캐시 키 (구역 지오메트리/위험도와 격자 설정이 같으면 같은 값)"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([resolution_m, bbox]).encode('utf-8'))
+    for zone in zones:
+        info = zone.get('restriction_info') or {}
+        digest.update(json.dumps([info.get('severity'), info.get('type'), zone.get('geometry_type'),
+                                  zone.get('coordinates')], separators=(',', ':')).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class RoutePlanner:
+    """위험도 래스터 위의 비행 경로 계획기 (A* + 가시선 경로 단순화)
+
+    - high 위험도 셀은 통과 불가, medium은 통과 비용을 높이고, low/제한 없음은 기본 비용
+    - 비용 격자는 만들 때 한 번 계산해 질의마다 재사용 (테두리에 통과 불가 셀을 둘러 경계 검사 생략)
+    - zone_index가 있으면 경로가 스치는(skirt_m 이내) 구역 목록을 함께 반환
+    """
+
+    def __init__(self, raster, zone_index=None, severity_costs=None):
+        self.raster = raster
+        self.zone_index = zone_index
+        self.severity_costs = dict(DEFAULT_SEVERITY_COSTS, **(severity_costs or {}))
+        m = raster.meta
+        self.nx, self.ny = m['nx'], m['ny']
+        self.resolution_m = m['resolution_m']
+        self.width = self.nx + 2
+
+        lut = np.array([math.inf if self.severity_costs.get(level) is None else self.severity_costs[level]
+                        for level in range(4)], dtype=np.float64)
+        padded = np.full((self.ny + 2, self.width), math.inf)
+        padded[1:-1, 1:-1] = lut[np.asarray(raster.severity)]
+        self.cost = padded
+        self._cost_list = padded.ravel().tolist()
+        self._blocked = bytes(np.isinf(padded).ravel())
+        self._offsets = [(dc + dr * self.width, step) for dc, dr, step in _MOVES]
+        self._diagonal_sides = {dc + dr * self.width: (dc, dr * self.width) for dc, dr, step in _MOVES
+                                if dc and dr}
+
+    # ------------------------------------------------------------------
+    # 생성 / 캐시
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, zones, resolution_m=100.0, bbox=None, cache_dir=None, zone_index=None, severity_costs=None,
+              include_points=None):
+        """분류된 구역으로 계획기 생성
+
+        bbox(요청 지역 범위 등)가 없으면 구역 전체 범위 + 2 km, include_points(출발/도착점)가 있으면 범위를 넓혀 포함
+        cache_dir가 있으면 같은 구역/격자 설정의 래스터를 '<cache_dir>/<지문>/'에서 메모리 맵으로 재사용
+        """
+        zone_index = zone_index or ZoneIndex.from_zones(zones)
+        bbox = list(bbox) if bbox else grid_bbox(zone_index)
+        if include_points:
+            bbox = covering_bbox(bbox, include_points)
+        check_grid_size(bbox, resolution_m)
+        if cache_dir:
+            path = os.path.join(cache_dir, zones_fingerprint(zones, resolution_m, bbox))
+            if os.path.exists(os.path.join(path, 'meta.json')):
+                raster = SeverityRaster.open(path)
+                print(f"♻️  경로 격자 캐시 사용: {path}")
+            else:
+                raster = SeverityRaster.build(zones, resolution_m=resolution_m, bbox=bbox, path=path,
+                                              zone_index=zone_index)
+        else:
+            raster = SeverityRaster.build(zones, resolution_m=resolution_m, bbox=bbox, zone_index=zone_index)
+        return cls(raster, zone_index=zone_index, severity_costs=severity_costs)
+
+    @classmethod
+    def from_index(cls, zone_index, resolution_m=100.0, bbox=None, severity_costs=None, include_points=None):
+        """구역 인덱스(서비스 스냅샷 등)만으로 계획기 생성 (위험도/유형은 인덱스 레코드 사용)"""
+        zones = [{'restriction_info': {'type': record.get('type'), 'severity': record.get('severity')}}
+                 for record in zone_index.records]
+        bbox = list(bbox) if bbox else grid_bbox(zone_index)
+        if include_points:
+            bbox = covering_bbox(bbox, include_points)
+        check_grid_size(bbox, resolution_m)
+        raster = SeverityRaster.build(zones, resolution_m=resolution_m, bbox=bbox, zone_index=zone_index)
+        return cls(raster, zone_index=zone_index, severity_costs=severity_costs)
+
+    # ------------------------------------------------------------------
+    # 좌표 변환
+    # ------------------------------------------------------------------
+    @property
+    def bbox(self):
+        m = self.raster.meta
+        return [m['minx'], m['miny'], m['minx'] + self.nx * m['dlng'], m['miny'] + self.ny * m['dlat']]
+
+    def covers(self, points):
+        """점들이 모두 격자 범위 안이면 True"""
+        minx, miny, maxx, maxy = self.bbox
+        return all(minx <= lng < maxx and miny <= lat < maxy for lng, lat in points)
+
+    def _cell(self, lng, lat):
+        m = self.raster.meta
+        col = int(math.floor((lng - m['minx']) / m['dlng']))
+        row = int(math.floor((lat - m['miny']) / m['dlat']))
+        if not (0 <= col < self.nx and 0 <= row < self.ny):
+            raise ValueError(f"좌표 ({lng:.6f}, {lat:.6f})가 경로 격자 범위 밖입니다")
+        return (row + 1) * self.width + col + 1
+
+    def _center(self, idx):
+        m = self.raster.meta
+        row, col = divmod(idx, self.width)
+        return m['minx'] + (col - 0.5) * m['dlng'], m['miny'] + (row - 0.5) * m['dlat']
+
+    # ------------------------------------------------------------------
+    # 탐색
+    # ------------------------------------------------------------------
+    def _astar(self, start, goal):
+        """격자 A* (8방향, 통과 불가 셀 모서리 가로지르기 금지), 반환: (셀 경로, 확장 셀 수)"""
+        width = self.width
+        cost = self._cost_list
+        blocked = self._blocked
+        offsets = self._offsets
+        sides = self._diagonal_sides
+        goal_row, goal_col = divmod(goal, width)
+
+        def heuristic(idx):
+            row, col = divmod(idx, width)
+            dr, dc = abs(row - goal_row), abs(col - goal_col)
+            return (SQRT2 - 1) * min(dr, dc) + max(dr, dc)
+
+        g = {start: 0.0}
+        parent = {start: -1}
+        closed = set()
+        heap = [(heuristic(start), 0.0, start)]
+        expanded = 0
+        while heap:
+            _, g_here, idx = heapq.heappop(heap)
+            if idx in closed:
+                continue
+            if idx == goal:
+                path = []
+                while idx != -1:
+                    path.append(idx)
+                    idx = parent[idx]
+                return path[::-1], expanded
+            closed.add(idx)
+            expanded += 1
+            for offset, step in offsets:
+                nxt = idx + offset
+                if blocked[nxt] or nxt in closed:
+                    continue
+                side = sides.get(offset)
+                if side and (blocked[idx + side[0]] or blocked[idx + side[1]]):
+                    continue
+                g_next = g_here + step * cost[nxt]
+                if g_next < g.get(nxt, math.inf):
+                    g[nxt] = g_next
+                    parent[nxt] = idx
+                    h = heuristic(nxt)
+                    heapq.heappush(heap, (g_next + h, h, nxt))
+        return None, expanded
+
+    def _line_cells(self, a, b):
+        """두 셀 중심을 잇는 선분이 지나는 셀 (반 셀 간격 샘플 + 대각으로 넘어갈 때 양옆 셀)"""
+        width = self.width
+        ar, ac = divmod(a, width)
+        br, bc = divmod(b, width)
+        steps = max(abs(br - ar), abs(bc - ac)) * 2 + 1
+        t = np.linspace(0.0, 1.0, steps)
+        rows = np.floor(ar + 0.5 + (br - ar) * t).astype(np.int64)
+        cols = np.floor(ac + 0.5 + (bc - ac) * t).astype(np.int64)
+        corner = (rows[1:] != rows[:-1]) & (cols[1:] != cols[:-1])
+        return np.concatenate((rows * width + cols,
+                               rows[:-1][corner] * width + cols[1:][corner],
+                               rows[1:][corner] * width + cols[:-1][corner]))
+
+    def _visible(self, path_costs, path, i, j):
+        """path[i] → path[j] 직선이 막히지 않고 원래 구간의 가장 비싼 셀보다 비싼 셀을 지나지 않는지"""
+        limit = path_costs[i:j + 1].max()
+        return bool((self.cost.ravel()[self._line_cells(path[i], path[j])] <= limit).all())
+
+    def _smooth(self, path):
+        """가시선 단순화: 각 웨이포인트에서 바로 보이는 가장 먼 경로 셀로 연결 (지수 + 이분 탐색)"""
+        if len(path) <= 2:
+            return path
+        path_costs = self.cost.ravel()[np.array(path)]
+        last = len(path) - 1
+        result = [path[0]]
+        i = 0
+        while i < last:
+            # 보이는 구간을 두 배씩 늘려 보이지 않는 지점을 찾은 뒤 그 사이를 이분 탐색
+            good, step = i + 1, 1
+            while good < last:
+                probe = min(i + step * 2, last)
+                if not self._visible(path_costs, path, i, probe):
+                    bad = probe
+                    break
+                good, step = probe, step * 2
+            else:
+                bad = None
+            if bad is not None:
+                while bad - good > 1:
+                    mid = (good + bad) // 2
+                    if self._visible(path_costs, path, i, mid):
+                        good = mid
+                    else:
+                        bad = mid
+            result.append(path[good])
+            i = good
+        return result
+
+    def plan(self, start, goal, skirt_m=None, smooth=True):
+        """(경도, 위도) 출발점 → 도착점 경로
+
+        반환: {'waypoints': [[경도, 위도], ...], 'distance_m', 'cost', 'cells_expanded', 'elapsed_ms',
+               'skirted_zones': [...]}
+        출발/도착점이 격자 밖이거나 통과 불가 구역 안이면 ValueError, 경로가 없으면 waypoints가 []
+        """
+        started = time.perf_counter()
+        start_idx = self._cell(*start)
+        goal_idx = self._cell(*goal)
+        for name, idx in (('출발점', start_idx), ('도착점', goal_idx)):
+            if self._blocked[idx]:
+                raise ValueError(f"{name}이 비행 금지(통과 불가) 구역 안에 있습니다")
+
+        cells, expanded = self._astar(start_idx, goal_idx)
+        if cells is None:
+            return {'waypoints': [], 'distance_m': None, 'cost': None, 'cells_expanded': expanded,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 2), 'skirted_zones': []}
+
+        path_cost = sum(self._cost_list[c] * step for c, step in zip(cells[1:], self._steps(cells)))
+        if smooth:
+            cells = self._smooth(cells)
+        waypoints = [list(start)] + [list(self._center(c)) for c in cells[1:-1]] + [list(goal)]
+        result = {
+            'waypoints': [[round(lng, 7), round(lat, 7)] for lng, lat in waypoints],
+            'distance_m': round(polyline_length_m(waypoints), 1),
+            'cost': round(path_cost * self.resolution_m, 1),
+            'cells_expanded': expanded,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+        result['skirted_zones'] = self.skirted_zones(waypoints, skirt_m) if self.zone_index is not None else []
+        return result
+
+    def _steps(self, cells):
+        width = self.width
+        return [SQRT2 if abs(b - a) not in (1, width) else 1.0 for a, b in zip(cells, cells[1:])]
+
+    # ------------------------------------------------------------------
+    # 경로 주변 구역
+    # ------------------------------------------------------------------
+    def skirted_zones(self, waypoints, skirt_m=None):
+        """경로가 지나거나 skirt_m(기본: 격자 두 칸) 이내로 스치는 구역, 가까운 순
+
+        경로를 반 셀 간격으로 나눈 점과 후보 구역 경계 사이 거리 (경로 중심 기준 등장방형 근사)
+        """
+        skirt_m = self.resolution_m * 2 if skirt_m is None else skirt_m
+        samples = densify(waypoints, self.resolution_m / 2)
+        lngs, lats = samples[:, 0], samples[:, 1]
+        pad = skirt_m / M_PER_DEG
+        pad_lng = pad / max(math.cos(math.radians(float(lats.mean()))), 1e-6)
+        ids = self.zone_index.candidates_bbox(lngs.min() - pad_lng, lats.min() - pad,
+                                              lngs.max() + pad_lng, lats.max() + pad)
+        if len(ids) == 0:
+            return []
+
+        kx = M_PER_DEG * math.cos(math.radians(float(lats.mean())))
+        px, py = lngs * kx, lats * M_PER_DEG
+        pair_point, pair_zone = self.zone_index.query_points(lngs, lats)
+        inside = set(pair_zone.tolist())
+        found = []
+        for z in ids.tolist():
+            a, b, _ = self.zone_index._zone_edges(np.array([z]))
+            if len(a) == 0:
+                continue
+            if z in inside:
+                found.append((0.0, z, True))
+                continue
+            box = self.zone_index.bboxes[z]
+            near = ((lngs >= box[0] - pad_lng) & (lngs <= box[2] + pad_lng)
+                    & (lats >= box[1] - pad) & (lats <= box[3] + pad))
+            if not near.any():
+                continue
+            distance = _points_to_edges_m(px[near], py[near], a[:, 0] * kx, a[:, 1] * M_PER_DEG,
+                                          b[:, 0] * kx, b[:, 1] * M_PER_DEG)
+            if distance <= skirt_m:
+                found.append((distance, z, False))
+
+        found.sort()
+        records = self.zone_index.records
+        return [{
+            'id': z,
+            'zone_index': records[z].get('index'),
+            'name': records[z].get('name'),
+            'type': records[z].get('type'),
+            'severity': records[z].get('severity'),
+            'distance_m': round(distance, 1),
+            'crossed': crossed
+        } for distance, z, crossed in found]
+
+
+def _points_to_edges_m(px, py, ax, ay, bx, by):
+    """점 목록과 변 목록 사이 최단 거리 (평면 좌표 m)"""
+    best = math.inf
+    chunk = max(1, 2_000_000 // max(len(ax), 1))
+    dx, dy = bx - ax, by - ay
+    seg_len2 = dx * dx + dy * dy
+    for s in range(0, len(px), chunk):
+        qx, qy = px[s:s + chunk, None], py[s:s + chunk, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(seg_len2 > 0, ((qx - ax) * dx + (qy - ay) * dy) / seg_len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        best = min(best, float(np.hypot(ax + t * dx - qx, ay + t * dy - qy).min()))
+    return best
+
+
+def densify(waypoints, spacing_m):
+    """웨이포인트 목록을 spacing_m 이하 간격의 점 배열로"""
+    points = [waypoints[0]]
+    for (x0, y0), (x1, y1) in zip(waypoints, waypoints[1:]):
+        n = max(1, int(math.ceil(segment_length_m(x0, y0, x1, y1) / spacing_m)))
+        points.extend([x0 + (x1 - x0) * k / n, y0 + (y1 - y0) * k / n] for k in range(1, n + 1))
+    return np.array(points, dtype=np.float64)
+
+
+def segment_length_m(lng0, lat0, lng1, lat1):
+    kx = M_PER_DEG * math.cos(math.radians((lat0 + lat1) / 2))
+    return math.hypot((lng1 - lng0) * kx, (lat1 - lat0) * M_PER_DEG)
+
+
+def polyline_length_m(waypoints):
+    return sum(segment_length_m(*a, *b) for a, b in zip(waypoints, waypoints[1:]))
+
+
+def print_route(route):
+    """경로 요약 출력"""
+    if not route['waypoints']:
+        print(f"❌ 통과 가능한 경로가 없습니다 (확장 셀 {route['cells_expanded']:,}개)")
+        return
+    print(f"🧭 경로: 웨이포인트 {len(route['waypoints'])}개, {route['distance_m'] / 1000:.2f} km, "
+          f"확장 셀 {route['cells_expanded']:,}개, {route['elapsed_ms']:.1f} ms")
+    for zone in route['skirted_zones']:
+        state = '통과' if zone['crossed'] else f"{zone['distance_m']:.0f} m"
+        print(f"   {zone['name']} ({zone['type']}, {zone['severity']}): {state}")
+
+
+def save_route_geojson(route, path):
+    """경로를 LineString FeatureCollection으로 저장 (속성: 거리, 비용, 스치는 구역 등)"""
+    feature = {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': route['waypoints']},
+               'properties': {key: value for key, value in route.items() if key != 'waypoints'}}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': [feature]}, f, ensure_ascii=False, indent=2)
+    print(f"✅ 경로 저장: {path}")
+
+
+def parse_lng_lat(text):
+    """'경도,위도' 문자열 → (경도, 위도)"""
+    lng, lat = (float(v) for v in text.split(','))
+    return lng, lat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='제한 구역 회피 경로 계획 (위험도 격자 A*)')
+    parser.add_argument('start', help='출발점 "경도,위도"')
+    parser.add_argument('goal', help='도착점 "경도,위도"')
+    parser.add_argument('--zones', default='result_data/classified_flight_restriction_zones.json',
+                        help='분류 결과 JSON (기본: result_data/classified_flight_restriction_zones.json)')
+    parser.add_argument('--resolution', type=float, default=100.0, help='격자 해상도 m (기본: 100)')
+    parser.add_argument('--bbox', help='격자 범위 "minx,miny,maxx,maxy" (기본: 구역 전체 범위 + 2 km, 출발/도착점이 밖이면 넓힘)')
+    parser.add_argument('--medium-cost', type=float, default=DEFAULT_SEVERITY_COSTS[SEVERITY_LEVELS['medium']],
+                        help='medium 위험도 셀 통과 비용 배수 (기본: 5)')
+    parser.add_argument('--cache-dir', default='cache/route_grid', help='격자 캐시 디렉토리 (빈 값이면 캐시 안 함)')
+    parser.add_argument('--output', help='경로 GeoJSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    with open(args.zones, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    zones = data.get('detailed_zones', []) if isinstance(data, dict) else data
+    bbox = [float(v) for v in args.bbox.split(',')] if args.bbox else None
+    try:
+        start, goal = parse_lng_lat(args.start), parse_lng_lat(args.goal)
+        planner = RoutePlanner.build(zones, resolution_m=args.resolution, bbox=bbox, cache_dir=args.cache_dir or None,
+                                     severity_costs={SEVERITY_LEVELS['medium']: args.medium_cost},
+                                     include_points=[start, goal])
+        route = planner.plan(start, goal)
+    except ValueError as e:
+        print(f"❌ 경로 계획 실패: {e}")
+        return None
+
+    print_route(route)
+    if args.output and route['waypoints']:
+        save_route_geojson(route, args.output)
+    return route
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from zone_index import EARTH_RADIUS_M, ZoneIndex
+
+M_PER_DEG = math.radians(1) * EARTH_RADIUS_M
+
+# 셀 값: 0 = 제한 없음, 1~3 = classify_restriction_type의 위험도
+SEVERITY_LEVELS = {'low': 1, 'medium': 2, 'high': 3}
+SEVERITY_NAMES = {value: name for name, value in SEVERITY_LEVELS.items()}
+
+# 히트맵 색상 (RGBA)
+SEVERITY_COLORS = {
+    1: (251, 192, 45, 150),
+    2: (245, 124, 0, 170),
+    3: (211, 47, 47, 190)
+}
+
+# 히트맵 이미지 최대 한 변 크기 (지도 HTML 크기 제한)
+MAX_HEATMAP_PIXELS = 2048
+
+
+def _fill_scanlines(mask, gx0, gy0, gx1, gy1):
+    """격자 좌표의 변 목록으로 셀 중심이 폴리곤 내부(even-odd)인 셀을 채움
+
+    mask 창의 (0, 0)이 격자 좌표 (0, 0)이 되도록 변 좌표가 옮겨져 있어야 함
+    """
+    rows, cols = mask.shape
+    for r in range(rows):
+        y = r + 0.5
+        straddle = (gy0 > y) != (gy1 > y)
+        if not straddle.any():
+            continue
+        x0, y0, x1, y1 = gx0[straddle], gy0[straddle], gx1[straddle], gy1[straddle]
+        xs = np.sort(x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+        starts = np.clip(np.ceil(xs[0::2] - 0.5), 0, cols).astype(np.int64)
+        ends = np.clip(np.ceil(xs[1::2] - 0.5), 0, cols).astype(np.int64)
+        for c0, c1 in zip(starts, ends):
+            if c1 > c0:
+                mask[r, c0:c1] = True
+
+
+def _mark_boundary(mask, gx0, gy0, gx1, gy1):
+    """경계가 지나는 셀 + 이웃 셀 표시 (보수적 처리)
+
+    변을 반 셀 간격으로 샘플링하면 변이 스치는 셀은 샘플이 든 셀이나 그 이웃이므로
+    샘플 셀을 한 칸 팽창시키면 경계 셀을 빠뜨리지 않음
+    """
+    rows, cols = mask.shape
+    steps = np.ceil(np.maximum(np.abs(gx1 - gx0), np.abs(gy1 - gy0)) / 0.5).astype(np.int64) + 1
+    edge = np.repeat(np.arange(len(gx0)), steps)
+    t = (np.arange(int(steps.sum())) - np.repeat(np.cumsum(steps) - steps, steps)) / np.repeat(
+        np.maximum(steps - 1, 1), steps)
+    cx = np.floor(gx0[edge] + t * (gx1[edge] - gx0[edge])).astype(np.int64)
+    cy = np.floor(gy0[edge] + t * (gy1[edge] - gy0[edge])).astype(np.int64)
+    keep = (cx >= 0) & (cx < cols) & (cy >= 0) & (cy < rows)
+    touched = np.zeros_like(mask)
+    touched[cy[keep], cx[keep]] = True
+
+    dilated = touched.copy()
+    dilated[1:, :] |= touched[:-1, :]
+    dilated[:-1, :] |= touched[1:, :]
+    grown = dilated.copy()
+    grown[:, 1:] |= dilated[:, :-1]
+    grown[:, :-1] |= dilated[:, 1:]
+    mask |= grown
+
+
+class SeverityRaster:
+    """구역을 격자로 구워 둔 위험도/유형 래스터 (조회는 인덱스 계산만)
+
+    - severity: 셀별 최대 위험도 (uint8, 0~3)
+    - types: 셀에 걸친 구역 유형 비트마스크 (비트 순서는 meta['types'])
+    - 행 0이 남쪽(miny), 열 0이 서쪽(minx)
+    파일로 저장하면 .npy 메모리 맵으로 열어 전체를 메모리에 올리지 않고 조회
+    """
+
+    def __init__(self, severity, types, meta):
+        self.severity = severity
+        self.types = types
+        self.meta = meta
+
+    @property
+    def shape(self):
+        return self.severity.shape
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, zones, resolution_m=50.0, bbox=None, path=None, zone_index=None):
+        """분류된 구역 목록을 resolution_m 격자로 래스터화 (path가 있으면 메모리 맵 파일로 생성)"""
+        started = time.time()
+        zone_index = zone_index or ZoneIndex.from_zones(zones)
+        valid = np.isfinite(zone_index.bboxes).all(axis=1)
+        if bbox is None:
+            if not valid.any():
+                raise ValueError("래스터화할 구역이 없습니다")
+            boxes = zone_index.bboxes[valid]
+            bbox = (boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max())
+        minx, miny, maxx, maxy = (float(v) for v in bbox)
+
+        dlat = resolution_m / M_PER_DEG
+        dlng = resolution_m / (M_PER_DEG * math.cos(math.radians((miny + maxy) / 2)))
+        nx = max(1, int(math.ceil((maxx - minx) / dlng)))
+        ny = max(1, int(math.ceil((maxy - miny) / dlat)))
+
+        zone_types = sorted({(zone.get('restriction_info') or {}).get('type') or '미분류' for zone in zones})
+        type_dtype = np.uint32 if len(zone_types) <= 32 else np.uint64
+        bit_count = np.dtype(type_dtype).itemsize * 8
+        type_bits = {t: type_dtype(1) << type_dtype(min(i, bit_count - 1)) for i, t in enumerate(zone_types)}
+
+        meta = {
+            'minx': minx, 'miny': miny, 'dlng': dlng, 'dlat': dlat, 'nx': nx, 'ny': ny,
+            'resolution_m': resolution_m, 'types': zone_types, 'type_dtype': np.dtype(type_dtype).name,
+            'severity_levels': SEVERITY_LEVELS, 'zone_count': len(zones), 'built_at': time.time()
+        }
+        if path:
+            os.makedirs(path, exist_ok=True)
+            severity = np.lib.format.open_memmap(os.path.join(path, 'severity.npy'), mode='w+',
+                                                 dtype=np.uint8, shape=(ny, nx))
+            types = np.lib.format.open_memmap(os.path.join(path, 'types.npy'), mode='w+',
+                                              dtype=type_dtype, shape=(ny, nx))
+        else:
+            severity = np.zeros((ny, nx), dtype=np.uint8)
+            types = np.zeros((ny, nx), dtype=type_dtype)
+
+        for z in np.flatnonzero(valid):
+            zone = zones[z]
+            info = zone.get('restriction_info') or {}
+            level = SEVERITY_LEVELS.get(info.get('severity'), 1)
+            bit = type_bits[info.get('type') or '미분류']
+
+            a, b, _ = zone_index._zone_edges(np.array([z]))
+            if len(a) == 0:
+                continue
+            gx0, gy0 = (a[:, 0] - minx) / dlng, (a[:, 1] - miny) / dlat
+            gx1, gy1 = (b[:, 0] - minx) / dlng, (b[:, 1] - miny) / dlat
+            c0 = max(int(math.floor(min(gx0.min(), gx1.min()))) - 1, 0)
+            r0 = max(int(math.floor(min(gy0.min(), gy1.min()))) - 1, 0)
+            c1 = min(int(math.floor(max(gx0.max(), gx1.max()))) + 2, nx)
+            r1 = min(int(math.floor(max(gy0.max(), gy1.max()))) + 2, ny)
+            if c1 <= c0 or r1 <= r0:
+                continue
+
+            mask = np.zeros((r1 - r0, c1 - c0), dtype=bool)
+            gx0, gx1, gy0, gy1 = gx0 - c0, gx1 - c0, gy0 - r0, gy1 - r0
+            _fill_scanlines(mask, gx0, gy0, gx1, gy1)
+            _mark_boundary(mask, gx0, gy0, gx1, gy1)
+
+            window = severity[r0:r1, c0:c1]
+            np.maximum(window, np.where(mask, np.uint8(level), np.uint8(0)), out=window)
+            types[r0:r1, c0:c1] |= np.where(mask, bit, type_dtype(0))
+
+        raster = cls(severity, types, meta)
+        if path:
+            severity.flush()
+            types.flush()
+            with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+        print(f"🧱 위험도 래스터: {nx}×{ny} 셀 ({resolution_m:g} m), {len(zones)}개 구역, "
+              f"{time.time() - started:.2f}초")
+        return raster
+
+    @classmethod
+    def open(cls, path):
+        """저장된 래스터를 읽기 전용 메모리 맵으로 열기"""
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        severity = np.load(os.path.join(path, 'severity.npy'), mmap_mode='r')
+        types = np.load(os.path.join(path, 'types.npy'), mmap_mode='r')
+        return cls(severity, types, meta)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def cell_of(self, lngs, lats):
+        """경위도 → (행, 열, 범위 안 여부)"""
+        m = self.meta
+        cols = np.floor((np.asarray(lngs, dtype=np.float64) - m['minx']) / m['dlng']).astype(np.int64)
+        rows = np.floor((np.asarray(lats, dtype=np.float64) - m['miny']) / m['dlat']).astype(np.int64)
+        inside = (cols >= 0) & (cols < m['nx']) & (rows >= 0) & (rows < m['ny'])
+        return np.where(inside, rows, 0), np.where(inside, cols, 0), inside
+
+    def lookup_many(self, lngs, lats):
+        """여러 점의 (위험도 배열, 유형 비트마스크 배열), 래스터 밖은 0"""
+        rows, cols, inside = self.cell_of(lngs, lats)
+        severity = np.where(inside, self.severity[rows, cols], 0).astype(np.uint8)
+        types = np.where(inside, self.types[rows, cols], 0).astype(self.types.dtype)
+        return severity, types
+
+    def lookup(self, lng, lat):
+        """한 점의 위험도 이름과 유형 목록 (제한 없으면 (None, []))"""
+        severity, types = self.lookup_many([lng], [lat])
+        return SEVERITY_NAMES.get(int(severity[0])), self.type_names(int(types[0]))
+
+    def type_names(self, mask):
+        return [t for i, t in enumerate(self.meta['types']) if mask >> i & 1]
+
+    # ------------------------------------------------------------------
+    # 히트맵
+    # ------------------------------------------------------------------
+    def heatmap(self, max_pixels=MAX_HEATMAP_PIXELS):
+        """위험도 RGBA 이미지(북쪽이 위)와 [[남, 서], [북, 동]] 범위
+
+        큰 래스터는 블록별 최댓값으로 축소 (축소해도 제한 셀이 사라지지 않음)
+        """
+        m = self.meta
+        severity = np.asarray(self.severity)
+        ny, nx = severity.shape
+        step = max(1, int(math.ceil(max(ny, nx) / max_pixels)))
+        if step > 1:
+            padded = np.zeros((math.ceil(ny / step) * step, math.ceil(nx / step) * step), dtype=np.uint8)
+            padded[:ny, :nx] = severity
+            severity = padded.reshape(padded.shape[0] // step, step, padded.shape[1] // step, step).max(axis=(1, 3))
+
+        palette = np.zeros((4, 4), dtype=np.uint8)
+        for level, color in SEVERITY_COLORS.items():
+            palette[level] = color
+        rows, cols = severity.shape
+        bounds = [[m['miny'], m['minx']],
+                  [m['miny'] + rows * step * m['dlat'], m['minx'] + cols * step * m['dlng']]]
+        return palette[severity[::-1]], bounds
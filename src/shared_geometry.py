@@ -0,0 +1,314 @@
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from projection import DEFAULT_CRS, ring_area_perimeter
+from zone_index import EARTH_RADIUS_M, iter_polygons
+
+M_PER_DEG = math.radians(1) * EARTH_RADIUS_M
+
+# 이보다 구역이 적으면 프로세스 풀 준비 비용이 더 커서 현재 프로세스에서 처리
+PARALLEL_MIN_ZONES = 5000
+
+# 작업 프로세스가 채우는 결과 배열
+OUTPUT_FIELDS = ('center', 'area_m2', 'perimeter_m', 'class_code', 'keep')
+
+
+def pack_geometries(geometries):
+    """(geom_type, coordinates) 목록 → 연속 배열 (ZoneIndex와 같은 배치)
+
+    링은 원본 그대로(닫는 점 추가/빈 링 제거 없이) 담아 중심점이 calculate_center_point와 같게 계산됨
+    """
+    points = []
+    ring_offsets = [0]
+    ring_is_hole = []
+    zone_ring_offsets = [0]
+    for geom_type, coordinates in geometries:
+        for polygon in iter_polygons(geom_type, coordinates):
+            for ring_no, ring in enumerate(polygon):
+                points.extend((float(p[0]), float(p[1])) for p in ring)
+                ring_offsets.append(len(points))
+                ring_is_hole.append(ring_no > 0)
+        zone_ring_offsets.append(len(ring_offsets) - 1)
+    return {
+        'xy': np.asarray(points, dtype=np.float64).reshape(-1, 2),
+        'ring_offsets': np.asarray(ring_offsets, dtype=np.int64),
+        'zone_ring_offsets': np.asarray(zone_ring_offsets, dtype=np.int64),
+        'ring_is_hole': np.asarray(ring_is_hole, dtype=bool)
+    }
+
+
+def _output_arrays(packed):
+    zone_count = len(packed['zone_ring_offsets']) - 1
+    return {
+        'center': np.full((zone_count, 2), np.nan),
+        'area_m2': np.zeros(zone_count),
+        'perimeter_m': np.zeros(zone_count),
+        'class_code': np.full(zone_count, -1, dtype=np.int32),
+        'keep': np.ones(len(packed['xy']), dtype=bool)
+    }
+
+
+class SharedArrays:
+    """이름 있는 공유 메모리 블록에 올린 NumPy 배열 묶음
+
+    작업 프로세스는 spec(블록 이름/모양/dtype)만 받아 같은 메모리를 붙여 쓰므로
+    좌표 배열을 피클로 복사하지 않음
+    """
+
+    def __init__(self, blocks, arrays, owner):
+        self._blocks = blocks
+        self.arrays = arrays
+        self.owner = owner
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    @classmethod
+    def create(cls, arrays):
+        blocks, shared = {}, {}
+        try:
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks[name] = block
+                shared[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared[name][...] = array
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        return cls(blocks, shared, owner=True)
+
+    @property
+    def spec(self):
+        return {name: (self._blocks[name].name, array.shape, array.dtype.str) for name, array in self.arrays.items()}
+
+    @classmethod
+    def attach(cls, spec):
+        blocks, arrays = {}, {}
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks[name] = block
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return cls(blocks, arrays, owner=False)
+
+    def copy(self):
+        return {name: np.array(array) for name, array in self.arrays.items()}
+
+    def close(self):
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self._blocks = {}
+
+
+def _simplify_mask(x, y, tolerance):
+    """Douglas-Peucker로 남길 정점 표시 (x, y는 미터 단위 지역 좌표)"""
+    n = len(x)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        dx, dy = x[j] - x[i], y[j] - y[i]
+        px, py = x[i + 1:j] - x[i], y[i + 1:j] - y[i]
+        length = math.hypot(dx, dy)
+        # 닫힌 링은 시작점 = 끝점이므로 시작점에서 가장 먼 점으로 나눔
+        d = np.hypot(px, py) if length == 0 else np.abs(px * dy - py * dx) / length
+        k = int(np.argmax(d))
+        if d[k] > tolerance:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    if keep.sum() < 4:
+        keep[:] = True
+    return keep
+
+
+def process_zone_chunk(arrays, lo, hi, props=None, classify=None, simplify_tolerance_m=None, crs=DEFAULT_CRS):
+    """구역 [lo, hi)의 중심점/면적/둘레 계산(링 단위 벡터 연산), 분류, 단순화
+
+    면적/둘레는 구간 정점 전체를 crs(TM) 좌표로 한 번에 투영해 타원체 지표 값으로 계산
+
+    결과는 arrays의 결과 배열에 직접 기록, 분류 결과 표(JSON 텍스트 목록)를 반환하고
+    class_code에는 이 표의 위치를 기록 (분류 실패는 -1)
+    """
+    xy, ring_offsets = arrays['xy'], arrays['ring_offsets']
+    zone_ring_offsets, ring_is_hole = arrays['zone_ring_offsets'], arrays['ring_is_hole']
+    r_lo, r_hi = int(zone_ring_offsets[lo]), int(zone_ring_offsets[hi])
+
+    if r_hi > r_lo:
+        starts = ring_offsets[r_lo:r_hi]
+        counts = ring_offsets[r_lo + 1:r_hi + 1] - starts
+        v_lo, v_hi = int(starts[0]), int(ring_offsets[r_hi])
+        local = starts - v_lo
+        lng, lat = xy[v_lo:v_hi, 0], xy[v_lo:v_hi, 1]
+        ring_area, ring_perimeter = ring_area_perimeter(lng, lat, local, counts, crs)
+        ring_area = np.where(ring_is_hole[r_lo:r_hi], -ring_area, ring_area)
+        ring_perimeter = np.where(ring_is_hole[r_lo:r_hi], 0.0, ring_perimeter)
+
+        first_ring = zone_ring_offsets[lo:hi] - r_lo
+        has_rings = zone_ring_offsets[lo + 1:hi + 1] > zone_ring_offsets[lo:hi]
+        area_m2 = np.add.reduceat(np.append(ring_area, 0.0), first_ring)
+        perimeter_m = np.add.reduceat(np.append(ring_perimeter, 0.0), first_ring)
+        arrays['area_m2'][lo:hi] = np.where(has_rings, np.maximum(area_m2, 0.0), 0.0)
+        arrays['perimeter_m'][lo:hi] = np.where(has_rings, perimeter_m, 0.0)
+
+        # 중심점: 첫 링 정점 평균 (reduceat은 합산 순서가 달라 calculate_center_point와 같은 sum 사용)
+        center = arrays['center']
+        for z in np.flatnonzero(has_rings):
+            r = first_ring[z]
+            if counts[r]:
+                s, e = int(local[r]), int(local[r] + counts[r])
+                center[lo + z, 0] = sum(lat[s:e].tolist()) / int(counts[r])
+                center[lo + z, 1] = sum(lng[s:e].tolist()) / int(counts[r])
+
+        if simplify_tolerance_m and v_hi > v_lo:
+            # 단순화는 링 첫 정점 기준 등장방형 평면 좌표(m)로 충분
+            # (끝에 0을 하나 붙여 빈 링(시작 위치 = 끝)도 reduceat 구간이 되도록 함)
+            ring_of = np.repeat(np.arange(r_hi - r_lo), counts)
+            first_vertex = local[ring_of]
+            ring_lat = np.add.reduceat(np.append(lat, 0.0), local) / np.maximum(counts, 1)
+            kx = M_PER_DEG * np.cos(np.radians(ring_lat))
+            x = (lng - lng[first_vertex]) * kx[ring_of]
+            y = (lat - lat[first_vertex]) * M_PER_DEG
+            keep = arrays['keep']
+            for r in np.flatnonzero(counts >= 4):
+                s, e = int(local[r]), int(local[r] + counts[r])
+                keep[v_lo + s:v_lo + e] = _simplify_mask(x[s:e], y[s:e], simplify_tolerance_m)
+
+    table = []
+    if classify is not None and props is not None:
+        codes = {}
+        class_code = arrays['class_code']
+        for offset, zone_props in enumerate(props):
+            try:
+                text = json.dumps(classify(zone_props), ensure_ascii=False, sort_keys=True)
+            except Exception:
+                continue
+            if text not in codes:
+                codes[text] = len(table)
+                table.append(text)
+            class_code[lo + offset] = codes[text]
+    return table
+
+
+# 작업 프로세스별로 한 번만 붙이는 공유 배열
+_worker_arrays = None
+
+
+def _init_worker(spec):
+    global _worker_arrays
+    _worker_arrays = SharedArrays.attach(spec)
+
+
+def _run_chunk(lo, hi, props, classify, simplify_tolerance_m):
+    return process_zone_chunk(_worker_arrays, lo, hi, props, classify, simplify_tolerance_m)
+
+
+class ZoneMetrics:
+    """compute_zone_metrics 결과 (구역 순서 그대로)"""
+
+    def __init__(self, packed, outputs, tables):
+        self.packed = packed
+        self.center = outputs['center']
+        self.area_m2 = outputs['area_m2']
+        self.perimeter_m = outputs['perimeter_m']
+        self.class_code = outputs['class_code']
+        self.keep = outputs['keep']
+        self.tables = tables
+
+    def __len__(self):
+        return len(self.area_m2)
+
+    def center_of(self, i):
+        """(위도, 경도), 계산할 수 없으면 (None, None)"""
+        lat, lng = self.center[i]
+        return (None, None) if math.isnan(lat) else (float(lat), float(lng))
+
+    def restriction_info(self, i):
+        """분류 결과 (구역마다 새 dict), 분류하지 않았거나 실패했으면 None"""
+        code = int(self.class_code[i])
+        return json.loads(self.tables[code]) if code >= 0 else None
+
+    def simplified_rings(self, i):
+        """단순화된 링 목록 (simplify_tolerance_m을 준 경우)"""
+        ring_offsets = self.packed['ring_offsets']
+        zone_ring_offsets = self.packed['zone_ring_offsets']
+        rings = []
+        for r in range(zone_ring_offsets[i], zone_ring_offsets[i + 1]):
+            s, e = ring_offsets[r], ring_offsets[r + 1]
+            rings.append(self.packed['xy'][s:e][self.keep[s:e]].tolist())
+        return rings
+
+
+def _chunk_bounds(zone_ring_offsets, ring_offsets, chunks):
+    """정점 수가 비슷하도록 구역 구간 나누기"""
+    zone_count = len(zone_ring_offsets) - 1
+    vertex_end = ring_offsets[zone_ring_offsets[1:]]
+    targets = np.linspace(0, vertex_end[-1] if zone_count else 0, chunks + 1)[1:-1]
+    cuts = np.searchsorted(vertex_end, targets, side='right') + 1
+    bounds = np.unique(np.concatenate(([0], np.minimum(cuts, zone_count), [zone_count])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def compute_zone_metrics(packed, props=None, classify=None, workers=None, simplify_tolerance_m=None,
+                         chunks_per_worker=4):
+    """구역별 중심점/면적/둘레/분류(/단순화)를 계산
+
+    packed: pack_geometries 결과, classify(props)는 최상위 함수여야 함 (작업 프로세스로 전달)
+    workers가 2 이상이고 구역이 충분히 많으면 좌표/결과 배열을 공유 메모리에 두고
+    프로세스 풀이 구역 구간별로 처리 (좌표는 피클로 전달하지 않음)
+    """
+    zone_count = len(packed['zone_ring_offsets']) - 1
+    outputs = _output_arrays(packed)
+    workers = workers or 1
+    started = time.time()
+
+    if workers <= 1 or zone_count < PARALLEL_MIN_ZONES:
+        arrays = dict(packed, **outputs)
+        tables = [process_zone_chunk(arrays, 0, zone_count, props, classify, simplify_tolerance_m)] \
+            if zone_count else []
+        _merge_tables(outputs['class_code'], [(0, zone_count)], tables)
+        return ZoneMetrics(packed, outputs, _flatten(tables))
+
+    bounds = _chunk_bounds(packed['zone_ring_offsets'], packed['ring_offsets'], workers * chunks_per_worker)
+    shared = SharedArrays.create(dict(packed, **outputs))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.spec,)) as executor:
+            futures = [executor.submit(_run_chunk, lo, hi, props[lo:hi] if props is not None else None,
+                                       classify, simplify_tolerance_m) for lo, hi in bounds]
+            tables = [future.result() for future in futures]
+        result = shared.copy()
+    finally:
+        shared.close()
+
+    outputs = {name: result[name] for name in OUTPUT_FIELDS}
+    _merge_tables(outputs['class_code'], bounds, tables)
+    print(f"🧮 구역 계산: {zone_count:,}개 구역, {workers}개 프로세스, {len(bounds)}개 구간 "
+          f"({time.time() - started:.2f}초)")
+    return ZoneMetrics(packed, outputs, _flatten(tables))
+
+
+def _merge_tables(class_code, bounds, tables):
+    """구간별 분류 표 위치 → 전체 표 위치 (구간마다 표를 이어 붙인 순서)"""
+    offset = 0
+    for (lo, hi), table in zip(bounds, tables):
+        codes = class_code[lo:hi]
+        codes[codes >= 0] += offset
+        offset += len(table)
+
+
+def _flatten(tables):
+    return [text for table in tables for text in table]
@@ -0,0 +1,148 @@
+import json
+import math
+import os
+import sqlite3
+import struct
+import time
+
+from zone_index import iter_polygons
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE zones (
+    id INTEGER PRIMARY KEY,
+    zone_index INTEGER,
+    zone_key TEXT,
+    name TEXT,
+    type TEXT,
+    severity TEXT,
+    labels TEXT,
+    altitude_limit TEXT,
+    floor_m REAL,
+    floor_ref TEXT,
+    ceiling_m REAL,
+    ceiling_ref TEXT,
+    valid_from TEXT,
+    valid_to TEXT,
+    sido TEXT,
+    sigungu TEXT,
+    dong TEXT,
+    full_address TEXT,
+    center_lat REAL,
+    center_lng REAL,
+    area_m2 REAL,
+    perimeter_m REAL,
+    description TEXT,
+    properties TEXT,
+    geometry_type TEXT,
+    geometry BLOB
+);
+CREATE VIRTUAL TABLE zones_rtree USING rtree(id, minx, maxx, miny, maxy);
+CREATE INDEX zones_type ON zones(type);
+CREATE INDEX zones_severity ON zones(severity);
+CREATE INDEX zones_sigungu ON zones(sigungu);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# 범위 질의 예 (zones_rtree.id = zones.id)
+BBOX_QUERY = """
+SELECT z.* FROM zones_rtree r JOIN zones z ON z.id = r.id
+WHERE r.maxx >= :minx AND r.minx <= :maxx AND r.maxy >= :miny AND r.miny <= :maxy
+"""
+
+_WKB_POLYGON = 3
+_WKB_MULTIPOLYGON = 6
+
+
+def _wkb_polygon(polygon):
+    parts = [struct.pack('<BII', 1, _WKB_POLYGON, len(polygon))]
+    for ring in polygon:
+        parts.append(struct.pack('<I', len(ring)))
+        parts.append(struct.pack(f'<{2 * len(ring)}d', *(float(v) for p in ring for v in p[:2])))
+    return b''.join(parts)
+
+
+def geometry_wkb(geom_type, coordinates):
+    """폴리곤/멀티폴리곤 → WKB (리틀 엔디언), 지오메트리가 없으면 None"""
+    polygons = [polygon for polygon in iter_polygons(geom_type, coordinates)]
+    if not polygons:
+        return None
+    if geom_type == 'Polygon':
+        return _wkb_polygon(polygons[0])
+    return b''.join([struct.pack('<BII', 1, _WKB_MULTIPOLYGON, len(polygons))]
+                    + [_wkb_polygon(polygon) for polygon in polygons])
+
+
+def geometry_bbox(geom_type, coordinates):
+    """(minx, miny, maxx, maxy), 좌표가 없으면 None"""
+    minx = miny = math.inf
+    maxx = maxy = -math.inf
+    for polygon in iter_polygons(geom_type, coordinates):
+        for ring in polygon:
+            for p in ring:
+                minx, maxx = min(minx, p[0]), max(maxx, p[0])
+                miny, maxy = min(miny, p[1]), max(maxy, p[1])
+    return None if math.isinf(minx) else (minx, miny, maxx, maxy)
+
+
+def _zone_row(row_id, zone):
+    info = zone.get('restriction_info') or {}
+    address = zone.get('address_info') or {}
+    altitude = zone.get('altitude') or {}
+    geom_type, coordinates = zone.get('geometry_type'), zone.get('coordinates')
+    return (
+        row_id, zone.get('index'), zone.get('zone_id'), zone.get('name'),
+        info.get('type'), info.get('severity'),
+        json.dumps(zone.get('labels') or [], ensure_ascii=False), zone.get('altitude_limit'),
+        altitude.get('floor_m'), altitude.get('floor_ref'), altitude.get('ceiling_m'), altitude.get('ceiling_ref'),
+        zone.get('valid_from'), zone.get('valid_to'),
+        address.get('sido'), address.get('sigungu'), address.get('dong'), address.get('full_address'),
+        zone.get('center_lat'), zone.get('center_lng'), zone.get('area_m2'), zone.get('perimeter_m'),
+        zone.get('description'), json.dumps(zone.get('properties') or {}, ensure_ascii=False),
+        geom_type if coordinates else None, geometry_wkb(geom_type, coordinates)
+    )
+
+
+def export_zones_sqlite(zones, path):
+    """분류된 구역 목록을 SQLite 파일 하나로 내보내기
+
+    - zones: 속성 열 + geometry(WKB) / zones_rtree: 구역 bbox R*Tree (id = zones.id)
+    - type, severity, sigungu 색인
+    임시 파일에 한 트랜잭션으로 기록한 뒤 교체하므로 읽는 쪽은 항상 완성된 파일만 봄
+    """
+    started = time.time()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    rows, boxes = [], []
+    for row_id, zone in enumerate(zones, 1):
+        rows.append(_zone_row(row_id, zone))
+        bbox = geometry_bbox(zone.get('geometry_type'), zone.get('coordinates'))
+        if bbox:
+            minx, miny, maxx, maxy = bbox
+            boxes.append((row_id, minx, maxx, miny, maxy))
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            if rows:
+                conn.executemany(f"INSERT INTO zones VALUES ({', '.join('?' * len(rows[0]))})", rows)
+            conn.executemany("INSERT INTO zones_rtree VALUES (?, ?, ?, ?, ?)", boxes)
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('schema_version', str(SCHEMA_VERSION)),
+                ('zone_count', str(len(rows))),
+                ('generated_at', time.strftime('%Y-%m-%d %H:%M:%S')),
+                ('geometry_encoding', 'WKB (EPSG:4326)')
+            ])
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+    print(f"🗄️  SQLite 저장: {path} ({len(rows)}개 구역, {os.path.getsize(path):,} bytes, "
+          f"{time.time() - started:.2f}초)")
+    return path
@@ -0,0 +1,360 @@
+import argparse
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+import numpy as np
+
+from severity_raster import SEVERITY_LEVELS, SEVERITY_NAMES
+from time_validity import format_timestamp, parse_timestamp
+from topojson_export import decode_topology
+from zone_index import ZoneIndex
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# 텔레메트리 열 이름 별칭 (소문자 기준, 앞쪽 우선)
+COLUMN_ALIASES = {
+    'flight_id': ('flight_id', 'flight', 'drone_id', 'id'),
+    'timestamp': ('timestamp', 'time', 'ts', 'datetime'),
+    'lat': ('lat', 'latitude', 'y'),
+    'lng': ('lng', 'lon', 'long', 'longitude', 'x'),
+    'alt': ('alt', 'altitude', 'altitude_m', 'alt_m', 'height')
+}
+REQUIRED_COLUMNS = ('lat', 'lng')
+
+OUTPUT_FIELDS = ('zone_ids', 'zone_types', 'max_severity')
+
+
+def resolve_columns(header):
+    """헤더 → {표준 열 이름: 위치}, 위도/경도 열이 없으면 ValueError"""
+    lowered = [name.strip().lower() for name in header]
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                columns[key] = lowered.index(alias)
+                break
+    missing = [key for key in REQUIRED_COLUMNS if key not in columns]
+    if missing:
+        raise ValueError(f"텔레메트리 파일에 {', '.join(missing)} 열이 없습니다: {header}")
+    return columns
+
+
+def _iter_csv_chunks(path, chunk_size):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield header, rows
+
+
+def _iter_parquet_chunks(path, chunk_size):
+    if pq is None:
+        raise ImportError("Parquet 텔레메트리를 읽으려면 pyarrow가 필요합니다 (pip install pyarrow)")
+    parquet = pq.ParquetFile(path)
+    header = parquet.schema_arrow.names
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        columns = batch.to_pydict()
+        yield header, list(zip(*(columns[name] for name in header)))
+
+
+def iter_telemetry_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """텔레메트리 파일을 (헤더, 행 목록) 청크로 순회 (.parquet이면 pyarrow, 그 외 CSV)
+
+    한 번에 chunk_size 행만 메모리에 올리므로 파일 크기와 무관하게 사용량이 일정함
+    """
+    if path.lower().endswith(('.parquet', '.pq')):
+        return _iter_parquet_chunks(path, chunk_size)
+    return _iter_csv_chunks(path, chunk_size)
+
+
+def _column_values(rows, position):
+    return [row[position] if position < len(row) else None for row in rows]
+
+
+def _numeric(values):
+    """값 목록 → float 배열 (빈 값은 NaN), 숫자가 아닌 값이 있으면 ValueError"""
+    return np.array([np.nan if v in (None, '') else v for v in values], dtype=np.float64)
+
+
+def _float_column(rows, position):
+    values = _column_values(rows, position)
+    try:
+        return _numeric(values)
+    except ValueError:
+        return np.array([_to_float(v) for v in values], dtype=np.float64)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _timestamp_column(rows, position):
+    """숫자(epoch 초)면 그대로, 아니면 값마다 parse_timestamp (해석 불가 → NaN)"""
+    values = _column_values(rows, position)
+    try:
+        return _numeric(values)
+    except ValueError:
+        parsed = {}
+        for value in set(values):
+            ts = _to_float(value)
+            if np.isnan(ts):
+                ts = parse_timestamp(value)
+            parsed[value] = np.nan if ts is None else ts
+        return np.array([parsed[value] for value in values], dtype=np.float64)
+
+
+class TelemetryAudit:
+    """청크 단위 텔레메트리 점 분류 + 비행별 위반 요약
+
+    - 점마다 포함 구역 ID/유형/최고 위험도 (ZoneIndex.query_points, 고도/시각이 있으면 함께 판정)
+    - 비행별: 점 수, 위반 점 수, 구역 진입 횟수(밖 → 안), 첫/마지막 위반 시각, 구역별 점 수, 최고 위험도
+    점은 비행 안에서 시간 순서라고 가정 (진입 횟수 계산)
+    """
+
+    def __init__(self, index, reference='AGL'):
+        self.index = index
+        self.reference = reference
+        records = index.records
+        self.zone_ids = [record.get('index') for record in records]
+        self.zone_types = [record.get('type') or '' for record in records]
+        self.zone_severity = np.array([SEVERITY_LEVELS.get(record.get('severity'), 0) for record in records],
+                                      dtype=np.int8)
+        self.flights = {}
+        self.points = 0
+        self.violations = 0
+        self.elapsed = 0.0
+
+    def _flight(self, flight_id):
+        flight = self.flights.get(flight_id)
+        if flight is None:
+            flight = self.flights[flight_id] = {
+                'points': 0, 'violation_points': 0, 'entries': 0, 'inside': False,
+                'first_violation': np.inf, 'last_violation': -np.inf,
+                'max_severity': 0, 'zones': {}
+            }
+        return flight
+
+    def classify_chunk(self, lngs, lats, altitudes=None, timestamps=None, flight_ids=None):
+        """점 배열 한 청크 분류 → (pair_point, pair_zone, 점별 최고 위험도 코드), 비행 요약 누적"""
+        started = time.perf_counter()
+        count = len(lngs)
+        pair_point, pair_zone = self.index.query_points(lngs, lats, altitudes, timestamps, self.reference)
+        severity = np.zeros(count, dtype=np.int8)
+        np.maximum.at(severity, pair_point, self.zone_severity[pair_zone])
+        violating = np.zeros(count, dtype=bool)
+        violating[pair_point] = True
+
+        if flight_ids is None:
+            flight_ids = [''] * count
+        names, inverse = np.unique(np.asarray(flight_ids, dtype=object).astype(str), return_inverse=True)
+        names = names.tolist()
+        point_counts = np.bincount(inverse, minlength=len(names))
+        violation_counts = np.bincount(inverse, weights=violating, minlength=len(names)).astype(np.int64)
+        flight_severity = np.zeros(len(names), dtype=np.int8)
+        np.maximum.at(flight_severity, inverse, severity)
+
+        # 진입: 같은 비행의 직전 점이 밖이고 현재 점이 안 (청크 경계는 비행별 마지막 상태로 이어 붙임)
+        order = np.argsort(inverse, kind='stable')
+        grouped = inverse[order]
+        inside = violating[order]
+        first_in_group = np.concatenate(([True], grouped[1:] != grouped[:-1]))
+        previous = np.concatenate(([False], inside[:-1]))
+        carried = np.array([self._flight(name)['inside'] for name in names], dtype=bool)
+        previous[first_in_group] = carried[grouped[first_in_group]]
+        entries = np.bincount(grouped, weights=inside & ~previous, minlength=len(names)).astype(np.int64)
+        last_in_group = np.concatenate((grouped[1:] != grouped[:-1], [True]))
+        last_inside = np.zeros(len(names), dtype=bool)
+        last_inside[grouped[last_in_group]] = inside[last_in_group]
+
+        first_violation = np.full(len(names), np.inf)
+        last_violation = np.full(len(names), -np.inf)
+        if timestamps is not None:
+            hit = violating & ~np.isnan(timestamps)
+            np.minimum.at(first_violation, inverse[hit], timestamps[hit])
+            np.maximum.at(last_violation, inverse[hit], timestamps[hit])
+
+        pair_flight = inverse[pair_point]
+        keys, zone_points = np.unique(np.stack((pair_flight, pair_zone)), axis=1, return_counts=True)
+
+        for i, name in enumerate(names):
+            flight = self._flight(name)
+            flight['points'] += int(point_counts[i])
+            flight['violation_points'] += int(violation_counts[i])
+            flight['entries'] += int(entries[i])
+            flight['inside'] = bool(last_inside[i])
+            flight['first_violation'] = min(flight['first_violation'], first_violation[i])
+            flight['last_violation'] = max(flight['last_violation'], last_violation[i])
+            flight['max_severity'] = max(flight['max_severity'], int(flight_severity[i]))
+        for (f, z), n in zip(keys.T.tolist(), zone_points.tolist()):
+            zones = self._flight(names[f])['zones']
+            zones[z] = zones.get(z, 0) + n
+
+        self.points += count
+        self.violations += int(violating.sum())
+        self.elapsed += time.perf_counter() - started
+        return pair_point, pair_zone, severity
+
+    def point_fields(self, pair_point, pair_zone, severity, count):
+        """점별 출력 열 (zone_ids, zone_types, max_severity) 목록"""
+        fields = [('', '', '')] * count
+        if len(pair_point) == 0:
+            return fields
+        bounds = np.flatnonzero(np.diff(pair_point)) + 1
+        for lo, hi in zip(np.concatenate(([0], bounds)).tolist(), np.concatenate((bounds, [len(pair_point)])).tolist()):
+            zones = pair_zone[lo:hi].tolist()
+            point = int(pair_point[lo])
+            fields[point] = (
+                '|'.join(str(self.zone_ids[z]) for z in zones),
+                '|'.join(sorted({self.zone_types[z] for z in zones})),
+                SEVERITY_NAMES.get(int(severity[point]), '')
+            )
+        return fields
+
+    def flight_summaries(self):
+        """비행별 위반 요약 (JSON 직렬화 가능), 위반 점이 많은 순"""
+        summaries = []
+        for flight_id, flight in self.flights.items():
+            zones = sorted(flight['zones'].items(), key=lambda item: -item[1])
+            type_counts = {}
+            for z, n in zones:
+                zone_type = self.zone_types[z] or '기타'
+                type_counts[zone_type] = type_counts.get(zone_type, 0) + n
+            has_time = np.isfinite(flight['first_violation'])
+            summaries.append({
+                'flight_id': flight_id,
+                'points': flight['points'],
+                'violation_points': flight['violation_points'],
+                'violation_ratio': round(flight['violation_points'] / flight['points'], 4) if flight['points'] else 0.0,
+                'entries': flight['entries'],
+                'first_violation': format_timestamp(float(flight['first_violation'])) if has_time else None,
+                'last_violation': format_timestamp(float(flight['last_violation'])) if has_time else None,
+                'max_severity': SEVERITY_NAMES.get(flight['max_severity']),
+                'zones': [{'zone_id': self.zone_ids[z], 'type': self.zone_types[z], 'points': n} for z, n in zones],
+                'type_counts': type_counts
+            })
+        summaries.sort(key=lambda s: (-s['violation_points'], str(s['flight_id'])))
+        return summaries
+
+
+def audit_telemetry(index, telemetry_path, output_dir, chunk_size=DEFAULT_CHUNK_SIZE,
+                    reference='AGL', write_points=True):
+    """텔레메트리 파일을 청크 단위로 분류해 점별 결과 CSV와 비행별 요약 JSON 저장
+
+    - points.csv: 원본 열 + zone_ids, zone_types, max_severity
+    - flights.json: 비행별 위반 요약과 처리량(points/s)
+    반환: 요약 dict
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    audit = TelemetryAudit(index, reference=reference)
+    points_path = os.path.join(output_dir, 'points.csv')
+    tmp_points = f"{points_path}.{os.getpid()}.tmp"
+    started = time.perf_counter()
+    print(f"🛰️  텔레메트리 분류: {telemetry_path} (청크 {chunk_size:,}행, 구역 {len(index):,}개)")
+
+    writer = None
+    out = open(tmp_points, 'w', newline='', encoding='utf-8') if write_points else None
+    try:
+        for chunk_no, (header, rows) in enumerate(iter_telemetry_chunks(telemetry_path, chunk_size), 1):
+            columns = resolve_columns(header)
+            lngs = _float_column(rows, columns['lng'])
+            lats = _float_column(rows, columns['lat'])
+            altitudes = _float_column(rows, columns['alt']) if 'alt' in columns else None
+            timestamps = _timestamp_column(rows, columns['timestamp']) if 'timestamp' in columns else None
+            flight_ids = [row[columns['flight_id']] for row in rows] if 'flight_id' in columns else None
+
+            pair_point, pair_zone, severity = audit.classify_chunk(lngs, lats, altitudes, timestamps, flight_ids)
+            if out is not None:
+                if writer is None:
+                    writer = csv.writer(out)
+                    writer.writerow(list(header) + list(OUTPUT_FIELDS))
+                fields = audit.point_fields(pair_point, pair_zone, severity, len(rows))
+                writer.writerows(list(row) + list(extra) for row, extra in zip(rows, fields))
+
+            elapsed = time.perf_counter() - started
+            print(f"   청크 {chunk_no}: 누적 {audit.points:,}점, 위반 {audit.violations:,}점, "
+                  f"{audit.points / max(elapsed, 1e-9):,.0f} points/s")
+    except BaseException:
+        if out is not None:
+            out.close()
+            os.remove(tmp_points)
+        raise
+    if out is not None:
+        out.close()
+        os.replace(tmp_points, points_path)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'telemetry_file': telemetry_path,
+        'points': audit.points,
+        'violation_points': audit.violations,
+        'flights': len(audit.flights),
+        'violating_flights': sum(1 for f in audit.flights.values() if f['violation_points']),
+        'elapsed_seconds': round(elapsed, 3),
+        'points_per_second': round(audit.points / elapsed) if elapsed > 0 else None,
+        'classify_points_per_second': round(audit.points / audit.elapsed) if audit.elapsed > 0 else None,
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'flight_summaries': audit.flight_summaries()
+    }
+    flights_path = os.path.join(output_dir, 'flights.json')
+    tmp_flights = f"{flights_path}.{os.getpid()}.tmp"
+    with open(tmp_flights, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_flights, flights_path)
+
+    print(f"✅ 텔레메트리 {audit.points:,}점 중 {audit.violations:,}점이 제한 구역 안 "
+          f"(비행 {summary['violating_flights']}/{summary['flights']}건 위반), "
+          f"{elapsed:.2f}초, {summary['points_per_second'] or 0:,} points/s "
+          f"(분류만 {summary['classify_points_per_second'] or 0:,} points/s)")
+    print(f"   결과: {output_dir}/")
+    return summary
+
+
+def load_zone_index(path):
+    """구역 파일 → ZoneIndex (.npz 인덱스, .topo.json, 분류 결과 JSON 또는 구역 목록 JSON)"""
+    if path.endswith('.npz'):
+        return ZoneIndex.load(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and data.get('type') == 'Topology':
+        zones = decode_topology(data)
+    elif isinstance(data, dict):
+        zones = data.get('detailed_zones') or data.get('zones') or []
+    else:
+        zones = data
+    return ZoneIndex.from_zones(zones)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='드론 텔레메트리 일괄 제한 구역 판정 (청크 단위 스트리밍)')
+    parser.add_argument('telemetry', help='텔레메트리 CSV 또는 Parquet (flight_id, timestamp, lat, lng[, alt])')
+    parser.add_argument('--zones', default='result_data/zone_index.npz',
+                        help='구역 파일: 인덱스 .npz, .topo.json 또는 분류 결과 JSON (기본: result_data/zone_index.npz)')
+    parser.add_argument('--output-dir', default='result_data/telemetry_audit', help='결과 디렉토리')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='청크당 행 수 (기본: 100000)')
+    parser.add_argument('--reference', default='AGL', choices=('AGL', 'AMSL'), help='고도 열의 기준 (기본: AGL)')
+    parser.add_argument('--no-points', action='store_true', help='점별 결과 CSV 없이 비행별 요약만 저장')
+    args = parser.parse_args(argv)
+
+    index = load_zone_index(args.zones)
+    audit_telemetry(index, args.telemetry, args.output_dir, chunk_size=args.chunk_size,
+                    reference=args.reference, write_points=not args.no_points)
+
+
+if __name__ == '__main__':
+    main()
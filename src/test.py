@@ -3,10 +3,42 @@ import time
 from dotenv import load_dotenv
 import os
 import json
+import argparse
+import contextlib
+import sqlite3
+
+from response_cache import ResponseCache, OfflineCacheMiss
+from zone_service import run_service
+from admin_boundary import AdminBoundaryLookup
+from district_overlay import compute_district_coverage
+from altitude import parse_altitude_band
+from time_validity import (TimeValidityIndex, extract_effective_period, filter_active_zones,
+                           format_timestamp, parse_timestamp)
+from click_index import build_click_index, click_index_script
+from map_assets import data_script, map_asset_tags, prune_static_assets, write_gzip_copy
+from map_fragments import (FRAGMENT_VERSION, FragmentCache, content_hash, layer_loader_script,
+                           layer_script, render_feature_fragment, write_layer_files)
+from severity_raster import SeverityRaster
+from topojson_export import save_topojson
+from checkpoint_journal import CheckpointJournal
+from resilient_http import HedgedClient
+from shared_geometry import compute_zone_metrics, pack_geometries
+from sqlite_export import export_zones_sqlite
+from projection import buffer_geometry
+from enrichment_scheduler import (SEVERITY_PRIORITY, STATUS_CACHED, STATUS_DEADLINE, STATUS_FAILED, STATUS_FETCHED,
+                                  STATUS_SKIPPED, EnrichmentScheduler)
+from telemetry_audit import audit_telemetry
+from route_planner import RoutePlanner, parse_lng_lat, print_route, save_route_geojson
+from geometry_canonical import canonicalize_features, feature_labels, merge_labels
+from zone_features import zones_feature_collection
+from zone_index import ZoneIndex
+from region_batch import (geom_filter_bbox, load_regions, region_geom_filter, region_slug, merge_region_results,
+                          run_region_batch)
 
 try:
     import folium
     from folium import plugins
+    from map_fragments import ZoneLayerLoader
     FOLIUM_AVAILABLE = True
     print("✅ folium 라이브러리 사용 가능")
 except ImportError:
@@ -32,8 +64,110 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# 응답 캐시 (main에서 설정, None이면 캐시 없이 직접 요청)
+response_cache = None
+
+# 로컬 행정구역 경계 조회기 (main에서 설정, None이면 주소 API 사용)
+boundary_lookup = None
+
+# 지도 렌더링 조각 캐시 디렉토리 (None이면 매번 전체 렌더링)
+map_fragment_cache_dir = os.getenv('MAP_FRAGMENT_CACHE_DIR', 'cache/map_fragments')
+
+# 지도 레이어 데이터를 유형별 압축 파일로 분리해 켤 때 불러올지 여부 (False면 HTML에 모두 포함)
+map_lazy_layers = os.getenv('MAP_LAZY_LAYERS', '1') != '0'
+
+# 지도들이 공유하는 정적 자산(범례 CSS, 토글 JS 등) 디렉토리 (None이면 HTML마다 포함)
+map_static_dir = os.getenv('MAP_STATIC_DIR', 'result_data/static') or None
+
+# 지도 HTML과 정적 자산 옆에 미리 압축한 .gz 사본도 기록할지 여부
+map_gzip_output = os.getenv('MAP_GZIP_OUTPUT', '0') != '0'
+
+# 지도 클릭 지점 질의용 공간 인덱스(격자 + 단순화한 링)를 지도에 포함할지 여부와 링 단순화 허용 오차(m)
+map_click_index = os.getenv('MAP_CLICK_INDEX', '1') != '0'
+click_index_tolerance_m = float(os.getenv('CLICK_INDEX_TOLERANCE_M', '5'))
+
+# 지도를 열 때 바로 불러와 표시할 위험도 (나머지 유형은 범례에서 켤 때 불러옴)
+map_initial_severities = [s.strip() for s in os.getenv('MAP_INITIAL_SEVERITIES', 'high').split(',') if s.strip()]
+
+# TopoJSON 스냅샷 좌표 양자화 눈금 수 (0이면 TopoJSON 저장 안 함)
+topojson_quantization = int(os.getenv('TOPOJSON_QUANTIZATION', '1000000'))
+
+# 구역별 진행 기록(JSONL) 디렉토리 (None이면 기록 안 함), resume이면 기록된 구역은 건너뜀
+checkpoint_dir = os.getenv('CHECKPOINT_DIR', 'cache/checkpoints')
+resume_run = False
+
+# 중심점/면적/분류 일괄 계산 프로세스 수 (2 이상이면 대량 구역을 공유 메모리 프로세스 풀로 처리)
+geometry_workers = int(os.getenv('GEOMETRY_WORKERS', '0'))
+
+# 지오메트리 정규화 격자(도), 이 격자에서 같은 모양인 구역은 하나로 병합 (0이면 정규화/병합 안 함)
+dedup_grid_deg = float(os.getenv('GEOMETRY_DEDUP_GRID', '1e-7'))
+
+# 구역마다 이 거리(m)만큼 넓힌 안전 여유 지오메트리를 함께 계산 (0이면 계산 안 함)
+safety_margin_m = float(os.getenv('SAFETY_MARGIN_M', '0'))
+
+# 주소 보강 마감 시각 (epoch 초, main에서 --time-budget으로 설정, None이면 마감 없음)
+enrichment_deadline = None
+
+# 전체 시간 예산 중 주소 보강 뒤 저장/지도 생성을 위해 남겨 둘 초
+enrichment_reserve_s = float(os.getenv('ENRICHMENT_RESERVE_S', '15'))
+
+# 분류 결과를 SQLite(R*Tree 포함)로도 내보낼지 여부
+sqlite_export_enabled = os.getenv('SQLITE_EXPORT', '1') != '0'
+
+# 지연 헤지/차단기 클라이언트 (main에서 설정, None이면 requests.get 직접 사용)
+http_client = None
+
+# 직전 요청이 실제 네트워크를 사용했는지 여부 (API 호출 간격 조절용)
+_last_request_used_network = False
+
+def http_get(request_url, params=None, headers=None, timeout=15, cache_only=False):
+    """응답 캐시가 설정되어 있으면 캐시를 거쳐 GET 요청 (네트워크 요청은 헤지/차단기 클라이언트 사용)
+
+    cache_only면 네트워크 없이 캐시된 응답만 반환 (없으면 None)
+    """
+    global _last_request_used_network
+    if cache_only:
+        _last_request_used_network = False
+        if response_cache is None:
+            return None
+        # 만료된 캐시는 마감 시각이 있어 조회를 다 못 할 수도 있을 때만 사용 (없으면 get()에서 재검증)
+        return response_cache.peek(request_url, params=params, allow_stale=enrichment_deadline is not None)
+    _last_request_used_network = True
+    fetch = http_client.get if http_client is not None else requests.get
+    if response_cache is not None:
+        response = response_cache.get(request_url, params=params, headers=headers, timeout=timeout, fetch=fetch)
+        _last_request_used_network = not response_cache.last_from_cache
+        return response
+    return fetch(request_url, params=params, headers=headers, timeout=timeout)
+
+def used_network():
+    """직전 요청이 캐시/로컬 조회가 아닌 네트워크 요청이었는지 여부"""
+    return _last_request_used_network
+
+def coordinate_address(lat, lng):
+    """주소를 얻지 못했을 때 쓰는 좌표 기반 대체 주소"""
+    return {
+        'full_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
+        'simple_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
+        'sido': '', 'sigungu': '', 'dong': '', 'ri': '', 'road_name': '', 'building_number': '', 'zipcode': ''
+    }
+
 def get_detailed_address(lat, lng):
-    """좌표를 상세 주소로 변환"""
+    """좌표를 상세 주소로 변환 (경계 파일이 설정되어 있으면 로컬에서 시도/시군구/동 조회)"""
+    return lookup_address(lat, lng) or coordinate_address(lat, lng)
+
+def lookup_address(lat, lng, cache_only=False):
+    """좌표 → 상세 주소, 조회 실패 시 None
+
+    cache_only면 경계 파일과 응답 캐시만 사용하고 네트워크 요청은 하지 않음 (캐시에 없으면 None)
+    """
+    global _last_request_used_network
+    if boundary_lookup is not None:
+        address_info = boundary_lookup.resolve(lat, lng)
+        if address_info:
+            _last_request_used_network = False
+            return address_info
+    
     try:
         geocode_url = "https://api.vworld.kr/req/address"
         geocode_params = {
@@ -46,9 +180,9 @@ def get_detailed_address(lat, lng):
             'zipcode': 'true'
         }
         
-        response = requests.get(geocode_url, params=geocode_params, timeout=10)
+        response = http_get(geocode_url, params=geocode_params, timeout=10, cache_only=cache_only)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             addr_data = response.json()
             
             if ('response' in addr_data and 
@@ -75,19 +209,11 @@ def get_detailed_address(lat, lng):
                 address_info['simple_address'] = simple_address.strip()
                 return address_info
         
-        return {
-            'full_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
-            'simple_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
-            'sido': '', 'sigungu': '', 'dong': '', 'ri': '', 'road_name': '', 'building_number': '', 'zipcode': ''
-        }
+        return None
     
     except Exception as e:
         print(f"주소 변환 오류: {e}")
-        return {
-            'full_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
-            'simple_address': f"위도: {lat:.6f}, 경도: {lng:.6f}",
-            'sido': '', 'sigungu': '', 'dong': '', 'ri': '', 'road_name': '', 'building_number': '', 'zipcode': ''
-        }
+        return None
 
 def classify_restriction_type(props):
     """속성 정보를 기반으로 제한 구역 분류"""
@@ -262,8 +388,10 @@ def classify_restriction_type(props):
     
     return restriction_info
 
-def fetch_flight_restriction_data():
-    """비행 제한 구역 데이터 조회 및 분석"""
+def fetch_flight_restriction_data(geocode=True, params=None):
+    """비행 제한 구역 데이터 조회 및 분석 (geocode=False면 주소 조회 생략, params로 조회 조건 변경)"""
+    
+    request_params = params or base_params
     
     print("🔍 비행 제한 구역 데이터 조회 중...")
     
@@ -272,13 +400,19 @@ def fetch_flight_restriction_data():
     for attempt in range(3):
         try:
             print(f"   시도 {attempt + 1}/3...")
-            response = requests.get(url, params=base_params, headers=headers, timeout=15)
+            response = http_get(url, params=request_params, headers=headers, timeout=15)
             if response.status_code == 200:
                 data = response.json()
-                print("   ✅ 데이터 조회 성공")
+                if not used_network():
+                    print("   ✅ 데이터 조회 성공 (캐시)")
+                else:
+                    print("   ✅ 데이터 조회 성공")
                 break
             else:
                 print(f"   ❌ HTTP 오류: {response.status_code}")
+        except OfflineCacheMiss as e:
+            print(f"   ❌ 오프라인 모드: {e}")
+            break
         except Exception as e:
             print(f"   ❌ 요청 오류: {e}")
             if attempt < 2:
@@ -305,10 +439,45 @@ def fetch_flight_restriction_data():
         print("⚠️  조회된 구역이 없습니다.")
         return []
     
+    # 같은 모양의 구역 병합 (라벨은 모두 보존), 이후 분류/중심점/주소/지도는 모양마다 한 번만 처리
+    if dedup_grid_deg:
+        features, dedup_stats = canonicalize_features(features, grid=dedup_grid_deg, distinct_by=zone_distinct_key)
+        print(f"🧬 지오메트리 정규화: 정점 {dedup_stats['vertices_before']:,}개 → {dedup_stats['vertices_after']:,}개, "
+              f"같은 모양 {dedup_stats['merged']}개 병합 → {len(features)}개 구역")
+    
+    # 구역별 진행 기록 (--resume이면 같은 데이터 버전에서 완료된 구역은 다시 처리하지 않음)
+    journal = None
+    if checkpoint_dir:
+        try:
+            journal = CheckpointJournal.for_request(checkpoint_dir, url, request_params, features,
+                                                    geocode=geocode, resume=resume_run)
+            if journal.completed:
+                print(f"⏩ 진행 기록에서 {len(journal.completed)}개 구역 복원 ({journal.path})")
+        except OSError as e:
+            print(f"⚠️  진행 기록을 사용할 수 없습니다: {e}")
+    completed = dict(journal.completed) if journal else {}
+    
+    # 분류/중심점/면적을 구역 배열 단위로 한꺼번에 계산 (실패하면 구역별로 계산)
+    metrics = None
+    try:
+        geometries = [((feature.get('geometry') or {}).get('type'), (feature.get('geometry') or {}).get('coordinates'))
+                      for feature in features]
+        metrics = compute_zone_metrics(pack_geometries(geometries),
+                                       [feature.get('properties', {}) for feature in features],
+                                       classify_restriction_type, workers=geometry_workers)
+    except Exception as e:
+        print(f"⚠️  일괄 계산 실패, 구역별로 계산합니다: {e}")
+    
     # 각 구역 분석
     zones_with_classification = []
+    # 주소 보강 대기 구역 (분류가 모두 끝난 뒤 마감 시각 안에서 위험도 순으로 조회)
+    pending_enrichment = []
     
     for i, feature in enumerate(features, 1):
+        if i in completed:
+            zones_with_classification.append(completed[i])
+            continue
+        
         print(f"\n📍 구역 {i}/{len(features)} 분석 중...")
         
         try:
@@ -316,20 +485,40 @@ def fetch_flight_restriction_data():
             geom = feature.get('geometry', {})
             
             # 제한 구역 분류
-            restriction_info = classify_restriction_type(props)
+            restriction_info = (metrics.restriction_info(i - 1) if metrics else None) or classify_restriction_type(props)
+            merged_properties = feature.get('merged_properties') or []
+            merged_types = []
+            if merged_properties:
+                # 병합된 피처도 모두 분류해 가장 위험한 분류를 사용 (같은 위험도면 먼저 나온 피처)
+                classified = [restriction_info] + [classify_restriction_type(p) for p in merged_properties]
+                merged_types = merge_labels([[info['type']] for info in classified])
+                most_severe = min(classified, key=lambda info: SEVERITY_PRIORITY.get(info['severity'],
+                                                                                      len(SEVERITY_PRIORITY)))
+                labels = merge_labels([restriction_info['labels']] + [feature_labels(p) for p in merged_properties])
+                restriction_info = dict(most_severe, labels=labels)
+            valid_from, valid_to = extract_effective_period(props)
             
             zone_info = {
                 'index': i,
                 'name': props.get('fac_name', f'구역 {i}'),
                 'restriction_info': restriction_info,
                 'altitude_limit': props.get('alt_lmt', '정보 없음'),
+                'altitude': parse_altitude_band(props),
+                'valid_from': format_timestamp(valid_from),
+                'valid_to': format_timestamp(valid_to),
                 'description': props.get('rmk', '정보 없음'),
                 'coordinates': None,
                 'center_lat': None,
                 'center_lng': None,
                 'address_info': None,
+                'area_m2': round(float(metrics.area_m2[i - 1]), 1) if metrics else None,
+                'perimeter_m': round(float(metrics.perimeter_m[i - 1]), 1) if metrics else None,
                 'properties': props,
-                'labels': restriction_info['labels']
+                'labels': restriction_info['labels'],
+                'geometry_hash': feature.get('geometry_hash'),
+                'merged_names': [p.get('fac_name', '') for p in merged_properties],
+                'merged_types': merged_types,
+                'enrichment_status': STATUS_SKIPPED
             }
             
             # 좌표 정보 처리
@@ -338,8 +527,17 @@ def fetch_flight_restriction_data():
                 zone_info['coordinates'] = coords
                 zone_info['geometry_type'] = geom.get('type', 'Unknown')
                 
+                # 안전 여유 구역 (TM 좌표계에서 지표 거리만큼 넓힌 뒤 경위도로 되돌림)
+                if safety_margin_m > 0:
+                    buffer_type, buffer_coords = buffer_geometry(zone_info['geometry_type'], coords, safety_margin_m)
+                    if buffer_type:
+                        zone_info['safety_buffer'] = {'distance_m': safety_margin_m, 'type': buffer_type,
+                                                      'coordinates': buffer_coords}
+                
                 # 중심점 계산
-                center_lat, center_lng = calculate_center_point(coords, geom.get('type'))
+                center_lat, center_lng = metrics.center_of(i - 1) if metrics else (None, None)
+                if center_lat is None:
+                    center_lat, center_lng = calculate_center_point(coords, geom.get('type'))
                 
                 if center_lat and center_lng:
                     zone_info['center_lat'] = center_lat
@@ -349,22 +547,21 @@ def fetch_flight_restriction_data():
                     print(f"   유형: {restriction_info['type']} ({restriction_info['severity']})")
                     print(f"   라벨: {', '.join(restriction_info['labels'])}")
                     print(f"   좌표: 위도 {center_lat:.6f}, 경도 {center_lng:.6f}")
+                    if zone_info['valid_from'] or zone_info['valid_to']:
+                        print(f"   유효 기간: {zone_info['valid_from'] or '-'} ~ {zone_info['valid_to'] or '-'}")
                     
-                    # 주소 정보 가져오기
-                    print(f"   주소 조회 중...")
-                    address_info = get_detailed_address(center_lat, center_lng)
-                    zone_info['address_info'] = address_info
-                    
-                    print(f"   위치: {address_info['simple_address']}")
-                    
-                    # API 호출 간격 조절
-                    time.sleep(0.3)
+                    # 주소 정보는 전체 구역 분류 후 한꺼번에 보강
+                    if geocode:
+                        pending_enrichment.append(zone_info)
                 else:
                     print(f"   ⚠️  좌표 계산 실패")
             else:
                 print(f"   ⚠️  좌표 정보 없음")
             
             zones_with_classification.append(zone_info)
+            # 주소 보강 대기 구역은 보강이 끝날 때 기록
+            if journal and not (pending_enrichment and pending_enrichment[-1] is zone_info):
+                journal.append(i, zone_info)
             
         except Exception as e:
             print(f"   ❌ 구역 {i} 처리 오류: {e}")
@@ -372,6 +569,12 @@ def fetch_flight_restriction_data():
         
         print("-" * 50)
     
+    if pending_enrichment:
+        enrich_zone_addresses(pending_enrichment, journal)
+    
+    if journal:
+        journal.close()
+    
     print(f"\n✅ 총 {len(zones_with_classification)}개 구역 분석 완료")
     
     # 구역 유형별 통계
@@ -388,6 +591,47 @@ def fetch_flight_restriction_data():
     
     return zones_with_classification
 
+def enrich_zone_addresses(zones, journal=None):
+    """구역 주소 보강 (enrichment_deadline이 있으면 위험도 높은 구역부터 조회하고, 시간이 모자라면
+    나머지는 캐시/좌표 주소로 채움), 구역마다 enrichment_status 기록"""
+    scheduler = EnrichmentScheduler(deadline=enrichment_deadline)
+    time_left = scheduler.time_left()
+    print(f"\n🏠 주소 보강: {len(zones)}개 구역"
+          + (f" (마감까지 {max(time_left, 0):.0f}초)" if time_left is not None else ""))
+    
+    def fetch(zone):
+        address_info = lookup_address(zone['center_lat'], zone['center_lng'])
+        # API 호출 간격 조절 (캐시/로컬 조회는 제외)
+        if used_network():
+            time.sleep(0.3)
+        return address_info
+    
+    def on_done(zone, address_info, status):
+        zone['address_info'] = address_info
+        zone['enrichment_status'] = status
+        print(f"   {zone['name']} ({zone['restriction_info']['severity']}): {address_info['simple_address']} [{status}]")
+        # 마감으로 대체 주소를 쓴 구역은 기록하지 않아 --resume 때 다시 조회
+        if journal and status != STATUS_DEADLINE:
+            journal.append(zone['index'], zone)
+    
+    stats = scheduler.run(
+        [(zone, zone['restriction_info']['severity']) for zone in zones],
+        peek=lambda zone: lookup_address(zone['center_lat'], zone['center_lng'], cache_only=True),
+        fetch=fetch,
+        fallback=lambda zone: coordinate_address(zone['center_lat'], zone['center_lng']),
+        on_done=on_done)
+    print(f"✅ 주소 보강 완료 ({stats['elapsed']:.1f}초): 캐시 {stats[STATUS_CACHED]}개, "
+          f"조회 {stats[STATUS_FETCHED]}개, 실패 {stats[STATUS_FAILED]}개, 마감 {stats[STATUS_DEADLINE]}개")
+    if stats[STATUS_DEADLINE]:
+        print(f"⚠️  마감 시각까지 조회하지 못한 {stats[STATUS_DEADLINE]}개 구역은 좌표 주소를 사용했습니다")
+    return stats
+
+def zone_distinct_key(props):
+    """모양이 같아도 병합하지 않을 구역 구분값 (고도 범위, 유효 기간)"""
+    band = parse_altitude_band(props)
+    return (band['floor_m'], band['floor_ref'], band['ceiling_m'], band['ceiling_ref'],
+            extract_effective_period(props))
+
 def calculate_center_point(coordinates, geom_type):
     """좌표 중심점 계산"""
     try:
@@ -414,8 +658,98 @@ def calculate_center_point(coordinates, geom_type):
         print(f"중심점 계산 오류: {e}")
         return None, None
 
-def create_classified_vworld_map(geojson_data, output_filename='classified_flight_restriction_zones.html'):
-    """VWorld 데이터를 기반으로 분류된 비행 제한 구역 지도 생성 (범례 클릭 문제 해결)"""
+def build_adhoc_zone(zone_id, feature):
+    """운영자가 정의한 임시 구역(GeoJSON Feature)을 조회 결과와 같은 형태로 분류
+    
+    properties에 prh_typ / prh_lbl_1~4 / fac_name / alt_lmt / valid_from / valid_to 등을 지정하면
+    classify_restriction_type 등 조회 데이터와 같은 규칙으로 유형·색상·고도·유효 기간이 정해짐
+    """
+    props = dict(feature.get('properties') or {})
+    geom = feature.get('geometry') or {}
+    if geom.get('type') not in ('Polygon', 'MultiPolygon') or not geom.get('coordinates'):
+        raise ValueError("임시 구역은 Polygon 또는 MultiPolygon 지오메트리가 필요합니다")
+    
+    restriction_info = classify_restriction_type(props)
+    valid_from, valid_to = extract_effective_period(props)
+    center_lat, center_lng = calculate_center_point(geom['coordinates'], geom['type'])
+    
+    return {
+        'index': None,
+        'zone_id': str(zone_id),
+        'source': 'adhoc',
+        'name': props.get('fac_name', f'임시 구역 {zone_id}'),
+        'restriction_info': restriction_info,
+        'altitude_limit': props.get('alt_lmt', '정보 없음'),
+        'altitude': parse_altitude_band(props),
+        'valid_from': format_timestamp(valid_from),
+        'valid_to': format_timestamp(valid_to),
+        'description': props.get('rmk', '정보 없음'),
+        'coordinates': geom['coordinates'],
+        'geometry_type': geom['type'],
+        'center_lat': center_lat,
+        'center_lng': center_lng,
+        'address_info': get_detailed_address(center_lat, center_lng) if boundary_lookup is not None else None,
+        'properties': props,
+        'labels': restriction_info['labels']
+    }
+
+def load_adhoc_zones(path):
+    """임시 구역 GeoJSON 파일(FeatureCollection) 로드, 키는 properties.zone_id 또는 순번"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    adhoc_zones = []
+    for i, feature in enumerate(data.get('features', []), 1):
+        zone_id = (feature.get('properties') or {}).get('zone_id') or feature.get('id') or f'adhoc-{i}'
+        try:
+            adhoc_zones.append(build_adhoc_zone(zone_id, feature))
+        except ValueError as e:
+            print(f"   ⚠️  임시 구역 {zone_id} 건너뜀: {e}")
+    return adhoc_zones
+
+def render_zone_popup(zone_type, style, props):
+    """구역 팝업 HTML 생성"""
+    return f"""
+    <div style="width: 300px; font-family: 'Malgun Gothic', Arial, sans-serif; line-height: 1.4;">
+        <div style="background: linear-gradient(135deg, {style['color']} 0%, #2c3e50 100%); 
+                    color: white; padding: 12px; margin: -10px -10px 12px -10px; border-radius: 8px 8px 0 0;">
+            <h4 style="margin: 0; font-size: 16px; display: flex; align-items: center;">
+                <span style="font-size: 20px; margin-right: 8px;">{style['icon']}</span>
+                {zone_type}
+            </h4>
+            <div style="font-size: 12px; opacity: 0.9; margin-top: 4px;">
+                비행 제한 구역 | 위험도: <span style="font-weight: bold;">{style['severity'].upper()}</span>
+            </div>
+        </div>
+        
+        <div style="background-color: #f8f9fa; padding: 10px; border-radius: 4px; margin-bottom: 10px;">
+            <strong>📍 구역 정보</strong>
+            <div style="font-size: 13px; margin-top: 4px; color: #495057;">
+                구역명: {props.get('ZONE_NAME', 'N/A')}<br>
+                고도: {props.get('ALTITUDE', 'N/A')}<br>
+                운영시간: {props.get('OPERATION_TIME', 'N/A')}
+            </div>
+        </div>
+        
+        <div style="margin-bottom: 10px; background-color: #fff3cd; padding: 8px; border-radius: 4px; border-left: 4px solid {style['color']};">
+            <strong>⚠️ 제한 사항</strong>
+            <div style="font-size: 13px; margin-top: 4px; color: #333;">
+                {props.get('RESTRICTION', '해당 구역에서의 비행이 제한됩니다.')}
+            </div>
+        </div>
+        
+        <div style="font-size: 11px; color: #6c757d; text-align: right; margin-top: 8px; border-top: 1px solid #dee2e6; padding-top: 8px;">
+            VWorld 데이터 기반
+        </div>
+    </div>
+    """
+
+def create_classified_vworld_map(geojson_data, output_filename='classified_flight_restriction_zones.html', as_of=None,
+                                 severity_raster=None):
+    """VWorld 데이터를 기반으로 분류된 비행 제한 구역 지도 생성 (범례 클릭 문제 해결, as_of 시각에 유효한 구역만 표시)
+    
+    severity_raster(SeverityRaster)를 넘기면 위험도 히트맵 레이어를 함께 추가
+    """
     
     try:
         print("🗺️ 분류된 VWorld 비행 제한 구역 지도 생성 중...")
@@ -447,6 +781,15 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
                     feature['properties'].get('ZONE_TYPE')):
                     valid_zones.append(feature)
         
+        # 기준 시각에 유효하지 않은 임시 구역 제외 (구간 트리 질의)
+        as_of_ts = parse_timestamp(as_of)
+        if as_of_ts is not None:
+            time_index = TimeValidityIndex.from_zones([feature['properties'] for feature in valid_zones])
+            valid_zones = [valid_zones[i] for i in time_index.active_ids(as_of_ts)]
+            print(f"🕒 기준 시각 {format_timestamp(as_of_ts)}에 유효한 구역만 표시")
+        elif as_of:
+            print(f"⚠️  기준 시각을 해석할 수 없어 모든 구역을 표시합니다: {as_of}")
+        
         print(f"📍 처리할 구역 수: {len(valid_zones)}개")
         
         # 구역 유형별 분류 및 카운트
@@ -476,68 +819,77 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
         # 기본 스타일 (정의되지 않은 구역 유형용)
         default_style = {'color': '#95a5a6', 'icon': '📍', 'severity': 'low', 'border': '2px solid #7f8c8d'}
         
-        # 구역별 레이어 그룹 생성
-        layer_groups = {}
+        # 분류된 구역(ZoneFeature 뷰)은 분류 결과의 색상/아이콘/위험도를 유형 스타일로 사용
         for zone_type, features in zone_groups.items():
-            layer_group = folium.FeatureGroup(name=f"{zone_type} ({len(features)}개)")
+            props = features[0]['properties']
+            if zone_type not in zone_styles and props.get('COLOR'):
+                zone_styles[zone_type] = {'color': props['COLOR'], 'icon': props.get('ICON', default_style['icon']),
+                                          'severity': props.get('SEVERITY', default_style['severity']),
+                                          'border': props.get('BORDER', default_style['border'])}
+        
+        # 구역별 레이어 그룹 생성 (팝업/피처는 내용 해시로 캐시된 조각을 재사용)
+        cache = FragmentCache.for_output(map_fragment_cache_dir, output_filename) if map_fragment_cache_dir else None
+        layers = []
+        group_names = {}
+        layer_colors = {}
+        initial_types = [zone_type for zone_type in zone_groups
+                         if zone_styles.get(zone_type, default_style)['severity'] in map_initial_severities]
+        for zone_type, features in zone_groups.items():
+            layer_group = folium.FeatureGroup(name=f"{zone_type} ({len(features)}개)",
+                                              show=zone_type in initial_types)
             
             style = zone_styles.get(zone_type, default_style)
             
+            items = []
             for feature in features:
-                # 팝업 내용 생성
                 props = feature['properties']
-                popup_content = f"""
-                <div style="width: 300px; font-family: 'Malgun Gothic', Arial, sans-serif; line-height: 1.4;">
-                    <div style="background: linear-gradient(135deg, {style['color']} 0%, #2c3e50 100%); 
-                                color: white; padding: 12px; margin: -10px -10px 12px -10px; border-radius: 8px 8px 0 0;">
-                        <h4 style="margin: 0; font-size: 16px; display: flex; align-items: center;">
-                            <span style="font-size: 20px; margin-right: 8px;">{style['icon']}</span>
-                            {zone_type}
-                        </h4>
-                        <div style="font-size: 12px; opacity: 0.9; margin-top: 4px;">
-                            비행 제한 구역 | 위험도: <span style="font-weight: bold;">{style['severity'].upper()}</span>
-                        </div>
-                    </div>
-                    
-                    <div style="background-color: #f8f9fa; padding: 10px; border-radius: 4px; margin-bottom: 10px;">
-                        <strong>📍 구역 정보</strong>
-                        <div style="font-size: 13px; margin-top: 4px; color: #495057;">
-                            구역명: {props.get('ZONE_NAME', 'N/A')}<br>
-                            고도: {props.get('ALTITUDE', 'N/A')}<br>
-                            운영시간: {props.get('OPERATION_TIME', 'N/A')}
-                        </div>
-                    </div>
-                    
-                    <div style="margin-bottom: 10px; background-color: #fff3cd; padding: 8px; border-radius: 4px; border-left: 4px solid {style['color']};">
-                        <strong>⚠️ 제한 사항</strong>
-                        <div style="font-size: 13px; margin-top: 4px; color: #333;">
-                            {props.get('RESTRICTION', '해당 구역에서의 비행이 제한됩니다.')}
-                        </div>
-                    </div>
-                    
-                    <div style="font-size: 11px; color: #6c757d; text-align: right; margin-top: 8px; border-top: 1px solid #dee2e6; padding-top: 8px;">
-                        VWorld 데이터 기반
-                    </div>
-                </div>
-                """
-                
-                # GeoJSON을 지도에 추가
-                folium.GeoJson(
-                    feature,
-                    style_function=lambda x, color=style['color']: {
-                        'fillColor': color,
-                        'color': color,
-                        'weight': 3,
-                        'fillOpacity': 0.3,
-                        'opacity': 0.8
-                    },
-                    popup=folium.Popup(popup_content, max_width=320),
-                    tooltip=f"{zone_type}: {props.get('ZONE_NAME', 'N/A')}"
-                ).add_to(layer_group)
+                key = content_hash([FRAGMENT_VERSION, zone_type, style, feature])
+                render = lambda: render_feature_fragment(
+                    feature, render_zone_popup(zone_type, style, props),
+                    f"{zone_type}: {props.get('ZONE_NAME', 'N/A')}")
+                items.append((key, cache.fragment(key, render) if cache else render()))
             
-            layer_groups[zone_type] = layer_group
+            layers.append((zone_type, items))
+            group_names[zone_type] = layer_group.get_name()
+            layer_colors[zone_type] = style['color']
             layer_group.add_to(m)
         
+        # 레이어 데이터: 유형별 압축 파일로 분리해 켤 때 불러옴 (바뀐 레이어 파일만 다시 씀)
+        # 시작할 때는 기본 표시 위험도의 유형만 불러오므로 초기 로딩이 보이는 데이터 양에 비례
+        layer_sources = None
+        if map_lazy_layers:
+            layer_sources = dict(write_layer_files(layers, output_filename, cache))
+        else:
+            for zone_type, items in layers:
+                script = layer_script(zone_type, [text for _, text in items]).replace('</', '<\\/')
+                m.get_root().header.add_child(folium.Element(f'<script>{script}</script>'))
+        m.add_child(ZoneLayerLoader(layer_loader_script(group_names, layer_colors, layer_sources, initial_types)))
+        
+        # 클릭 지점 질의용 공간 인덱스 (겹친 구역도 클릭 한 번에 모두 나열, 폴리곤 히트 테스트 없이 격자로 조회)
+        click_index = None
+        if map_click_index:
+            click_index = build_click_index(zone_groups, {zone_type: zone_styles.get(zone_type, default_style)['severity']
+                                                          for zone_type in zone_groups},
+                                            tolerance_m=click_index_tolerance_m)
+        if click_index is not None:
+            script = data_script('zoneClickIndex', click_index).replace('</', '<\\/')
+            m.get_root().header.add_child(folium.Element(f'<script>{script}</script>'))
+            m.add_child(ZoneLayerLoader(click_index_script(m.get_name())))
+            print(f"🖱️  클릭 인덱스: 구역 {len(click_index['zones'])}개, "
+                  f"격자 {click_index['size'][0]}×{click_index['size'][1]}")
+        
+        # 위험도 래스터 히트맵 (레이어 컨트롤에서 켜고 끔)
+        if severity_raster is not None:
+            heatmap_image, heatmap_bounds = severity_raster.heatmap()
+            folium.raster_layers.ImageOverlay(
+                image=heatmap_image,
+                bounds=heatmap_bounds,
+                name=f"위험도 히트맵 ({severity_raster.meta['resolution_m']:g} m)",
+                opacity=0.7,
+                mercator_project=True,
+                show=False
+            ).add_to(m)
+        
         # 추가 API 기반 구역 유형 정의
         additional_zone_types = {
             'P-73A(김포)': {
@@ -562,65 +914,27 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
             }
         }
         
-        # 범례 HTML 생성 (수정된 버전)
+        # 범례 HTML 생성 (스타일은 공유 CSS 자산의 클래스, 유형별 색상만 style 속성)
         legend_html = f'''
-        <div id="legend-container" style="
-            position: fixed; 
-            top: 20px; 
-            left: 20px; 
-            width: 380px; 
-            background: rgba(255, 255, 255, 0.95); 
-            border: 2px solid #34495e; 
-            border-radius: 12px; 
-            padding: 20px; 
-            z-index: 9999; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-            backdrop-filter: blur(10px);
-            font-family: 'Malgun Gothic', Arial, sans-serif;
-            max-height: 80vh;
-            overflow-y: auto;
-            display: none;">
-            
-            <div style="text-align: center; margin-bottom: 20px; border-bottom: 2px solid #ecf0f1; padding-bottom: 15px;">
-                <h3 style="margin: 0; color: #2c3e50; font-size: 18px; font-weight: bold;">
-                    🗺️ 비행 제한 구역 범례
-                </h3>
-                <p style="margin: 5px 0 0 0; font-size: 12px; color: #7f8c8d;">
-                    구역을 선택하여 지도에서 표시/숨김
-                </p>
+        <div id="legend-container">
+            <div class="legend-header">
+                <h3>🗺️ 비행 제한 구역 범례</h3>
+                <p>구역을 선택하여 지도에서 표시/숨김</p>
             </div>
             
             <!-- 전체 제어 버튼 -->
-            <div style="margin-bottom: 20px; text-align: center;">
-                <button onclick="toggleAllZones(true)" 
-                        style="background: linear-gradient(135deg, #27ae60, #2ecc71); 
-                               color: white; border: none; padding: 8px 16px; 
-                               border-radius: 20px; margin: 0 5px; cursor: pointer; 
-                               font-size: 12px; font-weight: bold;
-                               transition: all 0.3s ease;">
-                    전체 표시
-                </button>
-                <button onclick="toggleAllZones(false)" 
-                        style="background: linear-gradient(135deg, #e74c3c, #c0392b); 
-                               color: white; border: none; padding: 8px 16px; 
-                               border-radius: 20px; margin: 0 5px; cursor: pointer; 
-                               font-size: 12px; font-weight: bold;
-                               transition: all 0.3s ease;">
-                    전체 숨김
-                </button>
+            <div class="legend-controls">
+                <button class="legend-button legend-button-show" onclick="toggleAllZones(true)">전체 표시</button>
+                <button class="legend-button legend-button-hide" onclick="toggleAllZones(false)">전체 숨김</button>
             </div>
             
             <!-- 실제 데이터 구역 -->
-            <div style="background: linear-gradient(135deg, #3498db, #2980b9); 
-                        color: white; padding: 12px; margin-bottom: 15px; 
-                        border-radius: 8px; text-align: center;">
-                <h4 style="margin: 0; font-size: 14px;">📊 실제 데이터 구역</h4>
-                <div style="font-size: 11px; opacity: 0.9; margin-top: 4px;">
-                    VWorld에서 수집된 실제 비행 제한 구역 데이터
-                </div>
+            <div class="legend-section">
+                <h4>📊 실제 데이터 구역</h4>
+                <div>VWorld에서 수집된 실제 비행 제한 구역 데이터</div>
             </div>
             
-            <div style="margin-bottom: 20px;">
+            <div class="legend-group">
         '''
         
         # 실제 데이터 구역 체크박스 추가
@@ -629,25 +943,16 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
             safe_id = zone_type.replace("[^a-zA-Z0-9]/g", '_')
             
             legend_html += f'''
-                <div style="display: flex; align-items: center; margin-bottom: 12px; 
-                            padding: 8px; border-radius: 6px; 
-                            background: rgba({style['color'][1:3]}, {style['color'][3:5]}, {style['color'][5:7]}, 0.1);
-                            border-left: 4px solid {style['color']};">
-                    <input type="checkbox" 
-                           id="toggle_{safe_id}" 
-                           class="zone-toggle"
+                <div class="legend-row" style="border-left-color: {style['color']};
+                            background: rgba({style['color'][1:3]}, {style['color'][3:5]}, {style['color'][5:7]}, 0.1);">
+                    <input type="checkbox" id="toggle_{safe_id}" class="zone-toggle"
                            onchange="toggleZoneType('{zone_type}')"
-                           checked
-                           style="margin-right: 10px; transform: scale(1.2); cursor: pointer;">
-                    <div style="display: flex; align-items: center; flex: 1;">
-                        <span style="font-size: 16px; margin-right: 8px;">{style['icon']}</span>
+                           {'checked' if zone_type in initial_types else ''}>
+                    <div class="legend-label">
+                        <span class="legend-icon">{style['icon']}</span>
                         <div>
-                            <div style="font-weight: bold; color: #2c3e50; font-size: 13px;">
-                                {zone_type}
-                            </div>
-                            <div style="font-size: 11px; color: #7f8c8d;">
-                                {type_counts[zone_type]}개 구역 | 위험도: {style['severity'].upper()}
-                            </div>
+                            <div class="legend-name">{zone_type}</div>
+                            <div class="legend-meta">{type_counts[zone_type]}개 구역 | 위험도: {style['severity'].upper()}</div>
                         </div>
                     </div>
                 </div>
@@ -658,13 +963,9 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
             </div>
             
             <!-- API 기반 시뮬레이션 구역 -->
-            <div style="background: linear-gradient(135deg, #e67e22, #d35400); 
-                        color: white; padding: 12px; margin-bottom: 15px; 
-                        border-radius: 8px; text-align: center;">
-                <h4 style="margin: 0; font-size: 14px;">🔬 시뮬레이션 구역</h4>
-                <div style="font-size: 11px; opacity: 0.9; margin-top: 4px;">
-                    VWorld API 파라미터 기반 시뮬레이션 구역
-                </div>
+            <div class="legend-section legend-section-api">
+                <h4>🔬 시뮬레이션 구역</h4>
+                <div>VWorld API 파라미터 기반 시뮬레이션 구역</div>
             </div>
             
             <div>
@@ -675,24 +976,14 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
             safe_id = zone_type.replace("[^a-zA-Z0-9]", '_')
             
             legend_html += f'''
-                <div style="display: flex; align-items: center; margin-bottom: 12px; 
-                            padding: 8px; border-radius: 6px; 
-                            background: rgba(230, 126, 34, 0.1);
-                            border-left: 4px solid {style['color']};">
-                    <input type="checkbox" 
-                           id="toggle_api_{safe_id}" 
-                           class="api-zone-toggle"
-                           onchange="toggleAPIZoneType('{zone_type}')"
-                           style="margin-right: 10px; transform: scale(1.2); cursor: pointer;">
-                    <div style="display: flex; align-items: center; flex: 1;">
-                        <span style="font-size: 16px; margin-right: 8px;">{style['icon']}</span>
+                <div class="legend-row legend-row-api" style="border-left-color: {style['color']};">
+                    <input type="checkbox" id="toggle_api_{safe_id}" class="api-zone-toggle"
+                           onchange="toggleAPIZoneType('{zone_type}')">
+                    <div class="legend-label">
+                        <span class="legend-icon">{style['icon']}</span>
                         <div>
-                            <div style="font-weight: bold; color: #2c3e50; font-size: 13px;">
-                                {zone_type}
-                            </div>
-                            <div style="font-size: 11px; color: #7f8c8d;">
-                                시뮬레이션 | 위험도: {style['severity'].upper()}
-                            </div>
+                            <div class="legend-name">{zone_type}</div>
+                            <div class="legend-meta">시뮬레이션 | 위험도: {style['severity'].upper()}</div>
                         </div>
                     </div>
                 </div>
@@ -702,411 +993,38 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
             </div>
             
             <!-- 상태 표시 영역 -->
-            <div id="toggle-status" 
-                 style="display: none; 
-                        position: fixed; 
-                        top: 50%; 
-                        left: 50%; 
-                        transform: translate(-50%, -50%); 
-                        background: #3498db; 
-                        color: white; 
-                        padding: 12px 24px; 
-                        border-radius: 25px; 
-                        font-weight: bold; 
-                        z-index: 10000; 
-                        box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-                        transition: all 0.3s ease;">
-            </div>
+            <div id="toggle-status"></div>
         </div>
         '''
         
-        # 수정된 JavaScript 코드
-        javascript_code = f'''
-        <script>
-        // 전역 변수
-        var mapInstance = null;
-        var mapLayers = {{}};
-        var apiZoneLayers = {{}};
-        var zoneTypes = {list(type_counts.keys())};
-        var additionalZoneTypes = {list(additional_zone_types.keys())};
-        
-        // DOM이 완전히 로드된 후 초기화
-        document.addEventListener('DOMContentLoaded', function() {{
-            console.log('DOM 로드 완료, 지도 초기화 시작');
-            setTimeout(initializeMapControl, 1000);
-        }});
-        
-        // 지도 인스턴스가 준비될 때까지 대기
-        function waitForMap() {{
-            return new Promise((resolve) => {{
-                function checkMap() {{
-                    if (window[Object.keys(window).find(key => key.startsWith('map_'))] !== undefined) {{
-                        mapInstance = window[Object.keys(window).find(key => key.startsWith('map_'))];
-                        resolve(mapInstance);
-                    }} else {{
-                        setTimeout(checkMap, 100);
-                    }}
-                }}
-                checkMap();
-            }});
-        }}
-        
-        async function initializeMapControl() {{
-            try {{
-                console.log('지도 컨트롤 초기화 중...');
-                
-                // 지도 인스턴스 대기
-                await waitForMap();
-                console.log('지도 인스턴스 확인됨:', mapInstance);
-                
-                // 기존 레이어 매핑
-                mapInstance.eachLayer(function(layer) {{
-                    if (layer.feature && layer.feature.properties) {{
-                        var zoneType = layer.feature.properties.ZONE_TYPE;
-                        if (zoneType && zoneTypes.includes(zoneType)) {{
-                            if (!mapLayers[zoneType]) {{
-                                mapLayers[zoneType] = L.featureGroup();
-                                mapLayers[zoneType].addTo(mapInstance);
-                            }}
-                            mapLayers[zoneType].addLayer(layer);
-                            console.log('레이어 매핑:', zoneType);
-                        }}
-                    }}
-                }});
-                
-                console.log('레이어 매핑 완료:', Object.keys(mapLayers));
-                
-                // API 기반 구역 레이어 초기화
-                initializeAPIZoneLayers();
-                
-                // 범례 표시
-                showLegend();
-                
-            }} catch (error) {{
-                console.error('지도 컨트롤 초기화 오류:', error);
-                setTimeout(initializeMapControl, 2000);
-            }}
-        }}
-        
-        function initializeAPIZoneLayers() {{
-            console.log('API 구역 레이어 초기화 중...');
-            var apiZoneData = {json.dumps(additional_zone_types, ensure_ascii=False)};
-            
-            for (var zoneType in apiZoneData) {{
-                var zoneInfo = apiZoneData[zoneType];
-                var layerGroup = L.featureGroup();
-                
-                createSampleAPIZone(layerGroup, zoneType, zoneInfo);
-                apiZoneLayers[zoneType] = layerGroup;
-                console.log('API 구역 레이어 생성:', zoneType);
-            }}
-        }}
-        
-        function createSampleAPIZone(layerGroup, zoneType, zoneInfo) {{
-            var baseCoords = getBaseCoordinates(zoneType);
-            var lat = baseCoords.lat;
-            var lng = baseCoords.lng;
-            
-            // 마커 생성
-            var iconHtml = `
-                <div style="display: flex; justify-content: center; align-items: center; 
-                            width: 30px; height: 30px; 
-                            background-color: white; 
-                            border: ${{zoneInfo.border}}; 
-                            border-radius: 50%; 
-                            box-shadow: 0 3px 6px rgba(0,0,0,0.2); 
-                            font-size: 15px;">
-                    ${{zoneInfo.icon}}
-                </div>
-            `;
-            
-            var marker = L.marker([lat, lng], {{
-                icon: L.divIcon({{
-                    html: iconHtml,
-                    iconSize: [30, 30],
-                    iconAnchor: [15, 15],
-                    className: 'custom-api-marker'
-                }})
-            }});
-            
-            var popupContent = `
-                <div style="width: 300px; font-family: 'Malgun Gothic', Arial, sans-serif;">
-                    <h4>${{zoneType}} (시뮬레이션)</h4>
-                    <p>위치: ${{lat.toFixed(6)}}, ${{lng.toFixed(6)}}</p>
-                    <p>제한 이유: ${{zoneInfo.reason}}</p>
-                </div>
-            `;
-            
-            marker.bindPopup(popupContent);
-            marker.addTo(layerGroup);
-            
-            // 원형 영역
-            var circle = L.circle([lat, lng], {{
-                color: zoneInfo.color,
-                fillColor: zoneInfo.color,
-                fillOpacity: 0.2,
-                opacity: 0.6,
-                radius: 2000,
-                weight: 3
-            }});
-            
-            circle.bindPopup(popupContent);
-            circle.addTo(layerGroup);
-        }}
-        
-        function getBaseCoordinates(zoneType) {{
-            var coordinates = {{
-                'P-73A(김포)': {{lat: 37.5583, lng: 126.7906}},
-                'P-73B(인천)': {{lat: 37.4602, lng: 126.4407}},
-                'R-75(수원)': {{lat: 37.2636, lng: 127.0286}},
-                'CTR(관제권)': {{lat: 37.5665, lng: 126.9780}}
-            }};
-            
-            return coordinates[zoneType] || {{lat: 37.5665, lng: 126.9780}};
-        }}
-        
-        // 수정된 토글 함수들
-        function toggleZoneType(zoneType) {{
-            try {{
-                console.log('구역 토글 시도:', zoneType);
-                var checkboxId = 'toggle_' + zoneType.replace("[^a-zA-Z0-9]", '_');
-                var checkbox = document.getElementById(checkboxId);
-                
-                if (!checkbox) {{
-                    console.error('체크박스를 찾을 수 없습니다:', checkboxId);
-                    return;
-                }}
-                
-                var layer = mapLayers[zoneType];
-                if (layer && mapInstance) {{
-                    if (checkbox.checked) {{
-                        if (!mapInstance.hasLayer(layer)) {{
-                            mapInstance.addLayer(layer);
-                        }}
-                        console.log('레이어 표시:', zoneType);
-                        showStatus(zoneType + ' 표시됨', '#27ae60');
-                    }} else {{
-                        if (mapInstance.hasLayer(layer)) {{
-                            mapInstance.removeLayer(layer);
-                        }}
-                        console.log('레이어 숨김:', zoneType);
-                        showStatus(zoneType + ' 숨김', '#e74c3c');
-                    }}
-                }} else {{
-                    console.error('레이어 또는 지도를 찾을 수 없습니다:', zoneType);
-                }}
-                
-            }} catch (error) {{
-                console.error('구역 토글 오류:', error);
-            }}
-        }}
-        
-        function toggleAPIZoneType(zoneType) {{
-            try {{
-                console.log('API 구역 토글 시도:', zoneType);
-                var checkboxId = 'toggle_api_' + zoneType.replace("[^a-zA-Z0-9]", '_');
-                var checkbox = document.getElementById(checkboxId);
-                
-                if (!checkbox) {{
-                    console.error('API 구역 체크박스를 찾을 수 없습니다:', checkboxId);
-                    return;
-                }}
-                
-                var layer = apiZoneLayers[zoneType];
-                if (layer && mapInstance) {{
-                    if (checkbox.checked) {{
-                        if (!mapInstance.hasLayer(layer)) {{
-                            mapInstance.addLayer(layer);
-                        }}
-                        console.log('API 구역 레이어 표시:', zoneType);
-                        showStatus(zoneType + ' 시뮬레이션 표시됨', '#e67e22');
-                    }} else {{
-                        if (mapInstance.hasLayer(layer)) {{
-                            mapInstance.removeLayer(layer);
-                        }}
-                        console.log('API 구역 레이어 숨김:', zoneType);
-                        showStatus(zoneType + ' 시뮬레이션 숨김', '#95a5a6');
-                    }}
-                }} else {{
-                    console.error('API 구역 레이어를 찾을 수 없습니다:', zoneType);
-                }}
-                
-            }} catch (error) {{
-                console.error('API 구역 토글 오류:', error);
-            }}
-        }}
-        
-        function toggleAllZones(show) {{
-            try {{
-                console.log('전체 토글:', show);
-                
-                // 실제 데이터 구역
-                zoneTypes.forEach(function(zoneType) {{
-                    var checkboxId = 'toggle_' + zoneType.replace("[^a-zA-Z0-9]", '_');
-                    var checkbox = document.getElementById(checkboxId);
-                    
-                    if (checkbox) {{
-                        checkbox.checked = show;
-                        var layer = mapLayers[zoneType];
-                        if (layer && mapInstance) {{
-                            if (show) {{
-                                if (!mapInstance.hasLayer(layer)) {{
-                                    mapInstance.addLayer(layer);
-                                }}
-                            }} else {{
-                                if (mapInstance.hasLayer(layer)) {{
-                                    mapInstance.removeLayer(layer);
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-                
-                // API 기반 구역
-                additionalZoneTypes.forEach(function(zoneType) {{
-                    var checkboxId = 'toggle_api_' + zoneType.replace("[^a-zA-Z0-9]", '_');
-                    var checkbox = document.getElementById(checkboxId);
-                    
-                    if (checkbox) {{
-                        checkbox.checked = show;
-                        var layer = apiZoneLayers[zoneType];
-                        if (layer && mapInstance) {{
-                            if (show) {{
-                                if (!mapInstance.hasLayer(layer)) {{
-                                    mapInstance.addLayer(layer);
-                                }}
-                            }} else {{
-                                if (mapInstance.hasLayer(layer)) {{
-                                    mapInstance.removeLayer(layer);
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-                
-                var message = show ? '모든 구역이 표시됩니다' : '모든 구역이 숨겨졌습니다';
-                var color = show ? '#27ae60' : '#95a5a6';
-                showStatus(message, color);
-                
-            }} catch (error) {{
-                console.error('전체 토글 오류:', error);
-            }}
-        }}
-        
-        function showStatus(message, color = '#3498db') {{
-            var statusDiv = document.getElementById('toggle-status');
-            if (statusDiv) {{
-                statusDiv.textContent = message;
-                statusDiv.style.background = color;
-                statusDiv.style.display = 'block';
-                statusDiv.style.opacity = '1';
-                
-                setTimeout(function() {{
-                    statusDiv.style.opacity = '0';
-                    setTimeout(function() {{
-                        statusDiv.style.display = 'none';
-                    }}, 300);
-                }}, 2500);
-            }}
-        }}
-        
-        function showLegend() {{
-            var legend = document.getElementById('legend-container');
-            if (legend) {{
-                legend.style.display = 'block';
-                legend.style.animation = 'fadeIn 0.3s ease';
-            }}
-        }}
-        
-        function toggleLegend() {{
-            var legend = document.getElementById('legend-container');
-            if (legend) {{
-                if (legend.style.display === 'none' || legend.style.display === '') {{
-                    legend.style.display = 'block';
-                    legend.style.animation = 'fadeIn 0.3s ease';
-                }} else {{
-                    legend.style.display = 'none';
-                }}
-            }}
-        }}
-        
-        // 범례 토글 버튼 추가 (키보드 단축키)
-        document.addEventListener('keydown', function(event) {{
-            if (event.key === 'L' || event.key === 'l') {{
-                toggleLegend();
-            }}
-        }});
-        
-        // CSS 애니메이션 추가
-        var style = document.createElement('style');
-        style.textContent = `
-            @keyframes fadeIn {{
-                from {{ opacity: 0; transform: translateY(-20px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            
-            
-            .zone-toggle:hover, .api-zone-toggle:hover {{
-                transform: scale(1.3) !important;
-                transition: transform 0.2s ease;
-            }}
-            
-            button:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-            }}
-            
-            #legend-container::-webkit-scrollbar {{
-                width: 8px;
-            }}
-            
-            #legend-container::-webkit-scrollbar-track {{
-                background: #f1f1f1;
-                border-radius: 4px;
-            }}
-            
-            #legend-container::-webkit-scrollbar-thumb {{
-                background: #888;
-                border-radius: 4px;
-            }}
-            
-            #legend-container::-webkit-scrollbar-thumb:hover {{
-                background: #555;
-            }}
-        `;
-        document.head.appendChild(style);
-        
-        </script>
+        # 범례 토글 버튼
+        legend_html += '''
+        <div class="legend-toggle">
+            <button onclick="toggleLegend()">📋 범례 (L)</button>
+        </div>
         '''
         
-        # 범례와 JavaScript를 지도에 추가
+        # 범례 CSS, 토글 스크립트, 시뮬레이션 구역 정의는 모든 지도가 같으므로 공유 정적 자산으로 분리
+        # (map_static_dir가 없으면 축소한 내용을 HTML에 포함), 지도마다 다른 값만 인라인 설정으로 넣음
+        asset_head, asset_body = map_asset_tags(output_filename, additional_zone_types,
+                                                static_dir=map_static_dir, gzip_output=map_gzip_output)
+        map_config = data_script('zoneMapConfig', {'zoneTypes': list(type_counts.keys())})
+        m.get_root().header.add_child(folium.Element(asset_head))
         m.get_root().html.add_child(folium.Element(legend_html))
-        m.get_root().html.add_child(folium.Element(javascript_code))
+        m.get_root().html.add_child(folium.Element(f"<script>{map_config}</script>{asset_body}"))
         
         # 레이어 컨트롤 추가
         folium.LayerControl(position='topright').add_to(m)
         
-        # 범례 토글 버튼 추가
-        toggle_button_html = '''
-        <div style="position: fixed; top: 20px; right: 20px; z-index: 9998;">
-            <button onclick="toggleLegend()" 
-                    style="background: linear-gradient(135deg, #3498db, #2980b9); 
-                           color: white; border: none; padding: 12px 16px; 
-                           border-radius: 25px; cursor: pointer; 
-                           font-weight: bold; font-size: 14px;
-                           box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-                           transition: all 0.3s ease;"
-                    onmouseover="this.style.transform='translateY(-2px)'"
-                    onmouseout="this.style.transform='translateY(0)'">
-                📋 범례 (L)
-            </button>
-        </div>
-        '''
-        
-        m.get_root().html.add_child(folium.Element(toggle_button_html))
-        
         # 지도 저장
         m.save(output_filename)
+        if map_gzip_output:
+            raw_bytes, gzip_bytes = write_gzip_copy(output_filename)
+            print(f"🗜️  압축 사본: {output_filename}.gz ({raw_bytes / 1024:.0f} KB → {gzip_bytes / 1024:.0f} KB)")
+        if cache is not None:
+            cache.save()
+            print(f"🧩 렌더링 조각: 재사용 {cache.stats['hit']}개, 새로 생성 {cache.stats['rendered']}개 "
+                  f"(레이어 파일 기록 {cache.stats['layers_written']}개, 유지 {cache.stats['layers_skipped']}개)")
         
         # 통계 정보 출력
         print("\n" + "="*60)
@@ -1128,7 +1046,7 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
         print("  • 범례에서 체크박스를 클릭하여 구역 표시/숨김")
         print("  • '전체 표시/숨김' 버튼으로 일괄 제어")
         print("  • 'L' 키를 눌러 범례 토글")
-        print("  • 구역을 클릭하면 상세 정보 팝업")
+        print("  • 지도를 클릭하면 그 지점에 적용되는 모든 구역 목록 (이름을 누르면 상세 정보 팝업)")
         print("  • 우측 상단에서 지도 레이어 변경 가능")
         print("="*60)
         
@@ -1142,16 +1060,21 @@ def create_classified_vworld_map(geojson_data, output_filename='classified_fligh
 
 
 
-def save_classified_data(zones):
-    """분류된 데이터를 JSON 파일로 저장"""
+def save_classified_data(zones, district_coverage=None, output_dir='result_data'):
+    """분류된 데이터를 JSON 파일로 저장 (district_coverage가 있으면 면적 기준 지역 통계 사용)"""
     
     try:
         # 구역 유형별 통계
         type_stats = {}
         severity_stats = {'high': 0, 'medium': 0, 'low': 0}
         district_stats = {}
+        enrichment_stats = {}
         
         for zone in zones:
+            # 주소 보강 상태별 통계
+            status = zone.get('enrichment_status', STATUS_SKIPPED)
+            enrichment_stats[status] = enrichment_stats.get(status, 0) + 1
+            
             # 유형별 통계
             zone_type = zone['restriction_info']['type']
             if zone_type not in type_stats:
@@ -1179,6 +1102,10 @@ def save_classified_data(zones):
                     district_stats[district]['types'][zone_type] = 0
                 district_stats[district]['types'][zone_type] += 1
         
+        # 행정구역 오버레이 결과가 있으면 중심점 대신 실제 걸치는 면적 기준으로 대체
+        if district_coverage is not None:
+            district_stats = district_coverage
+        
         summary = {
             'metadata': {
                 'total_zones': len(zones),
@@ -1189,22 +1116,28 @@ def save_classified_data(zones):
             'statistics': {
                 'by_type': {zone_type: len(zones_list) for zone_type, zones_list in type_stats.items()},
                 'by_severity': severity_stats,
-                'by_district': district_stats
+                'by_district': district_stats,
+                'by_enrichment_status': enrichment_stats
             },
             'zones_by_type': type_stats,
             'detailed_zones': zones
         }
         
         # 결과 디렉토리 생성
-        os.makedirs('result_data', exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
         
         # JSON 저장
-        filename = 'result_data/classified_flight_restriction_zones.json'
+        filename = os.path.join(output_dir, 'classified_flight_restriction_zones.json')
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(summary, f, ensure_ascii=False, indent=2)
         
         print(f"✅ 분류된 데이터가 '{filename}' 파일로 저장되었습니다.")
         
+        # 공유 경계를 한 번만 저장하는 압축 스냅샷 (TopoJSON)
+        if topojson_quantization:
+            save_topojson(zones, os.path.join(output_dir, 'classified_flight_restriction_zones.topo.json'),
+                          quantization=topojson_quantization)
+        
         # 통계 요약 출력
         print(f"\n📊 비행 제한 구역 분석 결과:")
         print(f"   총 구역 수: {len(zones)}개")
@@ -1222,7 +1155,11 @@ def save_classified_data(zones):
             print(f"\n🌍 지역별 분포 (상위 5개):")
             sorted_districts = sorted(district_stats.items(), key=lambda x: x[1]['total'], reverse=True)[:5]
             for district, stats in sorted_districts:
-                print(f"   {district}: {stats['total']}개")
+                if 'restricted_area_km2' in stats:
+                    print(f"   {district}: {stats['total']}개, "
+                          f"{stats['restricted_area_km2']:.2f}km² ({stats['coverage_pct']:.1f}%)")
+                else:
+                    print(f"   {district}: {stats['total']}개")
                 for zone_type, count in stats['types'].items():
                     print(f"     - {zone_type}: {count}개")
         
@@ -1232,10 +1169,14 @@ def save_classified_data(zones):
         print(f"❌ 분류된 데이터 저장 오류: {e}")
         return None
 
-def create_summary_report(zones):
-    """분석 결과 요약 리포트 생성"""
+def create_summary_report(zones, district_coverage=None, output_dir='result_data', scope='서울시 일대', as_of=None):
+    """분석 결과 요약 리포트 생성 (district_coverage가 있으면 지역별 면적 분석 포함, as_of 시각 기준 유효 구역만 집계)"""
     
     try:
+        as_of_ts = parse_timestamp(as_of)
+        if as_of_ts is not None:
+            zones = filter_active_zones(zones, as_of_ts)
+        
         report_content = f"""
 # 비행 제한 구역 분석 리포트
 
@@ -1243,7 +1184,8 @@ def create_summary_report(zones):
 - **분석 일시**: {time.strftime('%Y년 %m월 %d일 %H시 %M분')}
 - **데이터 출처**: 국토교통부 VWorld API (LT_C_AISPRHC)
 - **총 구역 수**: {len(zones)}개
-- **분석 범위**: 서울시 일대
+- **분석 범위**: {scope}
+- **기준 시각**: {format_timestamp(as_of_ts) if as_of_ts is not None else '조회 시점 전체 구역'}
 
 ## 🏷️ 구역 유형별 분석
 
@@ -1295,7 +1237,25 @@ def create_summary_report(zones):
                     district_stats[district] = []
                 district_stats[district].append(zone)
         
-        if district_stats:
+        if district_coverage:
+            report_content += "\n## 🌍 지역별 분포 (면적 기준)\n\n"
+            report_content += "구역 폴리곤과 행정구역 경계를 교차하여 계산한 면적입니다. 겹치는 구역은 한 번만 계산합니다 (제한 면적은 구역들의 합집합 면적).\n\n"
+            
+            for district, stats in district_coverage.items():
+                report_content += f"### {district}\n"
+                report_content += f"- **걸친 구역 수**: {stats['total']}개\n"
+                report_content += f"- **제한 면적**: {stats['restricted_area_km2']:.2f}km² / {stats['district_area_km2']:.2f}km² ({stats['coverage_pct']:.1f}%)\n"
+                
+                report_content += "- **유형별 면적** (유형끼리 겹칠 수 있어 합이 제한 면적보다 클 수 있음):\n"
+                for zone_type, type_stats_item in stats['by_type'].items():
+                    report_content += f"  - {zone_type}: {type_stats_item['area_km2']:.2f}km² ({type_stats_item['pct']:.1f}%)\n"
+                
+                report_content += "- **위험도별 면적**:\n"
+                for severity, severity_item in stats['by_severity'].items():
+                    report_content += f"  - {severity}: {severity_item['area_km2']:.2f}km² ({severity_item['pct']:.1f}%)\n"
+                
+                report_content += "\n"
+        elif district_stats:
             report_content += "\n## 🌍 지역별 분포\n\n"
             sorted_districts = sorted(district_stats.items(), key=lambda x: len(x[1]), reverse=True)
             
@@ -1355,7 +1315,7 @@ def create_summary_report(zones):
 """
         
         # 리포트 저장
-        report_filename = 'result_data/flight_restriction_analysis_report.md'
+        report_filename = os.path.join(output_dir, 'flight_restriction_analysis_report.md')
         with open(report_filename, 'w', encoding='utf-8') as f:
             f.write(report_content)
         
@@ -1367,25 +1327,311 @@ def create_summary_report(zones):
         print(f"❌ 리포트 생성 오류: {e}")
         return None
 
-def main():
+# 지역 배치 작업 프로세스에서 면적 오버레이에 사용할 행정구역 경계
+_region_boundaries = None
+
+def init_region_worker(options):
+    """지역 배치 작업 프로세스 초기화 (응답 캐시와 행정구역 경계를 프로세스마다 준비)"""
+    global response_cache, boundary_lookup, _region_boundaries, map_fragment_cache_dir, topojson_quantization
+    global checkpoint_dir, resume_run, http_client, sqlite_export_enabled, dedup_grid_deg, safety_margin_m
+    global map_lazy_layers, map_initial_severities, enrichment_deadline, map_static_dir, map_gzip_output
+    global map_click_index, click_index_tolerance_m
+    map_fragment_cache_dir = options.get('map_cache_dir')
+    map_click_index = options.get('map_click_index', map_click_index)
+    click_index_tolerance_m = options.get('click_index_tolerance', click_index_tolerance_m)
+    map_static_dir = options.get('map_static_dir', map_static_dir)
+    map_gzip_output = options.get('map_gzip_output', map_gzip_output)
+    map_lazy_layers = options.get('map_lazy_layers', map_lazy_layers)
+    map_initial_severities = options.get('map_initial_severities', map_initial_severities)
+    dedup_grid_deg = options.get('dedup_grid', dedup_grid_deg)
+    safety_margin_m = options.get('safety_margin', safety_margin_m)
+    enrichment_deadline = options.get('enrichment_deadline', enrichment_deadline)
+    sqlite_export_enabled = options.get('sqlite_export', sqlite_export_enabled)
+    if options.get('request_deadline'):
+        http_client = HedgedClient(deadline=options['request_deadline'])
+    checkpoint_dir = options.get('checkpoint_dir')
+    resume_run = options.get('resume', False)
+    topojson_quantization = options.get('topo_quantization', topojson_quantization)
+    if options.get('cache_dir'):
+        response_cache = ResponseCache(options['cache_dir'], max_age=options['cache_max_age'],
+                                       offline=options['offline'])
+    if options.get('boundary_file'):
+        _region_boundaries = AdminBoundaryLookup.load(options['boundary_file'])
+        if not options.get('full_address'):
+            boundary_lookup = _region_boundaries
+
+def process_region(region, options):
+    """지역 하나에 대해 조회·분류·저장·지도·리포트 수행 (배치 작업 프로세스에서 실행)"""
+    started = time.time()
+    output_dir = os.path.join(options['output_dir'], 'regions', region_slug(region['name']))
+    os.makedirs(output_dir, exist_ok=True)
+    params = dict(base_params, geomFilter=region_geom_filter(region))
+    
+    # 프로세스별 출력이 섞이지 않도록 지역별 로그 파일로 기록
+    with open(os.path.join(output_dir, 'run.log'), 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log):
+        zones = fetch_flight_restriction_data(params=params)
+        if zones:
+            district_coverage = None
+            if _region_boundaries is not None:
+                district_coverage = compute_district_coverage(zones, _region_boundaries.index)
+            save_classified_data(zones, district_coverage, output_dir=output_dir)
+            if sqlite_export_enabled:
+                try:
+                    export_zones_sqlite(zones, os.path.join(output_dir, 'classified_flight_restriction_zones.sqlite'))
+                except sqlite3.Error as e:
+                    print(f"❌ SQLite 저장 오류: {e}")
+            create_classified_vworld_map(
+                zones_feature_collection(zones), output_filename=os.path.join(output_dir, 'classified_flight_restriction_zones.html'))
+            create_summary_report(zones, district_coverage, output_dir=output_dir, scope=region['name'])
+    
+    return {'name': region['name'], 'zones': zones, 'output_dir': output_dir,
+            'elapsed': time.time() - started}
+
+def run_national_batch(args, boundaries=None):
+    """여러 지역을 병렬 처리한 뒤 중복을 제거한 전국 요약 생성"""
+    regions = load_regions(args.regions)
+    options = {
+        'cache_dir': args.cache_dir if (args.offline or not args.no_cache) else None,
+        'cache_max_age': args.cache_max_age,
+        'offline': args.offline,
+        'boundary_file': args.boundary_file,
+        'full_address': args.full_address,
+        'map_cache_dir': map_fragment_cache_dir,
+        'map_lazy_layers': map_lazy_layers,
+        'map_initial_severities': map_initial_severities,
+        'map_static_dir': map_static_dir,
+        'map_gzip_output': map_gzip_output,
+        'map_click_index': map_click_index,
+        'click_index_tolerance': click_index_tolerance_m,
+        'topo_quantization': topojson_quantization,
+        'dedup_grid': dedup_grid_deg,
+        'safety_margin': safety_margin_m,
+        'enrichment_deadline': enrichment_deadline,
+        'checkpoint_dir': checkpoint_dir,
+        'resume': resume_run,
+        'sqlite_export': sqlite_export_enabled,
+        'request_deadline': None if args.no_hedge else args.request_deadline,
+        'output_dir': 'result_data'
+    }
+    results = run_region_batch(regions, process_region, options,
+                               max_workers=args.workers, initializer=init_region_worker)
+    
+    zones = merge_region_results(results)
+    fetched = sum(len(r['zones']) for r in results if r.get('zones'))
+    print(f"\n🔗 중복 제거: {fetched}개 → {len(zones)}개 구역")
+    if not zones:
+        print("❌ 분석할 데이터가 없습니다.")
+        return
+    
+    national_dir = os.path.join('result_data', 'national')
+    district_coverage = None
+    if boundaries is not None:
+        district_coverage = compute_district_coverage(zones, boundaries.index)
+    save_classified_data(zones, district_coverage, output_dir=national_dir)
+    if sqlite_export_enabled:
+        try:
+            export_zones_sqlite(zones, os.path.join(national_dir, 'classified_flight_restriction_zones.sqlite'))
+        except sqlite3.Error as e:
+            print(f"❌ SQLite 저장 오류: {e}")
+    create_summary_report(zones, district_coverage, output_dir=national_dir,
+                          scope=f"전국 ({len(regions)}개 지역)")
+    
+    region_summary = [{
+        'name': r['name'],
+        'zones': len(r['zones']) if r.get('zones') else 0,
+        'error': r.get('error'),
+        'output_dir': r.get('output_dir'),
+        'elapsed_sec': round(r.get('elapsed', 0), 2)
+    } for r in results]
+    with open(os.path.join(national_dir, 'regions.json'), 'w', encoding='utf-8') as f:
+        json.dump({'regions': region_summary, 'fetched_zones': fetched, 'unique_zones': len(zones)},
+                  f, ensure_ascii=False, indent=2)
+    print(f"✅ 전국 요약이 '{national_dir}' 디렉토리에 저장되었습니다.")
+
+def prune_map_assets():
+    """정적 자산 디렉토리의 이전 버전 정리 (정적 자산 디렉토리의 상위 디렉토리 아래 지도 HTML이 참조하는 파일은 유지)"""
+    if not map_static_dir:
+        return
+    try:
+        removed = prune_static_assets(map_static_dir, [os.path.dirname(os.path.abspath(map_static_dir))])
+        print(f"🧹 이전 버전 정적 자산 {removed}개 삭제 ({map_static_dir})")
+    except OSError as e:
+        print(f"⚠️  정적 자산 정리 실패: {e}")
+
+def parse_args(argv=None):
+    """명령행 옵션 파싱"""
+    parser = argparse.ArgumentParser(description='비행 제한 구역 분류 및 지도 생성')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='응답 캐시를 사용하지 않고 매번 API 요청')
+    parser.add_argument('--cache-dir', default=os.getenv('VWORLD_CACHE_DIR', 'cache/responses'),
+                        help='응답 캐시 디렉토리 (기본: cache/responses)')
+    parser.add_argument('--cache-max-age', type=int, default=int(os.getenv('VWORLD_CACHE_MAX_AGE', '3600')),
+                        help='캐시 유효 시간(초), 만료 후에는 조건부 요청으로 재검증 (기본: 3600)')
+    parser.add_argument('--offline', action='store_true',
+                        help='네트워크 없이 캐시된 응답만 재생')
+    parser.add_argument('--request-deadline', type=float,
+                        default=float(os.getenv('VWORLD_REQUEST_DEADLINE', '20')),
+                        help='API 호출 하나의 전체 제한 시간(초), 헤지 요청 포함 (기본: 20)')
+    parser.add_argument('--no-hedge', action='store_true',
+                        help='지연 헤지/차단기 없이 requests로 직접 요청')
+    parser.add_argument('--resume', action='store_true',
+                        help='중단된 실행 이어서 처리 (같은 데이터의 진행 기록에 있는 구역은 주소 조회 등을 건너뜀)')
+    parser.add_argument('--checkpoint-dir', default=checkpoint_dir,
+                        help='구역별 진행 기록(JSONL) 디렉토리 (기본: cache/checkpoints, 빈 값이면 기록 안 함)')
+    parser.add_argument('--no-map-cache', action='store_true',
+                        help='지도 팝업/레이어 조각 캐시를 쓰지 않고 매번 전체 렌더링')
+    parser.add_argument('--inline-map-data', action='store_true',
+                        help='지도 레이어 데이터를 유형별 압축 파일로 나누지 않고 HTML 하나에 모두 포함')
+    parser.add_argument('--inline-map-assets', action='store_true',
+                        help='범례 CSS/토글 JS를 공유 정적 자산(result_data/static/, 내용 해시 파일 이름) 대신 '
+                             '지도 HTML마다 포함')
+    parser.add_argument('--prune-map-assets', action='store_true',
+                        help='지도 생성 후 정적 자산 디렉토리에서 현재 버전도 아니고 result_data/ 아래 지도 HTML이 '
+                             '참조하지도 않는 이전 버전 자산 삭제')
+    parser.add_argument('--gzip-output', action='store_true',
+                        help='지도 HTML과 정적 자산 옆에 미리 압축한 .gz 사본도 기록 (gzip_static 등으로 전송)')
+    parser.add_argument('--no-click-index', action='store_true',
+                        help='지도 클릭 지점 질의용 공간 인덱스를 넣지 않음 (구역 폴리곤마다 팝업으로 표시)')
+    parser.add_argument('--click-index-tolerance', type=float, default=click_index_tolerance_m,
+                        help='클릭 인덱스 링 단순화 허용 오차(m) (기본: 5, 0이면 단순화 안 함)')
+    parser.add_argument('--map-initial-severities', default=','.join(map_initial_severities),
+                        help='지도를 열 때 바로 불러와 표시할 위험도 목록 (쉼표 구분, 기본: high, 나머지는 켤 때 불러옴)')
+    parser.add_argument('--topo-quantization', type=int, default=topojson_quantization,
+                        help='TopoJSON 스냅샷 좌표 양자화 눈금 수 (기본: 1000000, 0이면 TopoJSON 저장 안 함)')
+    parser.add_argument('--dedup-grid', type=float, default=dedup_grid_deg,
+                        help='지오메트리 정규화 격자(도), 이 격자에서 같은 모양인 구역은 라벨을 합쳐 하나로 처리 '
+                             '(기본: 1e-7 ≈ 1cm, 0이면 병합 안 함)')
+    parser.add_argument('--safety-margin', type=float, default=safety_margin_m,
+                        help='구역마다 이 거리(m)만큼 넓힌 안전 여유 지오메트리를 결과에 추가 (기본: 0 = 안 함)')
+    parser.add_argument('--time-budget', type=float, default=float(os.getenv('TIME_BUDGET_S', '0')) or None,
+                        help='전체 실행 시간 예산(초, 예: 120), 주소 보강은 저장 여유(ENRICHMENT_RESERVE_S, 기본 15초)를 '
+                             '남기고 위험도 높은 구역부터 조회하며 남은 구역은 캐시/좌표 주소 사용')
+    parser.add_argument('--no-sqlite', action='store_true',
+                        help='분류 결과 SQLite 파일(R*Tree 범위 색인 포함)을 만들지 않음')
+    parser.add_argument('--boundary-file', default=os.getenv('ADMIN_BOUNDARY_FILE'),
+                        help='행정구역 경계 GeoJSON (설정 시 시도/시군구/동을 로컬에서 조회)')
+    parser.add_argument('--full-address', action='store_true',
+                        help='경계 파일이 있어도 주소 API로 전체 주소/우편번호까지 조회')
+    parser.add_argument('--as-of',
+                        help='지도/리포트에 이 시각(ISO 8601, 예: 2025-05-01T09:00)에 유효한 구역만 포함')
+    parser.add_argument('--adhoc-file', default=os.getenv('ADHOC_ZONES_FILE'),
+                        help='운영자 정의 임시 구역 GeoJSON (조회 결과와 같은 규칙으로 분류해 함께 표시/서비스)')
+    parser.add_argument('--raster-resolution', type=float,
+                        default=float(os.getenv('SEVERITY_RASTER_RESOLUTION', '0')) or None,
+                        help='지정 시 이 해상도(m, 예: 10~100)로 위험도 래스터를 만들어 '
+                             'result_data/severity_raster/에 저장하고 지도에 히트맵 추가')
+    parser.add_argument('--audit-telemetry', metavar='FILE',
+                        help='드론 텔레메트리 CSV/Parquet를 조회한 구역으로 일괄 판정해 '
+                             'result_data/telemetry_audit/에 점별 결과와 비행별 위반 요약 저장')
+    parser.add_argument('--plan-route', nargs=2, metavar=('FROM', 'TO'),
+                        help='출발/도착 "경도,위도" 사이의 제한 구역 회피 경로를 계산해 '
+                             'result_data/route.geojson에 저장 (high 통과 불가, medium 우회)')
+    parser.add_argument('--route-resolution', type=float,
+                        default=float(os.getenv('ROUTE_GRID_RESOLUTION', '100')),
+                        help='경로 계획 비용 격자 해상도(m, 기본: 100), 서비스 /route에도 사용')
+    parser.add_argument('--regions',
+                        help='지역 목록 JSON (예: regions_sido.json), 지정 시 지역별 병렬 배치 실행')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='지역 배치 작업 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--geometry-workers', type=int, default=geometry_workers,
+                        help='대량 구역의 분류/중심점/면적 계산 프로세스 수 (공유 메모리 사용, 기본: 0 = 현재 프로세스)')
+    parser.add_argument('--serve', action='store_true',
+                        help='배치 실행 대신 구역 질의 HTTP 서비스로 실행')
+    parser.add_argument('--host', default='127.0.0.1', help='서비스 바인드 주소 (기본: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='서비스 포트 (기본: 8080)')
+    parser.add_argument('--index-file', default='result_data/zone_index.npz',
+                        help='웜 스타트용 인덱스 파일 (기본: result_data/zone_index.npz)')
+    parser.add_argument('--refresh-interval', type=int, default=3600,
+                        help='서비스 데이터 갱신 주기(초) (기본: 3600)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """메인 실행 함수"""
     
+    global response_cache, boundary_lookup, map_fragment_cache_dir, topojson_quantization
+    global checkpoint_dir, resume_run, http_client, geometry_workers, sqlite_export_enabled, dedup_grid_deg
+    global map_lazy_layers, map_initial_severities, safety_margin_m, enrichment_deadline
+    global map_static_dir, map_gzip_output, map_click_index, click_index_tolerance_m
+    run_started = time.time()
+    args = parse_args(argv)
+    if args.inline_map_data:
+        map_lazy_layers = False
+    if args.inline_map_assets:
+        map_static_dir = None
+    if args.gzip_output:
+        map_gzip_output = True
+    if args.no_click_index:
+        map_click_index = False
+    click_index_tolerance_m = args.click_index_tolerance
+    map_initial_severities = [s.strip() for s in args.map_initial_severities.split(',') if s.strip()]
+    dedup_grid_deg = args.dedup_grid
+    safety_margin_m = args.safety_margin
+    if args.time_budget:
+        enrichment_deadline = run_started + max(0.0, args.time_budget - enrichment_reserve_s)
+    if args.no_sqlite:
+        sqlite_export_enabled = False
+    geometry_workers = args.geometry_workers
+    checkpoint_dir = args.checkpoint_dir or None
+    resume_run = args.resume
+    if args.no_map_cache:
+        map_fragment_cache_dir = None
+    topojson_quantization = args.topo_quantization
+    
     print("🚀 비행 제한 구역 분류 및 지도 생성 시작")
     print("=" * 70)
     
-    # 환경 변수 확인
+    # 응답 캐시 설정
+    if args.offline or not args.no_cache:
+        response_cache = ResponseCache(args.cache_dir, max_age=args.cache_max_age, offline=args.offline)
+        mode = "오프라인 재생" if args.offline else f"유효 시간 {args.cache_max_age}초"
+        print(f"✅ 응답 캐시: {args.cache_dir} ({mode})")
+    
+    # 느린 응답은 p95를 넘기면 중복 요청, 실패가 잦으면 차단기로 즉시 대체 처리
+    if not args.no_hedge and not args.offline:
+        http_client = HedgedClient(deadline=args.request_deadline)
+        print(f"✅ 지연 헤지/차단기 사용 (호출당 제한 시간 {args.request_deadline:g}초)")
+    
+    # 로컬 행정구역 경계 (전체 주소/우편번호가 필요하면 주소 조회는 API 사용)
+    boundaries = None
+    if args.boundary_file:
+        started = time.time()
+        boundaries = AdminBoundaryLookup.load(args.boundary_file)
+        print(f"✅ 행정구역 경계: {len(boundaries)}개 ({time.time() - started:.2f}초)")
+        if not args.full_address:
+            boundary_lookup = boundaries
+    
+    # 환경 변수 확인 (오프라인 재생 모드에서는 불필요)
     api_key = os.getenv('VWORLD_API_KEY')
     domain = os.getenv('VWORLD_DOMAIN')
     
-    if not api_key:
-        print("❌ VWORLD_API_KEY가 설정되지 않았습니다.")
-        return
-    if not domain:
-        print("❌ VWORLD_DOMAIN이 설정되지 않았습니다.")
+    if not args.offline:
+        if not api_key:
+            print("❌ VWORLD_API_KEY가 설정되지 않았습니다.")
+            return
+        if not domain:
+            print("❌ VWORLD_DOMAIN이 설정되지 않았습니다.")
+            return
+        
+        print(f"✅ API 키: {api_key[:10]}...")
+        print(f"✅ 도메인: {domain}")
+    
+    # 서비스 모드: 주소 조회 없이 분류된 구역만 메모리 인덱스로 적재
+    if args.serve:
+        adhoc_zones = load_adhoc_zones(args.adhoc_file) if args.adhoc_file else []
+        run_service(lambda: fetch_flight_restriction_data(geocode=False),
+                    host=args.host, port=args.port,
+                    index_path=args.index_file, refresh_interval=args.refresh_interval,
+                    zone_builder=build_adhoc_zone, adhoc_zones=adhoc_zones,
+                    route_resolution_m=args.route_resolution)
         return
     
-    print(f"✅ API 키: {api_key[:10]}...")
-    print(f"✅ 도메인: {domain}")
+    # 지역 배치 모드: 지역별 결과 + 전국 요약
+    if args.regions:
+        run_national_batch(args, boundaries)
+        if args.prune_map_assets:
+            prune_map_assets()
+        return
     
     # 1. 비행 제한 구역 데이터 분석
     zones = fetch_flight_restriction_data()
@@ -1394,17 +1640,77 @@ def main():
         print("❌ 분석할 데이터가 없습니다.")
         return
     
+    # 운영자 정의 임시 구역 추가 (재조회 없이 같은 분류 규칙 적용)
+    if args.adhoc_file:
+        adhoc_zones = load_adhoc_zones(args.adhoc_file)
+        for i, zone in enumerate(adhoc_zones, len(zones) + 1):
+            zone['index'] = i
+        zones = zones + adhoc_zones
+        print(f"✅ 임시 구역 {len(adhoc_zones)}개 추가 ({args.adhoc_file})")
+    
+    # 행정구역 경계가 있으면 구역별 면적 오버레이 계산
+    district_coverage = None
+    if boundaries is not None:
+        print(f"\n🧮 행정구역별 제한 면적 계산 중...")
+        district_coverage = compute_district_coverage(zones, boundaries.index)
+    
     # 2. 분류된 데이터 저장
     print(f"\n💾 분류된 데이터 저장 중...")
-    save_classified_data(zones)
+    save_classified_data(zones, district_coverage)
+    if sqlite_export_enabled:
+        try:
+            export_zones_sqlite(zones, 'result_data/classified_flight_restriction_zones.sqlite')
+        except sqlite3.Error as e:
+            print(f"❌ SQLite 저장 오류: {e}")
+    
+    # 위험도 래스터 (일괄 조회/히트맵용, 메모리 맵 파일)
+    severity_raster = None
+    if args.raster_resolution:
+        print(f"\n🧱 위험도 래스터 생성 중...")
+        try:
+            severity_raster = SeverityRaster.build(zones, resolution_m=args.raster_resolution,
+                                                   path='result_data/severity_raster')
+        except ValueError as e:
+            print(f"⚠️  위험도 래스터 생성 실패: {e}")
+    
+    # 텔레메트리 일괄 판정 (청크 단위 스트리밍이라 파일 크기와 무관하게 메모리 일정)
+    if args.audit_telemetry:
+        print(f"\n🛰️  텔레메트리 위반 판정 중...")
+        try:
+            audit_telemetry(ZoneIndex.from_zones(zones), args.audit_telemetry, 'result_data/telemetry_audit')
+        except (OSError, ValueError, ImportError) as e:
+            print(f"❌ 텔레메트리 판정 오류: {e}")
+    
+    # 제한 구역 회피 경로 계획 (비용 격자는 구역 지문별로 cache/route_grid/에 재사용)
+    if args.plan_route:
+        print(f"\n🧭 제한 구역 회피 경로 계산 중...")
+        try:
+            start, goal = (parse_lng_lat(value) for value in args.plan_route)
+            # 격자는 요청 지역(geomFilter) 전체와 출발/도착점을 덮도록 (구역이 없는 곳도 경로 계산 가능)
+            planner = RoutePlanner.build(zones, resolution_m=args.route_resolution, cache_dir='cache/route_grid',
+                                         bbox=geom_filter_bbox(base_params.get('geomFilter')),
+                                         include_points=[start, goal])
+            route = planner.plan(start, goal)
+            print_route(route)
+            save_route_geojson(route, 'result_data/route.geojson')
+        except ValueError as e:
+            print(f"❌ 경로 계산 오류: {e}")
     
     # 3. 분류된 VWorld 지도 생성
     print(f"\n🗺️  분류된 VWorld 지도 생성 중...")
-    create_classified_vworld_map(zones)
+    create_classified_vworld_map(zones_feature_collection(zones), output_filename='result_data/classified_flight_restriction_zones.html',
+                                 as_of=args.as_of, severity_raster=severity_raster)
+    if args.prune_map_assets:
+        prune_map_assets()
     
     # 4. 분석 리포트 생성
     print(f"\n📄 분석 리포트 생성 중...")
-    create_summary_report(zones)
+    create_summary_report(zones, district_coverage, as_of=args.as_of)
+    
+    if http_client is not None and http_client.stats['calls']:
+        stats = http_client.stats
+        print(f"\n📶 API 호출 {stats['calls']}회: 헤지 {stats['hedged']}회 (중복 요청이 먼저 응답 {stats['hedge_wins']}회), "
+              f"제한 시간 초과 {stats['deadline']}회, 차단기로 건너뜀 {stats['short_circuited']}회")
     
     print("\n🎉 모든 작업이 완료되었습니다!")
     print("=" * 70)
@@ -1431,6 +1737,12 @@ def main():
     print(f"   4. 🎛️  레이어 컨트롤로 구역 유형별 필터링")
     print(f"   5. 🖱️  마커 클릭으로 상세 정보 확인")
     
+    if response_cache is not None:
+        stats = response_cache.stats
+        print(f"\n💾 응답 캐시: 적중 {stats['hit']}건, 재검증 {stats['revalidated']}건, "
+              f"네트워크 {stats['miss']}건, 만료 캐시 사용 {stats['stale']}건, "
+              f"마감 대비 만료 캐시 선사용 {stats['stale_peek']}건, 오류 응답 미저장 {stats['rejected']}건")
+    
     print(f"\n⚖️  법적 주의사항:")
     print(f"   • 실제 드론 비행 전 최신 법규 및 승인 사항 확인 필수")
     print(f"   • 국토교통부 드론원스톱민원서비스(drone.go.kr) 활용 권장")
@@ -0,0 +1,206 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+KST = timezone(timedelta(hours=9))
+
+# 유효 기간을 담을 수 있는 속성 이름 (시작, 종료)
+PERIOD_FIELDS = (
+    ('valid_from', 'valid_to'),
+    ('str_date', 'end_date'),
+    ('start_date', 'end_date'),
+    ('eff_date', 'exp_date'),
+    ('sdate', 'edate')
+)
+
+_DATE_PATTERN = re.compile(
+    r'(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?(?:(?:\s*|T)(\d{1,2})\s*[:시]\s*(\d{2})?)?')
+
+
+# 비고의 명시적 기간 표기 ('YYYY-MM-DD ~ YYYY-MM-DD', 'YYYY.MM.DD부터 YYYY.MM.DD까지')
+_RANGE_PATTERN = re.compile(
+    rf'(?P<start>{_DATE_PATTERN.pattern})\s*(?:~|∼|～|〜|부터)\s*(?P<end>{_DATE_PATTERN.pattern})(?:\s*까지)?')
+
+
+def parse_timestamp(value, end_of_day=False):
+    """시각 값 → epoch 초 (숫자, ISO 8601, 'YYYY.MM.DD[ HH:MM]', 'YYYYMMDD' 지원)
+
+    시간대가 없으면 KST로 간주하고, 날짜만 있는 종료 시각은 그날 끝으로 봄
+    해석할 수 없는 값(없는 날짜 등)은 None
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=KST)).timestamp()
+
+    text = str(value).strip()
+    if re.fullmatch(r'\d{8}', text):
+        text = f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        has_time = 'T' in text or ':' in text
+    except ValueError:
+        match = _DATE_PATTERN.search(text)
+        if not match:
+            return None
+        year, month, day, hour, minute = match.groups()
+        hour, minute = int(hour or 0), int(minute or 0)
+        # 24:00은 다음 날 00:00, 없는 날짜/시각(2월 30일, 25시 등)은 해석 불가
+        next_day = hour == 24 and minute == 0
+        try:
+            parsed = datetime(int(year), int(month), int(day), 0 if next_day else hour, minute)
+        except ValueError:
+            return None
+        if next_day:
+            parsed += timedelta(days=1)
+        has_time = match.group(4) is not None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=KST)
+    if end_of_day and not has_time:
+        parsed += timedelta(days=1)
+    return parsed.timestamp()
+
+
+def extract_effective_period(props):
+    """구역 속성에서 유효 기간 (시작, 종료) epoch 초 추출, 상시 구역이면 (None, None)
+
+    전용 필드가 없으면 비고(rmk)에 명시적 기간 표기('~', '부터 … 까지')가 정확히 하나 있을 때만 사용
+    (공고일/개정일/NOTAM 번호 등 기간이 아닌 날짜가 있거나 기간이 여러 개로 모호하면 상시 구역으로 둠)
+    """
+    for start_key, end_key in PERIOD_FIELDS:
+        if props.get(start_key) or props.get(end_key):
+            return parse_timestamp(props.get(start_key)), parse_timestamp(props.get(end_key), end_of_day=True)
+
+    remark = str(props.get('rmk') or '')
+    ranges = list(_RANGE_PATTERN.finditer(remark))
+    if len(ranges) == 1:
+        start = parse_timestamp(ranges[0].group('start'))
+        end = parse_timestamp(ranges[0].group('end'), end_of_day=True)
+        if start is not None and end is not None and start < end:
+            return start, end
+    return None, None
+
+
+def format_timestamp(ts):
+    """epoch 초 → KST ISO 문자열 (None이면 None)"""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, KST).isoformat(timespec='minutes')
+
+
+def validity_columns(zones):
+    """구역 목록 → 유효 기간 배열 (상시 구역은 -inf ~ +inf)"""
+    valid_from = np.full(len(zones), -np.inf)
+    valid_to = np.full(len(zones), np.inf)
+    for i, zone in enumerate(zones):
+        start = parse_timestamp(zone.get('valid_from'))
+        end = parse_timestamp(zone.get('valid_to'))
+        if start is not None:
+            valid_from[i] = start
+        if end is not None:
+            valid_to[i] = end
+    return {'valid_from': valid_from, 'valid_to': valid_to}
+
+
+class IntervalIndex:
+    """[시작, 종료) 구간들에 대한 정적 중심 구간 트리 (질의 O(log n + k))
+
+    노드마다 중심값을 포함하는 구간을 시작 오름차순/종료 내림차순으로 보관하고,
+    질의 시각이 중심보다 작으면 시작 ≤ t, 크면 종료 > t 인 앞부분만 잘라 씀
+    """
+
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        self.nodes = []
+        ids = np.flatnonzero(starts < ends)
+        self.root = self._build(ids, starts, ends) if len(ids) else -1
+
+    def _build(self, ids, starts, ends):
+        # 중심값은 구간 하나의 내부 점(대표점)들의 중앙값 → 항상 한 구간 이상이 노드에 남음
+        s, e = starts[ids], ends[ids]
+        with np.errstate(invalid='ignore'):
+            reps = np.where(np.isfinite(s) & np.isfinite(e), (s + e) / 2,
+                            np.where(np.isfinite(e), e - 1.0, np.where(np.isfinite(s), s, 0.0)))
+        center = float(np.sort(reps)[len(reps) // 2])
+
+        left = ids[e <= center]
+        right = ids[s > center]
+        here = ids[(s <= center) & (e > center)]
+
+        by_start = here[np.argsort(starts[here], kind='stable')]
+        by_end = here[np.argsort(-ends[here], kind='stable')]
+        node = {
+            'center': center,
+            'by_start': by_start, 'starts': starts[by_start],
+            'by_end': by_end, 'neg_ends': -ends[by_end],
+            'left': -1, 'right': -1
+        }
+        position = len(self.nodes)
+        self.nodes.append(node)
+        if len(left):
+            node['left'] = self._build(left, starts, ends)
+        if len(right):
+            node['right'] = self._build(right, starts, ends)
+        return position
+
+    def query(self, t):
+        """시각 t에 유효한 구간 ID 배열"""
+        found = []
+        position = self.root
+        while position != -1:
+            node = self.nodes[position]
+            if t < node['center']:
+                k = np.searchsorted(node['starts'], t, side='right')
+                found.append(node['by_start'][:k])
+                position = node['left']
+            else:
+                k = np.searchsorted(node['neg_ends'], -t, side='left')
+                found.append(node['by_end'][:k])
+                position = node['right']
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(found).astype(np.int64)
+
+
+class TimeValidityIndex:
+    """상시 구역 마스크 + 기간 한정 구역 구간 트리"""
+
+    def __init__(self, valid_from, valid_to):
+        self.valid_from = np.asarray(valid_from, dtype=np.float64)
+        self.valid_to = np.asarray(valid_to, dtype=np.float64)
+        self.permanent = np.isneginf(self.valid_from) & np.isposinf(self.valid_to)
+        self.temporary_ids = np.flatnonzero(~self.permanent)
+        self.tree = IntervalIndex(self.valid_from[self.temporary_ids], self.valid_to[self.temporary_ids])
+
+    @classmethod
+    def from_zones(cls, zones):
+        columns = validity_columns(zones)
+        return cls(columns['valid_from'], columns['valid_to'])
+
+    def active_temporary_ids(self, t):
+        """시각 t에 유효한 기간 한정 구역 ID"""
+        return self.temporary_ids[self.tree.query(t)]
+
+    def active_ids(self, t):
+        """시각 t에 유효한 전체 구역 ID (오름차순)"""
+        return np.union1d(np.flatnonzero(self.permanent), self.active_temporary_ids(t))
+
+    def filter_ids(self, zone_ids, t):
+        """후보 구역 ID 중 시각 t에 유효한 것만 남김"""
+        zone_ids = np.asarray(zone_ids, dtype=np.int64)
+        keep = self.permanent[zone_ids] | np.isin(zone_ids, self.active_temporary_ids(t))
+        return zone_ids[keep]
+
+
+def filter_active_zones(zones, as_of, index=None):
+    """as_of 시각에 유효한 구역만 남긴 목록 (index를 넘기면 재구성 없이 사용)"""
+    t = parse_timestamp(as_of)
+    if t is None:
+        return zones
+    index = index or TimeValidityIndex.from_zones(zones)
+    return [zones[i] for i in index.active_ids(t)]
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+
+from zone_index import iter_polygons
+
+# 구역 속성에서 제외할 지오메트리 키 (아크로 따로 저장)
+GEOMETRY_KEYS = ('coordinates', 'geometry_type')
+
+
+def delta_encode(points):
+    """정수 좌표 목록 → 첫 점은 그대로, 이후는 직전 점과의 차이"""
+    encoded = [list(points[0])]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        encoded.append([x1 - x0, y1 - y0])
+    return encoded
+
+
+def delta_decode(encoded):
+    x = y = 0
+    points = []
+    for dx, dy in encoded:
+        x += dx
+        y += dy
+        points.append((x, y))
+    return points
+
+
+def _clean_ring(ring, quantize):
+    """링 양자화 + 연속 중복점 제거 (닫는 점 제외)"""
+    points = []
+    for p in ring:
+        q = quantize(p)
+        if not points or points[-1] != q:
+            points.append(q)
+    while len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points if len(points) >= 3 else None
+
+
+def _canonical_ring(points):
+    """경계점 없는 링: 가장 작은 점에서 시작, 방향은 사전순으로 작은 쪽 (같은 링은 같은 아크가 되도록)"""
+    k = points.index(min(points))
+    forward = points[k:] + points[:k]
+    backward = [forward[0]] + forward[:0:-1]
+    return (forward, False) if forward <= backward else (backward, True)
+
+
+class _ArcTable:
+    def __init__(self):
+        self.arcs = []
+        self._index = {}
+
+    def add(self, points):
+        """아크 인덱스 반환 (이미 있는 아크의 역방향이면 ~인덱스)"""
+        key = tuple(points)
+        if key in self._index:
+            return self._index[key]
+        reverse_key = key[::-1]
+        if reverse_key in self._index:
+            return ~self._index[reverse_key]
+        self._index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+
+def build_topology(zones, quantization=1_000_000):
+    """구역 목록 → TopoJSON Topology (공유 경계는 아크 하나로, 좌표는 양자화 + 델타 인코딩)
+
+    quantization: 전체 범위를 나누는 격자 눈금 수 (TopoJSON 관례, 1e6이면 서울 일대 약 5 cm)
+    """
+    rings_by_zone = []
+    xs, ys = [], []
+    for zone in zones:
+        polygons = list(iter_polygons(zone.get('geometry_type'), zone.get('coordinates')))
+        rings_by_zone.append(polygons)
+        for polygon in polygons:
+            for ring in polygon:
+                for p in ring:
+                    xs.append(float(p[0]))
+                    ys.append(float(p[1]))
+
+    x0, y0 = (min(xs), min(ys)) if xs else (0.0, 0.0)
+    kx = (max(xs) - x0) / (quantization - 1) if xs and max(xs) > x0 else 1.0
+    ky = (max(ys) - y0) / (quantization - 1) if ys and max(ys) > y0 else 1.0
+
+    def quantize(p):
+        return (int(round((float(p[0]) - x0) / kx)), int(round((float(p[1]) - y0) / ky)))
+
+    # 1. 양자화한 링 목록
+    quantized = []
+    for polygons in rings_by_zone:
+        zone_polygons = []
+        for polygon in polygons:
+            rings = [r for r in (_clean_ring(ring, quantize) for ring in polygon) if r]
+            if rings:
+                zone_polygons.append(rings)
+        quantized.append(zone_polygons)
+
+    # 2. 경계점(junction): 여러 링에 나타나면서 앞뒤 이웃이 서로 다른 점
+    neighbors = {}
+    junctions = set()
+    for zone_polygons in quantized:
+        for rings in zone_polygons:
+            for ring in rings:
+                n = len(ring)
+                for i, p in enumerate(ring):
+                    a, b = ring[i - 1], ring[(i + 1) % n]
+                    pair = (a, b) if a <= b else (b, a)
+                    seen = neighbors.setdefault(p, pair)
+                    if seen != pair:
+                        junctions.add(p)
+
+    # 3. 링을 경계점에서 잘라 아크로 등록 (같은 아크는 한 번만)
+    table = _ArcTable()
+    geometries = []
+    for zone, zone_polygons in zip(zones, quantized):
+        polygon_arcs = []
+        for rings in zone_polygons:
+            ring_arcs = []
+            for ring in rings:
+                cuts = [i for i, p in enumerate(ring) if p in junctions]
+                if not cuts:
+                    points, reversed_ring = _canonical_ring(ring)
+                    arc = table.add(points + [points[0]])
+                    ring_arcs.append([~arc if reversed_ring else arc])
+                    continue
+                rotated = ring[cuts[0]:] + ring[:cuts[0]]
+                offsets = [c - cuts[0] for c in cuts] + [len(ring)]
+                closed = rotated + [rotated[0]]
+                ring_arcs.append([table.add(closed[s:e + 1]) for s, e in zip(offsets, offsets[1:])])
+            polygon_arcs.append(ring_arcs)
+
+        properties = {k: v for k, v in zone.items() if k not in GEOMETRY_KEYS}
+        if not polygon_arcs:
+            geometries.append({'type': None, 'properties': properties})
+        elif len(polygon_arcs) == 1 and zone.get('geometry_type') != 'MultiPolygon':
+            geometries.append({'type': 'Polygon', 'arcs': polygon_arcs[0], 'properties': properties})
+        else:
+            geometries.append({'type': 'MultiPolygon', 'arcs': polygon_arcs, 'properties': properties})
+
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [kx, ky], 'translate': [x0, y0]},
+        'objects': {'zones': {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': [delta_encode(arc) for arc in table.arcs]
+    }
+
+
+def decode_topology(topology, object_name='zones'):
+    """Topology → 구역 목록 (geometry_type/coordinates 복원, 좌표는 양자화된 값)"""
+    kx, ky = topology['transform']['scale']
+    x0, y0 = topology['transform']['translate']
+    arcs = [[(x * kx + x0, y * ky + y0) for x, y in delta_decode(arc)] for arc in topology['arcs']]
+
+    def ring_coordinates(arc_ids):
+        points = []
+        for arc_id in arc_ids:
+            arc = arcs[arc_id] if arc_id >= 0 else arcs[~arc_id][::-1]
+            points.extend(arc if not points else arc[1:])
+        return [list(p) for p in points]
+
+    zones = []
+    for geometry in topology['objects'][object_name]['geometries']:
+        zone = dict(geometry.get('properties') or {})
+        if geometry.get('type') == 'Polygon':
+            zone['geometry_type'] = 'Polygon'
+            zone['coordinates'] = [ring_coordinates(ring) for ring in geometry['arcs']]
+        elif geometry.get('type') == 'MultiPolygon':
+            zone['geometry_type'] = 'MultiPolygon'
+            zone['coordinates'] = [[ring_coordinates(ring) for ring in polygon] for polygon in geometry['arcs']]
+        zones.append(zone)
+    return zones
+
+
+def save_topojson(zones, path, quantization=1_000_000):
+    """구역 목록을 TopoJSON 파일로 저장 (공백 없는 JSON), 파일 크기 반환"""
+    started = time.time()
+    topology = build_topology(zones, quantization)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(topology, f, ensure_ascii=False, separators=(',', ':'))
+    size = os.path.getsize(path)
+    point_count = sum(len(arc) for arc in topology['arcs'])
+    print(f"🧵 TopoJSON 저장: {path} ({size:,} bytes, 아크 {len(topology['arcs'])}개, "
+          f"좌표 {point_count:,}개, {time.time() - started:.2f}초)")
+    return size
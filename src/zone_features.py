@@ -0,0 +1,94 @@
+from collections.abc import Mapping, Sequence
+
+
+def _operation_time(zone):
+    if not zone.get('valid_from') and not zone.get('valid_to'):
+        return '상시'
+    return f"{zone.get('valid_from') or ''} ~ {zone.get('valid_to') or ''}"
+
+
+# 지도용 속성 이름 → 분류된 구역 dict에서 값을 꺼내는 함수 (접근할 때마다 계산, 복사본을 두지 않음)
+PROPERTY_GETTERS = {
+    'ZONE_TYPE': lambda zone: zone['restriction_info']['type'],
+    'ZONE_NAME': lambda zone: zone.get('name'),
+    'ALTITUDE': lambda zone: zone.get('altitude_limit'),
+    'ALTITUDE_BAND': lambda zone: zone.get('altitude'),
+    'RESTRICTION': lambda zone: zone['restriction_info'].get('reason'),
+    'SEVERITY': lambda zone: zone['restriction_info'].get('severity'),
+    'COLOR': lambda zone: zone['restriction_info'].get('color'),
+    'ICON': lambda zone: zone['restriction_info'].get('icon'),
+    'BORDER': lambda zone: zone['restriction_info'].get('border'),
+    'OPERATION_TIME': _operation_time,
+    'valid_from': lambda zone: zone.get('valid_from'),
+    'valid_to': lambda zone: zone.get('valid_to'),
+}
+
+
+class ZoneProperties(Mapping):
+    """구역 dict의 지도용 속성 뷰 (ZONE_TYPE/ZONE_NAME/ALTITUDE/RESTRICTION 등을 restriction_info에서 꺼냄)"""
+
+    __slots__ = ('zone',)
+
+    def __init__(self, zone):
+        self.zone = zone
+
+    def __getitem__(self, key):
+        return PROPERTY_GETTERS[key](self.zone)
+
+    def __iter__(self):
+        return iter(PROPERTY_GETTERS)
+
+    def __len__(self):
+        return len(PROPERTY_GETTERS)
+
+
+class ZoneFeature(Mapping):
+    """구역 dict의 GeoJSON 피처 뷰 (좌표 목록은 구역 dict의 것을 그대로 참조)"""
+
+    __slots__ = ('zone',)
+
+    def __init__(self, zone):
+        self.zone = zone
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return 'Feature'
+        if key == 'geometry':
+            if not self.zone.get('coordinates'):
+                return None
+            return {'type': self.zone.get('geometry_type', 'Unknown'), 'coordinates': self.zone['coordinates']}
+        if key == 'properties':
+            return ZoneProperties(self.zone)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('type', 'geometry', 'properties'))
+
+    def __len__(self):
+        return 3
+
+
+class ZoneFeatureList(Sequence):
+    """구역 목록의 피처 뷰 (인덱스로 접근할 때 ZoneFeature를 만듦)"""
+
+    __slots__ = ('zones',)
+
+    def __init__(self, zones):
+        self.zones = zones
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ZoneFeatureList(self.zones[i])
+        return ZoneFeature(self.zones[i])
+
+    def __len__(self):
+        return len(self.zones)
+
+
+def zones_feature_collection(zones):
+    """fetch_flight_restriction_data의 구역 목록 → create_classified_vworld_map이 읽는 FeatureCollection 뷰
+
+    구역 좌표/속성을 복사하지 않으므로 수만 개 구역도 데이터를 두 벌 만들지 않고 지도에 넘길 수 있음
+    """
+    return {'type': 'FeatureCollection', 'features': ZoneFeatureList(zones)}
+
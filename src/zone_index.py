@@ -0,0 +1,586 @@
+import io
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from altitude import altitude_columns, altitude_mask
+from time_validity import TimeValidityIndex, parse_timestamp, validity_columns
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def iter_polygons(geom_type, coordinates):
+    """GeoJSON 지오메트리를 폴리곤(링 목록) 단위로 순회"""
+    if not coordinates:
+        return
+    if geom_type == 'Polygon':
+        yield coordinates
+    elif geom_type == 'MultiPolygon':
+        for polygon in coordinates:
+            if polygon:
+                yield polygon
+
+
+def _ranges(starts, ends):
+    """[starts[i], ends[i]) 구간들을 이어 붙인 인덱스 배열"""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return np.arange(total, dtype=np.int64) + offsets
+
+
+def edges_contain_point(a, b, owner, count, lng, lat):
+    """변 목록(a→b, owner=소속 구역 위치)으로 구역별 점 포함 여부 (ray casting, even-odd)"""
+    x1, y1, x2, y2 = a[:, 0], a[:, 1], b[:, 0], b[:, 1]
+    straddle = (y1 > lat) != (y2 > lat)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = (x2 - x1) * (lat - y1) / (y2 - y1) + x1
+    crossing = straddle & (lng < x_cross)
+    counts = np.bincount(owner[crossing], minlength=count)
+    return counts % 2 == 1
+
+
+def edges_distance_m(a, b, owner, count, lng, lat):
+    """구역별 경계까지의 최단 거리(m), 질의점 기준 등장방형 근사"""
+    kx = math.radians(1) * EARTH_RADIUS_M * math.cos(math.radians(lat))
+    ky = math.radians(1) * EARTH_RADIUS_M
+    ax, ay = (a[:, 0] - lng) * kx, (a[:, 1] - lat) * ky
+    bx, by = (b[:, 0] - lng) * kx, (b[:, 1] - lat) * ky
+    dx, dy = bx - ax, by - ay
+    seg_len2 = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(seg_len2 > 0, -(ax * dx + ay * dy) / seg_len2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    dist = np.hypot(ax + t * dx, ay + t * dy)
+    result = np.full(count, np.inf)
+    np.minimum.at(result, owner, dist)
+    return result
+
+
+def edges_intersect_bbox(a, b, owner, count, minx, miny, maxx, maxy):
+    """구역별 bbox 겹침 여부 (변-사각형 교차 또는 사각형이 구역 내부)"""
+    # Liang-Barsky 방식의 선분-사각형 교차 판정
+    x0, y0 = a[:, 0], a[:, 1]
+    dx, dy = b[:, 0] - x0, b[:, 1] - y0
+    t0 = np.zeros(len(x0))
+    t1 = np.ones(len(x0))
+    hit = np.ones(len(x0), dtype=bool)
+    for p, q in ((-dx, x0 - minx), (dx, maxx - x0), (-dy, y0 - miny), (dy, maxy - y0)):
+        parallel = p == 0
+        hit &= ~(parallel & (q < 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(parallel, 0.0, q / p)
+        t0 = np.where(~parallel & (p < 0), np.maximum(t0, r), t0)
+        t1 = np.where(~parallel & (p > 0), np.minimum(t1, r), t1)
+    hit &= t0 <= t1
+    result = np.bincount(owner[hit], minlength=count) > 0
+    return result | edges_contain_point(a, b, owner, count, minx, miny)
+
+
+def radius_window(lng, lat, radius_m):
+    """점에서 radius_m 이내를 모두 덮는 경위도 bbox"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlng = dlat / max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+    return lng - dlng, lat - dlat, lng + dlng, lat + dlat
+
+
+def _point_to_grid_m(grid, lng, lat):
+    """점에서 격자 범위까지의 대략적 거리(m), 범위 밖 질의점의 검색 종료 판정용"""
+    maxx = grid['minx'] + grid['nx'] * grid['cell']
+    maxy = grid['miny'] + grid['ny'] * grid['cell']
+    dx = max(grid['minx'] - lng, 0.0, lng - maxx)
+    dy = max(grid['miny'] - lat, 0.0, lat - maxy)
+    return math.hypot(dx, dy) * math.radians(1) * EARTH_RADIUS_M
+
+
+def _unit_vectors(lng, lat):
+    lng = np.radians(lng)
+    lat = np.radians(lat)
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)), axis=-1)
+
+
+def _angle_between(u, v):
+    """단위 벡터 사이 중심각 (atan2 형태라 가까운 거리에서도 정밀)"""
+    return np.arctan2(np.linalg.norm(np.cross(u, v), axis=-1), np.sum(u * v, axis=-1))
+
+
+def initial_bearing_deg(lng1, lat1, lng2, lat2):
+    """점1에서 점2를 향하는 초기 방위각 (북=0°, 시계 방향)"""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dl = np.radians(np.asarray(lng2) - lng1)
+    y = np.sin(dl) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dl)
+    return (np.degrees(np.arctan2(y, x)) + 360.0) % 360.0
+
+
+def geodesic_segment_distance(lng, lat, a, b):
+    """점에서 각 변(대권 호 a→b)까지의 구면 최단 거리(m)와 가장 가까운 점(경도, 위도)
+
+    수선의 발이 호 위에 있으면 교차 거리(cross-track), 아니면 가까운 끝점까지의 거리
+    """
+    p = _unit_vectors(lng, lat)
+    ua = _unit_vectors(a[:, 0], a[:, 1])
+    ub = _unit_vectors(b[:, 0], b[:, 1])
+    normal = np.cross(ua, ub)
+    norm = np.linalg.norm(normal, axis=1)
+    degenerate = norm < 1e-15
+    normal = normal / np.where(degenerate, 1.0, norm)[:, None]
+
+    # 대권 평면에 내린 수선의 발이 a~b 사이에 있는지
+    foot = p[None, :] - (normal @ p)[:, None] * normal
+    foot_norm = np.linalg.norm(foot, axis=1)
+    foot = foot / np.where(foot_norm > 0, foot_norm, 1.0)[:, None]
+    within = (~degenerate & (foot_norm > 0)
+              & (np.sum(np.cross(ua, foot) * normal, axis=1) >= 0)
+              & (np.sum(np.cross(foot, ub) * normal, axis=1) >= 0))
+
+    to_a = _angle_between(p[None, :], ua)
+    to_b = _angle_between(p[None, :], ub)
+    end_is_a = to_a <= to_b
+    closest = np.where(within[:, None], foot, np.where(end_is_a[:, None], ua, ub))
+    angle = np.where(within, _angle_between(p[None, :], foot), np.minimum(to_a, to_b))
+
+    closest_lng = np.degrees(np.arctan2(closest[:, 1], closest[:, 0]))
+    closest_lat = np.degrees(np.arcsin(np.clip(closest[:, 2], -1.0, 1.0)))
+    return angle * EARTH_RADIUS_M, closest_lng, closest_lat
+
+
+def nearest_boundary(lng, lat, a, b, owner, count):
+    """구역별 경계까지의 구면 최단 거리(m)와 가장 가까운 경계점 (owner는 0..count-1)"""
+    dist, closest_lng, closest_lat = geodesic_segment_distance(lng, lat, a, b)
+    result = np.full(count, np.inf)
+    result_lng = np.full(count, np.nan)
+    result_lat = np.full(count, np.nan)
+    if len(dist):
+        order = np.lexsort((dist, owner))
+        first = order[np.concatenate(([True], owner[order][1:] != owner[order][:-1]))]
+        result[owner[first]] = dist[first]
+        result_lng[owner[first]] = closest_lng[first]
+        result_lat[owner[first]] = closest_lat[first]
+    return result, result_lng, result_lat
+
+
+def zone_record(zone):
+    """질의 응답에 포함할 구역 속성 (JSON 직렬화 가능)"""
+    restriction_info = zone.get('restriction_info') or {}
+    address_info = zone.get('address_info') or {}
+    return {
+        'index': zone.get('index'),
+        'name': zone.get('name'),
+        'type': restriction_info.get('type'),
+        'severity': restriction_info.get('severity'),
+        'icon': restriction_info.get('icon'),
+        'color': restriction_info.get('color'),
+        'reason': restriction_info.get('reason'),
+        'labels': zone.get('labels') or restriction_info.get('labels', []),
+        'altitude_limit': zone.get('altitude_limit'),
+        'altitude': zone.get('altitude'),
+        'valid_from': zone.get('valid_from'),
+        'valid_to': zone.get('valid_to'),
+        'center_lat': zone.get('center_lat'),
+        'center_lng': zone.get('center_lng'),
+        'address': address_info.get('simple_address')
+    }
+
+
+class ZoneIndex:
+    """구역 폴리곤을 연속 배열로 묶은 읽기 전용 공간 인덱스
+
+    - xy: 모든 링의 정점 (닫힌 링, 경도/위도)
+    - ring_is_hole: 각 링이 폴리곤의 내부 구멍인지 여부
+    - edge_start: 각 변의 시작 정점 인덱스 (변 = xy[i] → xy[i + 1])
+    - zone_edge_offsets: 구역별 변 구간
+    - bboxes: 구역별 (minx, miny, maxx, maxy)
+    - columns: 구역별 숫자 속성 배열 (고도 하한/상한, 유효 기간 등)
+    - 균일 격자 버킷(CSR)으로 후보 구역을 빠르게 추림
+    """
+
+    ARRAY_FIELDS = ('xy', 'ring_offsets', 'zone_ring_offsets', 'ring_is_hole', 'bboxes',
+                    'cell_offsets', 'cell_items')
+
+    def __init__(self, xy, ring_offsets, zone_ring_offsets, bboxes, records,
+                 grid=None, cell_offsets=None, cell_items=None, meta=None, ring_is_hole=None,
+                 columns=None):
+        self.xy = xy
+        self.ring_offsets = ring_offsets
+        self.zone_ring_offsets = zone_ring_offsets
+        if ring_is_hole is None:
+            ring_is_hole = np.zeros(len(ring_offsets) - 1, dtype=bool)
+        self.ring_is_hole = ring_is_hole
+        self.bboxes = bboxes
+        self.records = records
+        self.columns = columns or {}
+        self._time_index = None
+        self.meta = meta or {'built_at': time.time()}
+        self._build_edges()
+        if grid is None:
+            self._build_grid()
+        else:
+            self.grid = grid
+            self.cell_offsets = cell_offsets
+            self.cell_items = cell_items
+
+    def __len__(self):
+        return len(self.records)
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_geometries(cls, geometries, records, meta=None, columns=None):
+        """(geom_type, coordinates) 목록과 속성 목록으로 인덱스 생성"""
+        points = []
+        ring_offsets = [0]
+        ring_is_hole = []
+        zone_ring_offsets = [0]
+        bboxes = []
+
+        for geom_type, coordinates in geometries:
+            zone_min = [math.inf, math.inf]
+            zone_max = [-math.inf, -math.inf]
+            for polygon in iter_polygons(geom_type, coordinates):
+                for ring_no, ring in enumerate(polygon):
+                    if len(ring) < 3:
+                        continue
+                    ring = [(float(p[0]), float(p[1])) for p in ring]
+                    if ring[0] != ring[-1]:
+                        ring.append(ring[0])
+                    points.extend(ring)
+                    ring_offsets.append(len(points))
+                    ring_is_hole.append(ring_no > 0)
+                    xs = [p[0] for p in ring]
+                    ys = [p[1] for p in ring]
+                    zone_min = [min(zone_min[0], min(xs)), min(zone_min[1], min(ys))]
+                    zone_max = [max(zone_max[0], max(xs)), max(zone_max[1], max(ys))]
+            zone_ring_offsets.append(len(ring_offsets) - 1)
+            bboxes.append(zone_min + zone_max)
+
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return cls(xy,
+                   np.asarray(ring_offsets, dtype=np.int64),
+                   np.asarray(zone_ring_offsets, dtype=np.int64),
+                   np.asarray(bboxes, dtype=np.float64).reshape(-1, 4),
+                   list(records), meta=meta, ring_is_hole=np.asarray(ring_is_hole, dtype=bool),
+                   columns=columns)
+
+    @classmethod
+    def from_zones(cls, zones):
+        """fetch_flight_restriction_data 결과(분류된 구역 목록)로 인덱스 생성"""
+        geometries = [(zone.get('geometry_type'), zone.get('coordinates')) for zone in zones]
+        records = [zone_record(zone) for zone in zones]
+        columns = altitude_columns(zones)
+        columns.update(validity_columns(zones))
+        return cls.from_geometries(geometries, records, columns=columns)
+
+    def _build_edges(self):
+        ring_starts = self.ring_offsets[:-1]
+        ring_ends = self.ring_offsets[1:]
+        # 닫힌 링의 마지막 정점은 변의 시작점이 아님
+        self.edge_start = _ranges(ring_starts, np.maximum(ring_ends - 1, ring_starts))
+        ring_edge_counts = np.maximum(ring_ends - ring_starts - 1, 0)
+        ring_edge_offsets = np.concatenate(([0], np.cumsum(ring_edge_counts))).astype(np.int64)
+        self.zone_edge_offsets = ring_edge_offsets[self.zone_ring_offsets]
+
+    def _build_grid(self):
+        valid = np.isfinite(self.bboxes).all(axis=1) if len(self.bboxes) else np.zeros(0, dtype=bool)
+        if not valid.any():
+            self.grid = {'minx': 0.0, 'miny': 0.0, 'cell': 1.0, 'nx': 1, 'ny': 1}
+            self.cell_offsets = np.zeros(2, dtype=np.int64)
+            self.cell_items = np.zeros(0, dtype=np.int64)
+            return
+
+        boxes = self.bboxes[valid]
+        minx, miny = boxes[:, 0].min(), boxes[:, 1].min()
+        maxx, maxy = boxes[:, 2].max(), boxes[:, 3].max()
+        # 셀 크기: 구역 bbox 크기의 중앙값 수준 (셀당 후보 수와 중복 등록 수의 균형)
+        sizes = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        cell = max(float(np.median(sizes)), (maxx - minx) / 512, (maxy - miny) / 512, 1e-6)
+        nx = int((maxx - minx) / cell) + 1
+        ny = int((maxy - miny) / cell) + 1
+        self.grid = {'minx': float(minx), 'miny': float(miny), 'cell': cell, 'nx': nx, 'ny': ny}
+
+        zone_ids = np.flatnonzero(valid)
+        cx0, cy0, cx1, cy1 = self._cell_range(boxes)
+        wx = cx1 - cx0 + 1
+        counts = wx * (cy1 - cy0 + 1)
+        rep = np.repeat(np.arange(len(zone_ids)), counts)
+        local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        ix = cx0[rep] + local % wx[rep]
+        iy = cy0[rep] + local // wx[rep]
+        cells = iy * nx + ix
+        order = np.argsort(cells, kind='stable')
+        self.cell_items = zone_ids[rep[order]].astype(np.int64)
+        self.cell_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(cells, minlength=nx * ny)))).astype(np.int64)
+
+    def _cell_range(self, boxes):
+        g = self.grid
+        cx0 = np.clip(((boxes[:, 0] - g['minx']) // g['cell']).astype(np.int64), 0, g['nx'] - 1)
+        cy0 = np.clip(((boxes[:, 1] - g['miny']) // g['cell']).astype(np.int64), 0, g['ny'] - 1)
+        cx1 = np.clip(((boxes[:, 2] - g['minx']) // g['cell']).astype(np.int64), 0, g['nx'] - 1)
+        cy1 = np.clip(((boxes[:, 3] - g['miny']) // g['cell']).astype(np.int64), 0, g['ny'] - 1)
+        return cx0, cy0, cx1, cy1
+
+    # ------------------------------------------------------------------
+    # 후보 추출
+    # ------------------------------------------------------------------
+    def candidates_bbox(self, minx, miny, maxx, maxy):
+        """격자 버킷과 bbox 겹침으로 후보 구역 ID 추출"""
+        g = self.grid
+        if maxx < g['minx'] or maxy < g['miny']:
+            return np.zeros(0, dtype=np.int64)
+        cx0, cy0, cx1, cy1 = (int(v[0]) for v in self._cell_range(
+            np.array([[minx, miny, maxx, maxy]], dtype=np.float64)))
+        cells = (np.arange(cy0, cy1 + 1)[:, None] * g['nx'] + np.arange(cx0, cx1 + 1)[None, :]).ravel()
+        ids = np.unique(self.cell_items[_ranges(self.cell_offsets[cells], self.cell_offsets[cells + 1])])
+        if len(ids) == 0:
+            return ids
+        b = self.bboxes[ids]
+        keep = (b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny)
+        return ids[keep]
+
+    def _zone_edges(self, zone_ids):
+        """후보 구역들의 변 좌표와 변별 구역 위치(0..len(zone_ids)-1)"""
+        starts = self.zone_edge_offsets[zone_ids]
+        ends = self.zone_edge_offsets[zone_ids + 1]
+        edges = self.edge_start[_ranges(starts, ends)]
+        owner = np.repeat(np.arange(len(zone_ids)), ends - starts)
+        a = self.xy[edges]
+        b = self.xy[edges + 1]
+        return a, b, owner
+
+    def oriented_edges(self, zone_id):
+        """구역의 변을 외곽 링은 반시계, 구멍은 시계 방향(내부가 왼쪽)으로 맞춰 반환"""
+        ring_ids = np.arange(self.zone_ring_offsets[zone_id], self.zone_ring_offsets[zone_id + 1])
+        starts = self.ring_offsets[ring_ids]
+        ends = self.ring_offsets[ring_ids + 1]
+        edges = _ranges(starts, np.maximum(ends - 1, starts))
+        ring_of_edge = np.repeat(np.arange(len(ring_ids)), np.maximum(ends - starts - 1, 0))
+        a = self.xy[edges]
+        b = self.xy[edges + 1]
+        # 링별 부호 있는 면적(신발끈 공식)으로 방향 판별 (정밀도를 위해 bbox 원점 기준)
+        origin = self.bboxes[zone_id, :2]
+        ra, rb = a - origin, b - origin
+        cross = ra[:, 0] * rb[:, 1] - rb[:, 0] * ra[:, 1]
+        signed_area = np.bincount(ring_of_edge, weights=cross, minlength=len(ring_ids))
+        want_ccw = ~self.ring_is_hole[ring_ids]
+        flip = (signed_area > 0) != want_ccw
+        flip_edge = flip[ring_of_edge]
+        a_out = np.where(flip_edge[:, None], b, a)
+        b_out = np.where(flip_edge[:, None], a, b)
+        return a_out, b_out
+
+    def contains_point(self, zone_ids, lng, lat):
+        """후보 구역들에 대해 점 포함 여부 (벡터화 ray casting, even-odd)"""
+        zone_ids = np.asarray(zone_ids, dtype=np.int64)
+        if len(zone_ids) == 0:
+            return np.zeros(0, dtype=bool)
+        a, b, owner = self._zone_edges(zone_ids)
+        return edges_contain_point(a, b, owner, len(zone_ids), lng, lat)
+
+    def distance_to_boundary_m(self, zone_ids, lng, lat):
+        """후보 구역 경계까지의 최단 거리(m), 질의점 기준 등장방형 근사"""
+        zone_ids = np.asarray(zone_ids, dtype=np.int64)
+        if len(zone_ids) == 0:
+            return np.zeros(0)
+        a, b, owner = self._zone_edges(zone_ids)
+        return edges_distance_m(a, b, owner, len(zone_ids), lng, lat)
+
+    def intersects_bbox(self, zone_ids, minx, miny, maxx, maxy):
+        """후보 구역이 bbox와 실제로 겹치는지 (변-사각형 교차 또는 사각형이 구역 내부)"""
+        zone_ids = np.asarray(zone_ids, dtype=np.int64)
+        if len(zone_ids) == 0:
+            return np.zeros(0, dtype=bool)
+        a, b, owner = self._zone_edges(zone_ids)
+        return edges_intersect_bbox(a, b, owner, len(zone_ids), minx, miny, maxx, maxy)
+
+    # ------------------------------------------------------------------
+    # 질의 (as_of: 해당 시각에 유효한 구역만, None이면 전체)
+    # ------------------------------------------------------------------
+    @property
+    def time_index(self):
+        """유효 기간 구간 트리 (처음 필요할 때 한 번 생성)"""
+        if self._time_index is None and 'valid_from' in self.columns:
+            self._time_index = TimeValidityIndex(self.columns['valid_from'], self.columns['valid_to'])
+        return self._time_index
+
+    def filter_as_of(self, ids, as_of):
+        """후보 구역 중 as_of 시각에 유효한 구역만 남김"""
+        t = parse_timestamp(as_of)
+        if t is None or len(ids) == 0 or self.time_index is None:
+            return ids
+        return self.time_index.filter_ids(ids, t)
+
+    def query_point(self, lng, lat, as_of=None):
+        """점을 포함하는 구역 ID 목록"""
+        ids = self.candidates_bbox(lng, lat, lng, lat)
+        ids = self.filter_as_of(ids, as_of)
+        return ids[self.contains_point(ids, lng, lat)]
+
+    def query_point_3d(self, lng, lat, altitude_m, reference='AGL', ground_elevation_m=0.0, as_of=None):
+        """점을 포함하고 고도가 하한~상한 사이인 구역 ID 목록 (드론 위치가 제한되는지 판정)"""
+        ids = self.query_point(lng, lat, as_of)
+        if len(ids) == 0 or 'floor_m' not in self.columns:
+            return ids
+        return ids[altitude_mask(self.columns, ids, altitude_m, reference, ground_elevation_m)]
+
+    def query_bbox(self, minx, miny, maxx, maxy, as_of=None):
+        """bbox와 겹치는 구역 ID 목록"""
+        ids = self.filter_as_of(self.candidates_bbox(minx, miny, maxx, maxy), as_of)
+        return ids[self.intersects_bbox(ids, minx, miny, maxx, maxy)]
+
+    def query_radius(self, lng, lat, radius_m, as_of=None):
+        """점에서 radius_m 이내에 걸치는 구역 ID 목록"""
+        ids = self.candidates_bbox(*radius_window(lng, lat, radius_m))
+        ids = self.filter_as_of(ids, as_of)
+        near = self.contains_point(ids, lng, lat) | (self.distance_to_boundary_m(ids, lng, lat) <= radius_m)
+        return ids[near]
+
+    def nearest(self, lng, lat, k=5, max_distance_m=None, as_of=None):
+        """경계까지의 구면 거리 기준 가장 가까운 k개 구역
+
+        격자 인덱스로 검색 반경을 두 배씩 넓혀 가며 후보를 추리고,
+        k번째 거리가 검색 반경 이내가 되면 더 먼 구역은 볼 필요가 없으므로 종료
+        반환: [{'id', 'distance_m', 'bearing_deg', 'inside', 'boundary_lat', 'boundary_lng'}, ...]
+        (inside=True이면 구역 내부이며 distance_m은 빠져나가기까지의 거리)
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+        g = self.grid
+        extent_m = math.hypot(g['nx'], g['ny']) * g['cell'] * math.radians(1) * EARTH_RADIUS_M
+        radius = max(g['cell'] * math.radians(1) * EARTH_RADIUS_M / 2, 100.0)
+        if max_distance_m is not None:
+            radius = min(radius, max_distance_m)
+
+        while True:
+            ids = self.filter_as_of(self.candidates_bbox(*radius_window(lng, lat, radius)), as_of)
+            dist = np.zeros(0)
+            if len(ids):
+                a, b, owner = self._zone_edges(ids)
+                dist, lng_near, lat_near = nearest_boundary(lng, lat, a, b, owner, len(ids))
+            # 반경 안에서 k개를 찾았으면 반경 밖 구역은 더 가까울 수 없음
+            if np.count_nonzero(dist <= radius) >= k:
+                break
+            if radius >= extent_m + _point_to_grid_m(g, lng, lat):
+                break
+            if max_distance_m is not None and radius >= max_distance_m:
+                break
+            radius = radius * 2 if max_distance_m is None else min(radius * 2, max_distance_m)
+
+        order = np.argsort(dist, kind='stable')[:k]
+        if max_distance_m is not None:
+            order = order[dist[order] <= max_distance_m]
+        if len(order) == 0:
+            return []
+        inside = self.contains_point(ids[order], lng, lat)
+        bearing = initial_bearing_deg(lng, lat, lng_near[order], lat_near[order])
+        return [{
+            'id': int(ids[i]),
+            'distance_m': round(float(dist[i]), 2),
+            'bearing_deg': round(float(bearing[n]), 1),
+            'inside': bool(inside[n]),
+            'boundary_lat': float(lat_near[i]),
+            'boundary_lng': float(lng_near[i])
+        } for n, i in enumerate(order)]
+
+    def query_points(self, lngs, lats, altitudes=None, timestamps=None, reference='AGL',
+                     max_pair_edges=2_000_000):
+        """여러 점의 포함 구역을 한 번에 판정 → (점 위치 배열, 구역 ID 배열) 쌍
+
+        1. 점이 속한 격자 셀의 후보 구역 + bbox 포함으로 (점, 구역) 쌍 추림
+        2. timestamps(epoch 초)가 있으면 유효 기간, altitudes가 있으면 고도 범위로 거름
+        3. 구역별로 모은 점 × 변 배열로 ray casting (점 × 변 수를 max_pair_edges 이하로 나눠 메모리 고정)
+        """
+        lngs = np.asarray(lngs, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        if len(lngs) == 0 or len(self.cell_items) == 0:
+            return empty
+
+        g = self.grid
+        finite = np.flatnonzero(np.isfinite(lngs) & np.isfinite(lats))
+        cx, cy, _, _ = self._cell_range(np.column_stack([lngs[finite], lats[finite]] * 2))
+        cells = cy * g['nx'] + cx
+        starts, ends = self.cell_offsets[cells], self.cell_offsets[cells + 1]
+        pair_point = np.repeat(finite, ends - starts)
+        pair_zone = self.cell_items[_ranges(starts, ends)]
+
+        px, py = lngs[pair_point], lats[pair_point]
+        b = self.bboxes[pair_zone]
+        keep = (px >= b[:, 0]) & (px <= b[:, 2]) & (py >= b[:, 1]) & (py <= b[:, 3])
+        if timestamps is not None and 'valid_from' in self.columns:
+            t = np.asarray(timestamps, dtype=np.float64)[pair_point]
+            keep &= np.isnan(t) | ((t >= self.columns['valid_from'][pair_zone])
+                                   & (t < self.columns['valid_to'][pair_zone]))
+        if altitudes is not None and 'floor_m' in self.columns:
+            alt = np.asarray(altitudes, dtype=np.float64)[pair_point]
+            keep &= np.isnan(alt) | altitude_mask(self.columns, pair_zone, alt, reference)
+        pair_point, pair_zone = pair_point[keep], pair_zone[keep]
+        if len(pair_point) == 0:
+            return empty
+
+        order = np.argsort(pair_zone, kind='stable')
+        pair_point, pair_zone = pair_point[order], pair_zone[order]
+        bounds = np.flatnonzero(np.diff(pair_zone)) + 1
+        inside = np.zeros(len(pair_point), dtype=bool)
+        for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(pair_zone)]))):
+            z = pair_zone[lo]
+            edges = self.edge_start[self.zone_edge_offsets[z]:self.zone_edge_offsets[z + 1]]
+            if len(edges) == 0:
+                continue
+            x1, y1 = self.xy[edges, 0], self.xy[edges, 1]
+            x2, y2 = self.xy[edges + 1, 0], self.xy[edges + 1, 1]
+            step = max(1, max_pair_edges // len(edges))
+            for s in range(lo, hi, step):
+                e = min(s + step, hi)
+                qx = lngs[pair_point[s:e], None]
+                qy = lats[pair_point[s:e], None]
+                straddle = (y1 > qy) != (y2 > qy)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    x_cross = (x2 - x1) * (qy - y1) / (y2 - y1) + x1
+                inside[s:e] = np.count_nonzero(straddle & (qx < x_cross), axis=1) % 2 == 1
+
+        # 점 순서로 정렬해 반환
+        pair_point, pair_zone = pair_point[inside], pair_zone[inside]
+        order = np.lexsort((pair_zone, pair_point))
+        return pair_point[order], pair_zone[order]
+
+    def nearest_batch(self, points, k=5, max_distance_m=None, as_of=None):
+        """여러 점(경도, 위도)에 대한 nearest 결과 목록 (텔레메트리 일괄 처리용)"""
+        return [self.nearest(float(lng), float(lat), k, max_distance_m, as_of) for lng, lat in points]
+
+    # ------------------------------------------------------------------
+    # 저장 / 불러오기
+    # ------------------------------------------------------------------
+    def save(self, path):
+        """인덱스를 .npz 파일로 저장 (임시 파일 작성 후 교체)"""
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        arrays.update({f"col_{name}": values for name, values in self.columns.items()})
+        header = {'records': self.records, 'grid': self.grid, 'meta': self.meta}
+        arrays['header'] = np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """save로 저장한 인덱스 파일 불러오기"""
+        with np.load(path) as data:
+            header = json.loads(data['header'].tobytes().decode('utf-8'))
+            index = cls(data['xy'], data['ring_offsets'], data['zone_ring_offsets'], data['bboxes'],
+                        header['records'], grid=header['grid'],
+                        cell_offsets=data['cell_offsets'], cell_items=data['cell_items'],
+                        meta=header['meta'],
+                        ring_is_hole=data['ring_is_hole'] if 'ring_is_hole' in data.files else None,
+                        columns={name[4:]: data[name] for name in data.files if name.startswith('col_')})
+        return index
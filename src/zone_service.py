@@ -0,0 +1,305 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from dynamic_index import DynamicZoneIndex
+from route_planner import RoutePlanner
+from time_validity import parse_timestamp
+from zone_index import ZoneIndex
+
+
+class ZoneQueryService:
+    """메모리 상의 구역 인덱스 스냅샷을 보관하고 주기적으로 교체하는 서비스
+
+    질의는 시작 시점의 스냅샷 참조 하나만 사용하므로, 백그라운드 갱신이
+    새 인덱스를 만든 뒤 참조를 바꿔 끼워도 진행 중인 요청은 영향을 받지 않음
+    운영자가 등록한 임시 구역은 스냅샷과 별도의 동적 인덱스(adhoc)에 두어
+    재조회/재구성 없이 바로 추가·수정·삭제되며, 질의 결과에 함께 포함됨
+    """
+
+    def __init__(self, loader, index_path='result_data/zone_index.npz', refresh_interval=3600,
+                 zone_builder=None, route_resolution_m=100.0):
+        self.loader = loader
+        self.zone_builder = zone_builder
+        self.adhoc = DynamicZoneIndex()
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self._snapshot = None
+        self._version = 0
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.route_resolution_m = route_resolution_m
+        self._planner = None
+        self._planner_lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def _swap(self, index, source):
+        self._version += 1
+        index.meta.update({'version': self._version, 'source': source, 'loaded_at': time.time()})
+        self._snapshot = index
+
+    def warm_start(self):
+        """저장된 인덱스 파일이 있으면 즉시 불러와 서비스 시작"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            index = ZoneIndex.load(self.index_path)
+        except Exception as e:
+            print(f"⚠️  인덱스 파일 로드 실패: {e}")
+            return False
+        self._swap(index, 'file')
+        print(f"✅ 인덱스 파일에서 {len(index)}개 구역 로드 ({self.index_path})")
+        return True
+
+    def refresh(self):
+        """데이터를 새로 조회해 인덱스를 만들고 스냅샷 교체"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            started = time.time()
+            zones = self.loader()
+            if not zones:
+                print("⚠️  갱신 데이터가 없어 기존 스냅샷을 유지합니다.")
+                return False
+            index = ZoneIndex.from_zones(zones)
+            if self.index_path:
+                index.save(self.index_path)
+            self._swap(index, 'refresh')
+            print(f"🔄 스냅샷 교체 완료: {len(index)}개 구역 ({time.time() - started:.1f}초)")
+            return True
+        except Exception as e:
+            print(f"❌ 스냅샷 갱신 오류: {e}")
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def needs_refresh(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return True
+        return time.time() - snapshot.meta.get('built_at', 0) >= self.refresh_interval
+
+    def start_background_refresh(self):
+        """refresh_interval마다 데이터를 갱신하는 데몬 스레드 시작"""
+        def loop():
+            if self.needs_refresh():
+                self.refresh()
+            while not self._stop_event.wait(self.refresh_interval):
+                self.refresh()
+
+        thread = threading.Thread(target=loop, name='zone-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop_event.set()
+
+    def route_planner(self, points=()):
+        """현재 스냅샷의 경로 계획기 (스냅샷마다 처음 요청할 때 비용 격자를 만들어 이후 질의에 재사용)
+
+        points(출발/도착점)가 격자 범위 밖이면 기존 범위와 점들을 덮도록 격자를 넓혀 다시 만듦
+        임시 구역은 자주 바뀌므로 격자에 넣지 않음
+        """
+        snapshot = self._snapshot
+        with self._planner_lock:
+            current = self._planner[1] if self._planner is not None and self._planner[0] is snapshot else None
+            if current is None or not current.covers(points):
+                planner = RoutePlanner.from_index(snapshot, resolution_m=self.route_resolution_m,
+                                                  bbox=current.bbox if current else None, include_points=points)
+                self._planner = (snapshot, planner)
+            return self._planner[1]
+
+    def put_adhoc(self, zone_id, feature):
+        """임시 구역 추가/수정 (GeoJSON Feature → zone_builder로 분류), 새로 추가했으면 True"""
+        if self.zone_builder is None:
+            raise ValueError("임시 구역 등록이 비활성화되어 있습니다")
+        return self.adhoc.insert(zone_id, self.zone_builder(zone_id, feature))
+
+
+def _float_param(query, name):
+    values = query.get(name)
+    if not values:
+        raise ValueError(f"'{name}' 파라미터가 필요합니다")
+    return float(values[0])
+
+
+def make_handler(service):
+    """서비스 인스턴스에 연결된 HTTP 요청 핸들러 클래스 생성"""
+
+    class ZoneQueryHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # keep-alive 연결에서 헤더/본문 분할 전송 시 Nagle 지연(~40ms) 방지
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _adhoc_id(self, path):
+            zone_id = unquote(path[len('/zones/adhoc/'):]) if path.startswith('/zones/adhoc/') else ''
+            if not zone_id:
+                self._send_json(404, {'error': f"알 수 없는 경로: {path}"})
+            return zone_id
+
+        def do_PUT(self):
+            zone_id = self._adhoc_id(urlparse(self.path).path)
+            if not zone_id:
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                feature = json.loads(self.rfile.read(length).decode('utf-8'))
+                created = service.put_adhoc(zone_id, feature)
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            self._send_json(201 if created else 200, {
+                'zone': service.adhoc.records([zone_id])[0],
+                'adhoc_count': len(service.adhoc)
+            })
+
+        def do_DELETE(self):
+            zone_id = self._adhoc_id(urlparse(self.path).path)
+            if not zone_id:
+                return
+            if not service.adhoc.delete(zone_id):
+                self._send_json(404, {'error': f"등록되지 않은 임시 구역: {zone_id}"})
+                return
+            self._send_json(200, {'deleted': zone_id, 'adhoc_count': len(service.adhoc)})
+
+        def _send_nearest(self, snapshot, query, as_of):
+            """스냅샷과 임시 구역의 최근접 결과를 거리순으로 합쳐 k개 응답"""
+            lng, lat = _float_param(query, 'lng'), _float_param(query, 'lat')
+            k = int(query.get('k', ['5'])[0])
+            max_distance = float(query['max_distance'][0]) if 'max_distance' in query else None
+            found = []
+            for hit in snapshot.nearest(lng, lat, k, max_distance, as_of=as_of):
+                found.append(dict(snapshot.records[hit.pop('id')], **hit))
+            if len(service.adhoc):
+                for hit in service.adhoc.nearest(lng, lat, k, max_distance, as_of=as_of):
+                    records = service.adhoc.records([hit.pop('key')])
+                    if records:
+                        found.append(dict(records[0], **hit))
+            found = sorted(found, key=lambda zone: zone['distance_m'])[:k]
+            self._send_json(200, {
+                'count': len(found),
+                'zones': found,
+                'snapshot_version': snapshot.meta.get('version')
+            })
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            snapshot = service.snapshot
+
+            if parsed.path == '/health':
+                self._send_json(200, {
+                    'status': 'ok' if snapshot is not None else 'loading',
+                    'snapshot': snapshot.meta if snapshot is not None else None,
+                    'zone_count': len(snapshot) if snapshot is not None else 0,
+                    'adhoc_count': len(service.adhoc)
+                })
+                return
+
+            if parsed.path == '/zones/adhoc':
+                keys = service.adhoc.keys()
+                self._send_json(200, {'count': len(keys), 'zones': service.adhoc.records(keys)})
+                return
+
+            if snapshot is None:
+                self._send_json(503, {'error': '구역 데이터를 불러오는 중입니다'})
+                return
+
+            try:
+                as_of = query.get('as_of', [None])[0]
+                if as_of is not None and parse_timestamp(as_of) is None:
+                    raise ValueError("'as_of'는 ISO 8601 시각 또는 epoch 초여야 합니다")
+                if as_of is not None and as_of.replace('.', '', 1).isdigit():
+                    as_of = float(as_of)
+                # 스냅샷과 임시 구역 인덱스에 같은 질의를 수행
+                if parsed.path == '/zones/point' and 'alt' in query:
+                    reference = query.get('ref', ['AGL'])[0].upper()
+                    if reference not in ('AGL', 'AMSL'):
+                        raise ValueError("'ref'는 AGL 또는 AMSL이어야 합니다")
+                    ground = float(query['ground'][0]) if 'ground' in query else 0.0
+                    method, args = 'query_point_3d', (_float_param(query, 'lng'), _float_param(query, 'lat'),
+                                                      _float_param(query, 'alt'), reference, ground)
+                elif parsed.path == '/zones/point':
+                    method, args = 'query_point', (_float_param(query, 'lng'), _float_param(query, 'lat'))
+                elif parsed.path == '/zones/bbox':
+                    method, args = 'query_bbox', (_float_param(query, 'minx'), _float_param(query, 'miny'),
+                                                  _float_param(query, 'maxx'), _float_param(query, 'maxy'))
+                elif parsed.path == '/zones/nearest':
+                    self._send_nearest(snapshot, query, as_of)
+                    return
+                elif parsed.path == '/route':
+                    start = (_float_param(query, 'from_lng'), _float_param(query, 'from_lat'))
+                    goal = (_float_param(query, 'to_lng'), _float_param(query, 'to_lat'))
+                    route = service.route_planner((start, goal)).plan(start, goal)
+                    self._send_json(200, dict(route, snapshot_version=snapshot.meta.get('version')))
+                    return
+                elif parsed.path == '/zones/radius':
+                    method, args = 'query_radius', (_float_param(query, 'lng'), _float_param(query, 'lat'),
+                                                    _float_param(query, 'radius'))
+                else:
+                    self._send_json(404, {'error': f"알 수 없는 경로: {parsed.path}"})
+                    return
+                ids = getattr(snapshot, method)(*args, as_of=as_of)
+                adhoc_keys = getattr(service.adhoc, method)(*args, as_of=as_of) if len(service.adhoc) else []
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+
+            zones = [snapshot.records[i] for i in ids] + service.adhoc.records(adhoc_keys)
+            self._send_json(200, {
+                'count': len(zones),
+                'zones': zones,
+                'snapshot_version': snapshot.meta.get('version')
+            })
+
+    return ZoneQueryHandler
+
+
+def run_service(loader, host='127.0.0.1', port=8080, index_path='result_data/zone_index.npz',
+                refresh_interval=3600, zone_builder=None, adhoc_zones=None, route_resolution_m=100.0):
+    """구역 질의 HTTP 서비스 실행 (Ctrl+C로 종료)"""
+    service = ZoneQueryService(loader, index_path=index_path, refresh_interval=refresh_interval,
+                               zone_builder=zone_builder, route_resolution_m=route_resolution_m)
+    for zone in adhoc_zones or []:
+        service.adhoc.insert(zone['zone_id'], zone)
+    service.warm_start()
+    service.start_background_refresh()
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+
+    print(f"🛰️  구역 질의 서비스 시작: http://{host}:{port}")
+    print(f"   • /zones/point?lat=..&lng=..[&alt=(m)&ref=AGL|AMSL&ground=(m)]")
+    print(f"   • /zones/bbox?minx=..&miny=..&maxx=..&maxy=..")
+    print(f"   • /zones/radius?lat=..&lng=..&radius=(m)")
+    print(f"   • /zones/nearest?lat=..&lng=..[&k=5&max_distance=(m)] 가장 가까운 구역 경계까지 거리/방위")
+    print(f"   • /route?from_lng=..&from_lat=..&to_lng=..&to_lat=.. 제한 구역 회피 경로 (high 통과 불가, medium 우회)")
+    print(f"   • 모든 질의에 &as_of=(ISO 8601 시각)을 붙이면 해당 시각에 유효한 구역만 반환")
+    print(f"   • PUT/DELETE /zones/adhoc/(id) 임시 구역 등록·수정·삭제 (본문: GeoJSON Feature), GET /zones/adhoc 목록")
+    print(f"   • /health")
+    print(f"   갱신 주기: {refresh_interval}초")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 서비스 종료")
+    finally:
+        service.stop()
+        server.server_close()